@@ -0,0 +1,115 @@
+"""Rendu des cartes HTML par page : modèles formatés à chaque rerun contre rendus mémoïsés.
+
+Chaque page est balayée par son slider (mêmes scénarios que
+bench_reruns.py) ; les cartes demandées à chaque rerun sont relevées puis
+rejouées hors de Streamlit, avec et sans la mémoïsation de vues.carte_html.
+
+Le script échoue (code 1) si une carte mémoïsée diffère de la carte
+formatée directement.
+
+    python benchmarks/bench_cartes.py --ticks 30 --repetitions 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import vues  # noqa: E402
+from bench_reruns import SCENARIOS  # noqa: E402
+
+# Le script de page relève les cartes demandées par le rerun en cours
+_SCRIPT = """
+import sys
+sys.path.insert(0, {racine!r})
+import streamlit as st
+import vues
+if not hasattr(vues.carte_html, "cartes"):
+    def releve(nom, **valeurs):
+        releve.cartes.append((nom, valeurs))
+        return releve.memoisee(nom, **valeurs)
+    releve.memoisee = vues.carte_html
+    vues.carte_html = releve
+vues.carte_html.cartes = []
+vues.{nom_fonction}(*{arguments!r})
+st.session_state["_cartes"] = vues.carte_html.cartes
+"""
+
+
+def relever_cartes(nom_fonction, arguments, cle, valeurs, ticks):
+    """Cartes (nom, valeurs) demandées à chacun des ``ticks`` reruns du balayage"""
+    script = _SCRIPT.format(racine=str(RACINE), nom_fonction=nom_fonction, arguments=arguments)
+    at = AppTest.from_string(script, default_timeout=60)
+    at.run()
+    reruns = []
+    for i in range(ticks):
+        at.slider(key=cle).set_value(round(valeurs[i % len(valeurs)], 1))
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception)
+        reruns.append(list(at.session_state["_cartes"]))
+    return reruns
+
+
+def duree_rerun_us(rendre, reruns, repetitions):
+    """Médiane, sur les reruns relevés, du meilleur temps de rendu de toutes leurs cartes (µs)"""
+    durees = []
+    for cartes in reruns:
+        meilleur = float("inf")
+        for _ in range(repetitions):
+            t0 = time.perf_counter()
+            for nom, valeurs in cartes:
+                rendre(nom, **valeurs)
+            meilleur = min(meilleur, time.perf_counter() - t0)
+        durees.append(meilleur * 1e6)
+    return round(statistics.median(durees), 2)
+
+
+def mesurer_page(nom_fonction, arguments, cle, valeurs, ticks, repetitions):
+    reruns = relever_cartes(nom_fonction, arguments, cle, valeurs, ticks)
+    carte_html = vues.carte_html.memoisee
+    modeles = vues.modeles_cartes()
+
+    def formater(nom, **valeurs):
+        return modeles[nom](**valeurs)
+
+    carte_html.cache_clear()
+    divergences = sum(
+        carte_html(nom, **valeurs) != formater(nom, **valeurs) for cartes in reruns for nom, valeurs in cartes
+    )
+    cartes = [len(cartes) for cartes in reruns]
+    distinctes = {(nom, tuple(sorted(valeurs.items()))) for rerun in reruns for nom, valeurs in rerun}
+    return {
+        "cartes_par_rerun": round(statistics.mean(cartes), 1),
+        "cartes_distinctes": len(distinctes),
+        "formatees_us_par_rerun": duree_rerun_us(formater, reruns, repetitions),
+        "memoisees_us_par_rerun": duree_rerun_us(carte_html, reruns, repetitions),
+        "taux_succes_cache": round(1 - len(distinctes) / sum(cartes), 3) if sum(cartes) else None,
+        "divergences": divergences,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--repetitions", type=int, default=200, help="Rejeux de chaque rerun, le meilleur est retenu")
+    parser.add_argument("--pages", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = parser.parse_args()
+
+    rapport = {page: mesurer_page(*SCENARIOS[page][1:], args.ticks, args.repetitions) for page in args.pages}
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if any(page["divergences"] for page in rapport.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
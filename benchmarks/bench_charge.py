@@ -0,0 +1,384 @@
+"""Montée en charge : N sessions simultanées contre un serveur Streamlit local, par le protocole websocket du navigateur.
+
+Pour chaque palier de sessions, le script démarre ``streamlit run app.py``
+(base d'examens temporaire) puis ouvre N sessions websocket. Chaque
+session saisit son propre ID patient, ouvre l'examen complet et
+l'enregistre, puis rejoue un parcours d'utilisateur : changement
+de page par la radio de la barre latérale, déplacement des sliders de la
+page (rerun du seul fragment, comme dans le navigateur) et, de temps en
+temps, demande du rapport complet, suivie jusqu'à l'apparition du bouton
+de téléchargement. Chaque action est précédée d'un temps de réflexion
+tiré au hasard.
+
+Par palier : centiles de latence (envoi du message -> fin du rerun ;
+rapport : clic -> bouton de téléchargement), RSS du serveur par session,
+CPU du serveur en cœurs et saturation (CPU / cœurs qui lui sont
+attribués). Le plafond est le plus grand palier dont le p95 des reruns
+interactifs (navigation, sliders) reste dans le budget ; le rapport, suivi
+par un fragment périodique, a ses propres centiles. Les sessions par cœur
+rapportent ce plafond au CPU effectivement consommé à ce palier. Le
+générateur partage la machine avec le serveur : son propre CPU est
+rapporté pour vérifier qu'il ne limite pas la mesure.
+
+Mesures du serveur lues dans /proc (Linux). Dépend du paquet ``websockets``.
+
+Les résultats peuvent être écrits en JSON (``--sortie``) ; avec
+``--reference``, le script échoue (code 1) si le plafond est inférieur à
+celui de la référence.
+
+    python benchmarks/bench_charge.py --sessions 1 2 4 8 16 32 --duree 30 --budget-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from websockets.asyncio.client import connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+RACINE = Path(__file__).resolve().parent.parent
+
+PAGES = (
+    "🏠 Accueil",
+    "🫀 Pression Remplissage VG",
+    "📊 Dysfonction Diastolique Complète",
+    "🌊 Probabilité HTAP ESC 2022",
+    "🔄 Constrictive vs Restrictive",
+    "⚙️ Prothèses Valvulaires",
+)
+# Page ouverte en premier : son examen, enregistré, est celui dont le rapport est demandé ensuite
+PAGE_EXAMEN = "🧾 Examen Complet"
+LIBELLE_ENREGISTREMENT = "💾 Enregistrer l'examen"
+LIBELLE_NAVIGATION = "CHOISIR L'ÉVALUATION:"
+LIBELLE_PATIENT = "ID Patient"
+LIBELLE_RAPPORT = "🖨️ Générer Rapport Complet"
+PREFIXE_TELECHARGEMENT = "📥"
+
+# Conteneur racine de la barre latérale dans le chemin d'un élément
+BARRE_LATERALE = 1
+
+WIDGETS = ("slider", "radio", "selectbox", "checkbox", "button", "download_button", "text_input")
+
+TERMINE_POUR_RERUN = ForwardMsg.FINISHED_EARLY_FOR_RERUN
+
+# Actions dont la latence compte pour le plafond
+INTERACTIVES = ("navigation", "curseur")
+
+# Au-delà, la session est comptée en erreur
+DELAI_RERUN_S = 60.0
+
+# ============================================================================
+# SESSION WEBSOCKET (ce qu'envoie et reçoit un onglet de navigateur)
+# ============================================================================
+
+
+class Session:
+    """Onglet simulé : états des widgets réglés, widgets affichés, fragments relancés automatiquement"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.page_script_hash = ""
+        self.etats = {}
+        self.widgets = {}
+        self.auto_reruns = {}
+
+    async def executer(self, fragment_id="", declencheur=None, auto=False):
+        """Demande un rerun (de l'application ou d'un fragment) et attend sa fin ; renvoie la durée (s)"""
+        message = BackMsg()
+        client = message.rerun_script
+        client.page_script_hash = self.page_script_hash
+        client.fragment_id = fragment_id
+        client.is_auto_rerun = auto
+        client.widget_states.widgets.extend(self.etats.values())
+        if declencheur is not None:
+            client.widget_states.widgets.append(declencheur)
+        t0 = time.perf_counter()
+        await self.ws.send(message.SerializeToString())
+        async with asyncio.timeout(DELAI_RERUN_S):
+            return await self._attendre_fin(t0)
+
+    async def _attendre_fin(self, t0):
+        while True:
+            recu = ForwardMsg()
+            recu.ParseFromString(await self.ws.recv())
+            genre = recu.WhichOneof("type")
+            if genre == "delta" and recu.delta.WhichOneof("type") == "new_element":
+                self._noter_widget(recu)
+            elif genre == "new_session":
+                self.page_script_hash = recu.new_session.page_script_hash
+                if not recu.new_session.fragment_ids_this_run:
+                    # rerun complet (demandé ou relancé par st.rerun) : tous les widgets sont
+                    # réaffichés et les fragments périodiques réenregistrés
+                    self.widgets, self.auto_reruns = {}, {}
+            elif genre == "auto_rerun":
+                self.auto_reruns[recu.auto_rerun.fragment_id] = recu.auto_rerun.interval
+            elif genre == "stop_auto_rerun":
+                for fragment in recu.stop_auto_rerun.fragment_ids:
+                    self.auto_reruns.pop(fragment, None)
+            elif genre == "script_finished" and recu.script_finished != TERMINE_POUR_RERUN:
+                return time.perf_counter() - t0
+
+    def _noter_widget(self, recu):
+        element = recu.delta.new_element
+        genre = element.WhichOneof("type")
+        if genre in WIDGETS:
+            proto = getattr(element, genre)
+            lateral = recu.metadata.delta_path[0] == BARRE_LATERALE
+            self.widgets[proto.id] = (genre, proto, recu.delta.fragment_id, lateral)
+
+    def chercher(self, genre, libelle=None, lateral=None):
+        """Widgets (id, proto, fragment) affichés de ce genre, filtrés par libellé et emplacement"""
+        return [
+            (identifiant, proto, fragment)
+            for identifiant, (g, proto, fragment, cote) in self.widgets.items()
+            if g == genre and (libelle is None or proto.label.startswith(libelle)) and lateral in (None, cote)
+        ]
+
+    # ------------------------------------------------------------------
+    # Actions d'un utilisateur
+    # ------------------------------------------------------------------
+
+    def saisir_patient(self, patient_id):
+        """ID patient propre à la session, envoyé avec le rerun suivant"""
+        identifiant, _, _ = self.chercher("text_input", LIBELLE_PATIENT)[0]
+        self.etats[identifiant] = WidgetState(id=identifiant, string_value=patient_id)
+
+    async def naviguer(self, page):
+        identifiant, _, fragment = self.chercher("radio", LIBELLE_NAVIGATION)[0]
+        etat = WidgetState(id=identifiant, string_value=page)
+        self.etats[identifiant] = etat
+        return await self.executer(fragment)
+
+    async def enregistrer_examen(self):
+        identifiant, _, fragment = self.chercher("button", LIBELLE_ENREGISTREMENT)[0]
+        return await self.executer(fragment, declencheur=WidgetState(id=identifiant, trigger_value=True))
+
+    async def deplacer_curseur(self, rng):
+        """Un slider de la page déplacé sur un point de sa grille ; None si la page n'en a pas"""
+        curseurs = self.chercher("slider", lateral=False) or self.chercher("slider", lateral=True)
+        if not curseurs:
+            return None
+        identifiant, proto, fragment = rng.choice(curseurs)
+        points = int(round((proto.max - proto.min) / proto.step))
+        valeur = round(proto.min + rng.randint(0, points) * proto.step, 6)
+        etat = WidgetState(id=identifiant)
+        etat.double_array_value.data[:] = [valeur]
+        self.etats[identifiant] = etat
+        return await self.executer(fragment)
+
+    async def demander_rapport(self, delai_max):
+        """Clic sur le rapport complet puis reruns automatiques du suivi jusqu'au bouton de téléchargement"""
+        identifiant, _, fragment = self.chercher("button", LIBELLE_RAPPORT)[0]
+        t0 = time.perf_counter()
+        await self.executer(fragment, declencheur=WidgetState(id=identifiant, trigger_value=True))
+        while not self.chercher("download_button", PREFIXE_TELECHARGEMENT):
+            if time.perf_counter() - t0 > delai_max or not self.auto_reruns:
+                raise RuntimeError("Rapport non reçu")
+            fragment, intervalle = next(iter(self.auto_reruns.items()))
+            await asyncio.sleep(intervalle)
+            await self.executer(fragment, auto=True)
+        return time.perf_counter() - t0
+
+
+async def parcours(url, fin, graine, pause, poids, latences, erreurs):
+    """Parcours d'un utilisateur jusqu'à ``fin`` ; latences (ms) ajoutées par type d'action.
+
+    ``poids`` doit comporter les actions « navigation », « rapport » et « curseur ».
+    """
+    rng = random.Random(graine)
+    await asyncio.sleep(rng.uniform(0, pause))
+    try:
+        async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            session = Session(ws)
+            latences["chargement"].append(await session.executer() * 1000.0)
+            # chaque onglet suit son patient, dont l'examen complet est enregistré avant le parcours
+            session.saisir_patient(f"CHARGE-{graine:05d}")
+            latences["navigation"].append(await session.naviguer(PAGE_EXAMEN) * 1000.0)
+            await session.enregistrer_examen()
+            while time.perf_counter() < fin:
+                await asyncio.sleep(rng.expovariate(1 / pause))
+                action = rng.choices(list(poids), weights=list(poids.values()))[0]
+                if action == "navigation":
+                    duree = await session.naviguer(rng.choice(PAGES))
+                elif action == "rapport":
+                    duree = await session.demander_rapport(delai_max=60.0)
+                else:
+                    duree = await session.deplacer_curseur(rng)
+                if duree is not None:
+                    latences[action].append(duree * 1000.0)
+    except Exception as erreur:
+        # une session en échec est comptée dans le palier, sans l'interrompre
+        erreurs.append(f"{type(erreur).__name__}: {erreur}")
+
+# ============================================================================
+# SERVEUR ET MESURES
+# ============================================================================
+
+
+def port_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def demarrer_serveur(port, base):
+    serveur = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(RACINE / "app.py"), "--server.headless", "true",
+         "--server.port", str(port), "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false",
+         "--server.fileWatcherType", "none"],
+        env={**os.environ, "ECHO_EXPERT_BASE": str(base)}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as reponse:
+                if reponse.read() == b"ok":
+                    return serveur
+        except OSError:
+            time.sleep(0.2)
+    serveur.kill()
+    raise RuntimeError("Le serveur Streamlit n'a pas démarré")
+
+
+def cpu_processus_s(pid):
+    """Temps CPU utilisateur + système du processus (s)"""
+    champs = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(champs[11]) + int(champs[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def rss_mo(pid):
+    for ligne in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if ligne.startswith("VmRSS:"):
+            return int(ligne.split()[1]) / 1024
+    return 0.0
+
+
+async def surveiller(pid, echantillons, arret, periode=0.5):
+    while not arret.is_set():
+        echantillons.append(rss_mo(pid))
+        await asyncio.sleep(periode)
+
+
+def centiles(valeurs):
+    if not valeurs:
+        return None
+    valeurs = sorted(valeurs)
+
+    def rang(q):
+        return round(valeurs[min(len(valeurs) - 1, max(0, round(q * len(valeurs)) - 1))], 1)
+
+    return {"n": len(valeurs), "p50": round(statistics.median(valeurs), 1), "p95": rang(0.95), "p99": rang(0.99)}
+
+
+async def palier(url, pid, sessions, duree, pause, poids, graine):
+    """Charge de ``sessions`` parcours simultanés pendant ``duree`` secondes"""
+    # session de chauffe : modules et caches chargés avant la mesure de référence
+    async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        await Session(ws).executer()
+    await asyncio.sleep(1.0)
+    rss_base = rss_mo(pid)
+
+    latences = {action: [] for action in ("chargement", *poids)}
+    erreurs, echantillons, arret = [], [], asyncio.Event()
+    surveillance = asyncio.create_task(surveiller(pid, echantillons, arret))
+    cpu_serveur, cpu_client, t0 = cpu_processus_s(pid), time.process_time(), time.perf_counter()
+    fin = t0 + duree
+    await asyncio.gather(*(parcours(url, fin, graine + i, pause, poids, latences, erreurs) for i in range(sessions)))
+    mur = time.perf_counter() - t0
+    cpu_serveur, cpu_client = cpu_processus_s(pid) - cpu_serveur, time.process_time() - cpu_client
+    arret.set()
+    await surveillance
+
+    coeurs = len(os.sched_getaffinity(pid))
+    interactives = [latence for action in INTERACTIVES for latence in latences[action]]
+    rss_pic = max(echantillons, default=rss_base)
+    return {
+        "latence_ms": centiles(interactives),
+        "latence_par_action_ms": {action: centiles(valeurs) for action, valeurs in latences.items()},
+        "actions_par_s": round(sum(len(valeurs) for valeurs in latences.values()) / mur, 1),
+        "rss_base_mo": round(rss_base, 1),
+        "rss_pic_mo": round(rss_pic, 1),
+        "rss_par_session_mo": round((rss_pic - rss_base) / sessions, 2),
+        "cpu_serveur_coeurs": round(cpu_serveur / mur, 2),
+        "saturation": round(cpu_serveur / mur / coeurs, 2),
+        "cpu_generateur_coeurs": round(cpu_client / mur, 2),
+        "sessions_en_erreur": len(erreurs),
+        "erreurs": sorted(set(erreurs))[:5],
+    }
+
+
+def plafond(paliers, budget_ms):
+    """Plus grand palier, atteint sans dépassement aux paliers inférieurs, dont le p95 tient dans le budget"""
+    retenu = None
+    for sessions, mesures in sorted(paliers.items()):
+        latence = mesures["latence_ms"]
+        if mesures["sessions_en_erreur"] or latence is None or latence["p95"] > budget_ms:
+            break
+        retenu = sessions
+    return retenu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="*", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duree", type=float, default=30.0, help="Durée de chaque palier (s)")
+    parser.add_argument("--pause-ms", type=float, default=1000.0, help="Temps de réflexion moyen entre deux actions")
+    parser.add_argument("--navigation", type=float, default=0.15, help="Part des actions qui changent de page")
+    parser.add_argument("--rapport", type=float, default=0.05, help="Part des actions qui demandent le rapport")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="p95 de latence toléré pour le plafond")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", type=Path, help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--reference", type=Path, help="Résultats JSON d'une exécution précédente")
+    args = parser.parse_args()
+
+    poids = {"navigation": args.navigation, "rapport": args.rapport, "curseur": 1 - args.navigation - args.rapport}
+    paliers = {}
+    for sessions in sorted(args.sessions):
+        # serveur neuf à chaque palier : la mémoire des sessions précédentes ne fausse pas la RSS
+        with tempfile.TemporaryDirectory() as repertoire:
+            port = port_libre()
+            serveur = demarrer_serveur(port, Path(repertoire) / "examens.sqlite")
+            try:
+                paliers[sessions] = asyncio.run(palier(
+                    f"ws://127.0.0.1:{port}/_stcore/stream", serveur.pid, sessions, args.duree,
+                    args.pause_ms / 1000.0, poids, args.graine))
+            finally:
+                serveur.terminate()
+                serveur.wait(timeout=30)
+
+    retenu = plafond(paliers, args.budget_ms)
+    cpu = paliers[retenu]["cpu_serveur_coeurs"] if retenu else None
+    rapport = {
+        "coeurs": os.cpu_count(),
+        "budget_ms": args.budget_ms,
+        "pause_ms": args.pause_ms,
+        "paliers": paliers,
+        "plafond_sessions": retenu,
+        "sessions_par_coeur": round(retenu / cpu, 1) if retenu and cpu else None,
+    }
+    echec = False
+    if args.reference:
+        reference = json.loads(args.reference.read_text(encoding="utf-8"))
+        rapport["plafond_reference"] = reference.get("plafond_sessions")
+        echec = (retenu or 0) < (rapport["plafond_reference"] or 0)
+    if args.sortie:
+        args.sortie.write_text(json.dumps(rapport, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if echec else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
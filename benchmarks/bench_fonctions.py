@@ -0,0 +1,220 @@
+"""Micro-benchmarks des fonctions de score et des recherches de prothèses, de 1 à 10^7 lignes, avec référence JSON.
+
+Chaque cas est mesuré en scalaire (boucle Python sur la fonction du noyau)
+et en lot (fonction vectorisée de ``echo_expert.vectoriel`` ou jointure du
+référentiel) pour chaque taille ; le résultat est le coût par ligne (ns) et
+le débit (lignes/s).
+
+Les résultats peuvent être écrits en JSON (``--sortie``) puis servir de
+référence à une exécution ultérieure (``--reference``) : le script échoue
+(code 1) si une mesure commune est plus lente que la référence au-delà du
+seuil, ou si une mesure en lot diffère de la fonction scalaire.
+
+    python benchmarks/bench_fonctions.py --sortie reference.json
+    python benchmarks/bench_fonctions.py --reference reference.json --seuil 0.25
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert import (  # noqa: E402
+    calculer_ppm,
+    calculer_probabilite_htap,
+    classer_prvg,
+    evaluer_constrictive_restrictive,
+    evaluer_dysfonction_diastolique_complete,
+    evaluer_pattern_diastolique,
+    evaluer_prvg_fevg_preservee,
+    evaluer_risque_thrombose,
+)
+from echo_expert import vectoriel as v  # noqa: E402
+from echo_expert.identification import identifier_prothese  # noqa: E402
+from echo_expert.referentiel import charger_referentiel  # noqa: E402
+from echo_expert.examen import grille  # noqa: E402
+
+TAILLES = tuple(10 ** i for i in range(8))
+
+# Mesures absentes des grilles de saisie
+CHOIX_SUPPLEMENTAIRES = {
+    "fevg_classe": ("≥50%", "41-49%", "≤40%"),
+    "surface_corporelle": tuple(round(1.4 + 0.1 * i, 1) for i in range(10)),
+    "categorie": ("Mécanique", "Biologique"),
+    "fa": (False, True),
+    "antecedent_te": (False, True),
+}
+
+# Durée minimale d'une répétition : les petites tailles sont répétées en boucle
+DUREE_MIN_S = 0.05
+
+
+def prvg_scalaire(e_e_prime, volume_og, tr_vitesse):
+    resultats = evaluer_prvg_fevg_preservee(e_e_prime, volume_og, tr_vitesse)
+    return v.CATEGORIES_PRVG.index(classer_prvg(resultats)), resultats["criteres_secondaires"]
+
+
+def dysfonction_scalaire(e_a_ratio, e_e_prime, volume_og, tr_vitesse, dt, e_vitesse, fevg_classe):
+    resultats = evaluer_dysfonction_diastolique_complete(e_a_ratio, e_e_prime, volume_og, tr_vitesse, dt, e_vitesse, fevg_classe)
+    if "pattern" in resultats:
+        return v.SANS_OBJET, v.PATTERNS_DIASTOLIQUES.index(resultats["pattern"])
+    return v.CATEGORIES_PRVG.index(classer_prvg(resultats)), v.SANS_OBJET
+
+
+def chercher_prothese(position, marque, taille):
+    return charger_referentiel().ligne(position, marque, taille)
+
+
+def joindre_protheses(positions, marques, tailles):
+    return charger_referentiel().joindre(positions, marques, tailles)
+
+
+def identifier(eoa_mesuree, gradient_moyen, position):
+    return identifier_prothese(eoa_mesuree, gradient_moyen, position)[0]["marque"]
+
+
+# cas -> (colonnes, fonction scalaire, fonction en lot ou None, conversion du résultat en lot en valeurs scalaires)
+CAS = {
+    "prvg_fevg_preservee": (
+        ("e_e_prime", "volume_og", "tr_vitesse"), prvg_scalaire, v.evaluer_prvg_fevg_preservee_vect,
+        lambda r: list(zip(r[0].tolist(), r[1].tolist()))),
+    "pattern_diastolique": (
+        ("e_a_ratio", "dt", "e_vitesse"), lambda *m: evaluer_pattern_diastolique(*m)[0], v.evaluer_pattern_diastolique_vect,
+        lambda codes: [v.PATTERNS_DIASTOLIQUES[c] for c in codes.tolist()]),
+    "calculer_ppm": (
+        ("eoa_mesuree", "surface_corporelle"), lambda *m: calculer_ppm(*m)[0], v.calculer_ppm_vect,
+        lambda r: [v.SEVERITES_PPM[c] for c in r[0].tolist()]),
+    "risque_thrombose": (
+        ("categorie", "fevg", "fa", "antecedent_te", "inr"), evaluer_risque_thrombose, v.evaluer_risque_thrombose_vect,
+        lambda r: [(v.RISQUES_THROMBOSE[c], s) for c, s in zip(r[0].tolist(), r[1].tolist())]),
+    "probabilite_htap": (
+        ("tr_vitesse", "vc_diametre", "vc_collapsus", "rv_ra_ratio", "septum_paradoxal"), calculer_probabilite_htap,
+        v.calculer_probabilite_htap_vect, lambda score: score.tolist()),
+    "constrictive_restrictive": (
+        ("variation_respiratoire", "septal_bounce", "annulus_reverse", "fonction_vg", "strain_longitudinal"),
+        evaluer_constrictive_restrictive, v.evaluer_constrictive_restrictive_vect,
+        lambda r: list(zip(r[0].tolist(), r[1].tolist()))),
+    "dysfonction_diastolique_complete": (
+        ("e_a_ratio", "e_e_prime", "volume_og", "tr_vitesse", "dt", "e_vitesse", "fevg_classe"),
+        dysfonction_scalaire, v.evaluer_dysfonction_diastolique_complete_vect,
+        lambda r: list(zip(r["categorie_prvg"].tolist(), r["pattern"].tolist()))),
+    "prothese_recherche": (
+        ("position", "marque", "taille"), chercher_prothese, joindre_protheses, lambda lignes: lignes.tolist()),
+    "prothese_identification": (
+        ("eoa_mesuree", "gradient_moyen", "position"), identifier, None, None),
+}
+
+
+def generer_colonnes(noms, n, graine=0):
+    """Examens tirés au hasard sur les grilles de saisie ; prothèses tirées dans le référentiel"""
+    rng = np.random.default_rng(graine)
+    colonnes = {}
+    if {"position", "marque", "taille"} & set(noms):
+        referentiel = charger_referentiel()
+        lignes = rng.integers(0, len(referentiel), n)
+        colonnes.update(position=referentiel.position[lignes], marque=referentiel.marque[lignes], taille=referentiel.taille[lignes])
+    for nom in noms:
+        if nom not in colonnes:
+            valeurs = CHOIX_SUPPLEMENTAIRES.get(nom) or grille(nom)
+            colonnes[nom] = np.asarray(valeurs)[rng.integers(0, len(valeurs), n)]
+    return [colonnes[nom] for nom in noms]
+
+
+def chronometrer(appel, repetitions):
+    """Meilleur temps (s) d'un appel ; les appels courts sont répétés jusqu'à DUREE_MIN_S"""
+    nombre = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(nombre):
+            appel()
+        duree = time.perf_counter() - t0
+        if duree >= DUREE_MIN_S:
+            break
+        nombre *= 2
+    meilleur = duree / nombre
+    for _ in range(repetitions - 1):
+        t0 = time.perf_counter()
+        for _ in range(nombre):
+            appel()
+        meilleur = min(meilleur, (time.perf_counter() - t0) / nombre)
+    return meilleur
+
+
+def boucle_scalaire(fonction, colonnes):
+    lignes = list(zip(*(c.tolist() for c in colonnes)))
+    return lambda: [fonction(*ligne) for ligne in lignes]
+
+
+def mesure(duree, n):
+    return {"ns_par_ligne": round(duree / n * 1e9, 1), "lignes_par_s": round(n / duree)}
+
+
+def mesurer_cas(noms, scalaire, lot, conversion, tailles, max_scalaire, verification, repetitions):
+    """Mesures {mode: {taille: mesure}} d'un cas et nombre d'écarts entre lot et scalaire"""
+    colonnes = generer_colonnes(noms, max(tailles))
+    resultats = {"scalaire": {}}
+    for n in tailles:
+        if n <= max_scalaire:
+            resultats["scalaire"][str(n)] = mesure(chronometrer(boucle_scalaire(scalaire, [c[:n] for c in colonnes]), repetitions), n)
+    ecarts = 0
+    if lot is not None:
+        resultats["lot"] = {}
+        for n in tailles:
+            morceaux = [c[:n] for c in colonnes]
+            resultats["lot"][str(n)] = mesure(chronometrer(lambda: lot(*morceaux), repetitions), n)
+        echantillon = [c[:verification] for c in colonnes]
+        ecarts = sum(a != b for a, b in zip(conversion(lot(*echantillon)), boucle_scalaire(scalaire, echantillon)()))
+    return resultats, ecarts
+
+
+def regressions(rapport, reference, seuil):
+    """Mesures communes plus lentes que la référence au-delà de ``seuil`` (fraction)"""
+    trouvees = {}
+    for cas, modes in rapport["cas"].items():
+        for mode, tailles in modes.items():
+            for taille, mesure_actuelle in tailles.items():
+                ancienne = reference.get("cas", {}).get(cas, {}).get(mode, {}).get(taille)
+                if ancienne and mesure_actuelle["ns_par_ligne"] > ancienne["ns_par_ligne"] * (1 + seuil):
+                    trouvees[f"{cas}/{mode}/{taille}"] = round(mesure_actuelle["ns_par_ligne"] / ancienne["ns_par_ligne"], 2)
+    return trouvees
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tailles", type=int, nargs="*", default=list(TAILLES))
+    parser.add_argument("--max-scalaire", type=int, default=100_000, help="Plus grande taille mesurée en boucle scalaire")
+    parser.add_argument("--cas", nargs="*", default=list(CAS), choices=list(CAS))
+    parser.add_argument("--verification", type=int, default=10_000, help="Lignes comparées au scalaire")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", type=Path, help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--reference", type=Path, help="Résultats JSON d'une exécution précédente")
+    parser.add_argument("--seuil", type=float, default=0.25, help="Ralentissement toléré par rapport à la référence")
+    args = parser.parse_args()
+
+    rapport = {
+        "machine": {"python": platform.python_version(), "numpy": np.__version__, "processeur": platform.processor() or platform.machine()},
+        "cas": {},
+        "ecarts_scalaire": {},
+    }
+    for cas in args.cas:
+        rapport["cas"][cas], ecarts = mesurer_cas(
+            *CAS[cas], sorted(args.tailles), args.max_scalaire, args.verification, args.repetitions)
+        rapport["ecarts_scalaire"][cas] = ecarts
+
+    if args.reference:
+        rapport["seuil"] = args.seuil
+        rapport["regressions"] = regressions(rapport, json.loads(args.reference.read_text(encoding="utf-8")), args.seuil)
+    if args.sortie:
+        args.sortie.write_text(json.dumps(rapport, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if rapport.get("regressions") or any(rapport["ecarts_scalaire"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
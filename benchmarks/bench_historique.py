@@ -0,0 +1,118 @@
+"""Historique des examens : coût d'un enregistrement sur le fil du rerun, écriture par lots et lecture indexée.
+
+Le script échoue (code 1) si un enregistrement dépasse le budget ou si la
+lecture du dernier examen n'utilise pas l'index (patient_id, date_examen).
+
+    python benchmarks/bench_historique.py --patients 10000 --examens 5 --budget-us 100
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert.examen import evaluer_examen, valeurs_par_defaut  # noqa: E402
+from echo_expert.historique import _INSERTION, Historique, valeurs_anterieures  # noqa: E402
+
+PROTHESE = ("Prothèse aortique", "Mécanique", "St Jude Medical (Regent)", 21.0)
+DEBUT = date(2020, 1, 1)
+
+
+def examens_simules(patients, examens, graine=0):
+    """(patient_id, date, fiche, résultats) : ``examens`` contrôles par patient, gradients tirés au hasard"""
+    rng = np.random.default_rng(graine)
+    fiche = valeurs_par_defaut()
+    resultats = evaluer_examen(fiche, 1.8, PROTHESE[:2])
+    gradients = rng.integers(5, 40, (examens, patients)).tolist()
+    for rang in range(examens):
+        jour = DEBUT + timedelta(days=180 * rang)
+        for patient in range(patients):
+            yield f"P{patient:07d}", jour, dict(fiche, gradient_moyen=gradients[rang][patient]), resultats
+
+
+def centiles(durees):
+    durees = np.asarray(durees) * 1e6
+    return {"p50_us": round(float(np.percentile(durees, 50)), 2), "p99_us": round(float(np.percentile(durees, 99)), 2),
+            "max_us": round(float(durees.max()), 2)}
+
+
+def ecriture_par_examen(chemin, examens):
+    """Référence : une transaction par examen, sur le fil appelant"""
+    historique = Historique(chemin)
+    connexion = sqlite3.connect(chemin)
+    connexion.execute("PRAGMA synchronous = NORMAL")
+    t0 = time.perf_counter()
+    for patient_id, jour, fiche, resultats in examens:
+        with connexion:
+            connexion.executemany(_INSERTION, historique._fusionner([(patient_id, jour.isoformat(), PROTHESE, fiche, resultats)]))
+    duree = time.perf_counter() - t0
+    connexion.close()
+    return duree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=10_000)
+    parser.add_argument("--examens", type=int, default=5, help="Examens par patient")
+    parser.add_argument("--lectures", type=int, default=2_000)
+    parser.add_argument("--budget-us", type=float, default=100.0, help="Budget p99 d'un enregistrement (µs)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        historique = Historique(Path(repertoire) / "examens.sqlite")
+        depots = []
+        t0 = time.perf_counter()
+        for patient_id, jour, fiche, resultats in examens_simules(args.patients, args.examens):
+            t1 = time.perf_counter()
+            historique.enregistrer(patient_id, fiche, resultats, PROTHESE, jour)
+            depots.append(time.perf_counter() - t1)
+        historique.vider()
+        ecriture_lots = time.perf_counter() - t0
+        total = args.patients * args.examens
+
+        reference = list(examens_simules(min(args.patients, 2_000), 1, graine=1))
+        par_examen = ecriture_par_examen(Path(repertoire) / "reference.sqlite", reference)
+
+        rng = np.random.default_rng(2)
+        aujourd_hui = DEBUT + timedelta(days=180 * args.examens)
+        lectures = []
+        for patient in rng.integers(0, args.patients, args.lectures).tolist():
+            t0 = time.perf_counter()
+            valeurs_anterieures(historique.dernier_examen(f"P{patient:07d}", aujourd_hui), aujourd_hui)
+            lectures.append(time.perf_counter() - t0)
+
+        connexion = sqlite3.connect(historique.chemin)
+        plan = connexion.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM examens WHERE patient_id = ? AND date_examen < ? "
+            "ORDER BY date_examen DESC LIMIT 1", ("P0000000", aujourd_hui.isoformat()),
+        ).fetchall()
+        lignes = connexion.execute("SELECT COUNT(*) FROM examens").fetchone()[0]
+        connexion.close()
+
+    indexee = any("USING INDEX examens_patient_date" in ligne[-1] for ligne in plan)
+    enregistrement = centiles(depots)
+    rapport = {
+        "examens": total,
+        "lignes": lignes,
+        "enregistrement": enregistrement,
+        "lots_ecrits": historique.lots_ecrits,
+        "ecriture_par_lots_examens_s": round(total / ecriture_lots),
+        "ecriture_par_examen_examens_s": round(len(reference) / par_examen),
+        "dernier_examen": centiles(lectures),
+        "lecture_indexee": indexee,
+        "budget_us": args.budget_us,
+    }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if enregistrement["p99_us"] > args.budget_us or not indexee or lignes != total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Benchmark du temps d'import du noyau de calcul echo_expert.
+
+Chaque mesure est faite dans un interpréteur neuf. Le script échoue (code 1)
+si la médiane dépasse le budget ou si Streamlit, pandas ou NumPy sont importés.
+
+    python benchmarks/bench_import.py --budget-ms 30
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+
+SONDE = """
+import sys, time
+t0 = time.perf_counter()
+import echo_expert
+t1 = time.perf_counter()
+interdits = [m for m in ("streamlit", "pandas", "numpy") if m in sys.modules]
+print((t1 - t0) * 1000.0, ",".join(interdits))
+"""
+
+
+def mesurer_import():
+    """Durée d'import (ms) et modules lourds chargés, dans un processus neuf"""
+    sortie = subprocess.run(
+        [sys.executable, "-c", SONDE], cwd=RACINE, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(sortie[0]), (sortie[1].split(",") if len(sortie) > 1 else [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="Budget de la médiane (ms)")
+    parser.add_argument("--repetitions", type=int, default=15)
+    args = parser.parse_args()
+
+    durees = []
+    for _ in range(args.repetitions):
+        duree, interdits = mesurer_import()
+        if interdits:
+            print(f"ÉCHEC: import de {', '.join(interdits)} par echo_expert")
+            return 1
+        durees.append(duree)
+
+    mediane = statistics.median(durees)
+    print(json.dumps({
+        "mediane_ms": round(mediane, 3),
+        "max_ms": round(max(durees), 3),
+        "budget_ms": args.budget_ms,
+    }))
+    if mediane > args.budget_ms:
+        print(f"ÉCHEC: import en {mediane:.2f} ms > budget {args.budget_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Mode incertitude : coût d'un rerun (tirages réutilisés) par évaluation et par nombre de tirages.
+
+Le script échoue (code 1) si un rerun dépasse le budget.
+
+    python benchmarks/bench_incertitude.py --tirages 100000 1000000 --budget-ms 100
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert.examen import classe_fevg, valeurs_par_defaut  # noqa: E402
+from echo_expert.incertitude import probabilites, tirages_normaux  # noqa: E402
+
+# Règle évaluée -> mesures lues, prises sur la fiche par défaut
+EVALUATIONS = {
+    "categorie_prvg": ("e_e_prime", "volume_og", "tr_vitesse"),
+    "grade_diastolique": ("e_a_ratio", "e_e_prime", "volume_og", "tr_vitesse", "dt", "e_vitesse", "fevg"),
+    "probabilite_htap": ("tr_vitesse", "vc_diametre", "vc_collapsus", "rv_ra_ratio", "septum_paradoxal",
+                         "tapse", "s_tricuspide", "fac_vd", "acceleration_time", "pvr_estimee"),
+    "diagnostic_pericardique": ("variation_respiratoire", "septal_bounce", "annulus_reverse",
+                                "fonction_vg", "strain_longitudinal"),
+    "performance_prothese": ("type_general", "gradient_moyen", "eoa_mesuree", "dvi"),
+}
+
+
+def mesures_par_defaut():
+    fiche = valeurs_par_defaut()
+    fiche["fevg"] = classe_fevg(fiche["fevg"])
+    fiche["type_general"] = "Prothèse aortique"
+    return fiche
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tirages", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Budget d'un rerun (ms)")
+    parser.add_argument("--repetitions", type=int, default=20)
+    args = parser.parse_args()
+
+    fiche = mesures_par_defaut()
+    rapport, depassement = {}, False
+    for tirages in args.tirages:
+        t0 = time.perf_counter()
+        tirages_normaux(tirages)
+        rapport[tirages] = {"generation_tirages_ms": round((time.perf_counter() - t0) * 1000, 1)}
+        for regle, noms in EVALUATIONS.items():
+            mesures = {nom: fiche[nom] for nom in noms}
+            probabilites(regle, mesures, tirages)  # compilation des règles
+            durees = []
+            for _ in range(args.repetitions):
+                t0 = time.perf_counter()
+                probabilites(regle, mesures, tirages)
+                durees.append((time.perf_counter() - t0) * 1000)
+            durees.sort()
+            rerun_ms = durees[len(durees) // 2]
+            depassement |= rerun_ms > args.budget_ms
+            rapport[tirages][regle] = {"rerun_ms": round(rerun_ms, 2), "max_ms": round(durees[-1], 2)}
+    rapport["budget_ms"] = args.budget_ms
+    print(json.dumps(rapport, indent=2))
+    return 1 if depassement else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Temps dans la cible INR : registre vectorisé contre boucle par patient, et écart à la méthode de Rosendaal jour par jour.
+
+Le script échoue (code 1) si le TTR vectorisé diffère de la boucle par
+patient, ou si le score de thrombose vectorisé avec TTR diffère de la
+fonction scalaire.
+
+    python benchmarks/bench_inr.py --patients 10000 --mesures-max 200
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert import evaluer_risque_thrombose  # noqa: E402
+from echo_expert.inr import ECART_MAX_JOURS, ttr_registre  # noqa: E402
+from echo_expert.vectoriel import RISQUES_THROMBOSE, evaluer_risque_thrombose_vect  # noqa: E402
+
+BAS, HAUT = 2.0, 3.0
+
+
+def registre_simule(patients, mesures_max, graine=0):
+    """Mesures tous les 1 à 8 semaines (parfois plus), INR autour d'une moyenne propre au patient"""
+    rng = np.random.default_rng(graine)
+    nombres = rng.integers(1, mesures_max + 1, patients)
+    patient = np.repeat(np.arange(patients), nombres)
+    ecarts = rng.integers(7, 63, len(patient))
+    debuts = np.cumsum(nombres) - nombres
+    ecarts[debuts] = 0
+    jours = np.cumsum(ecarts) - np.repeat(np.cumsum(ecarts)[debuts], nombres)
+    dates = np.datetime64("2015-01-01") + jours.astype("timedelta64[D]")
+    inr = np.round(rng.uniform(1.8, 3.2, patients)[patient] + rng.normal(0, 0.5, len(patient)), 1)
+    melange = rng.permutation(len(patient))
+    return np.char.add("P", patient.astype("U7"))[melange], dates[melange], inr[melange]
+
+
+def ttr_boucle(dates, valeurs):
+    """Référence : même calcul, segment par segment en Python"""
+    dans_cible = suivis = 0.0
+    for (d0, v0), (d1, v1) in zip(zip(dates, valeurs), zip(dates[1:], valeurs[1:])):
+        duree = (d1 - d0).days
+        if not 0 < duree <= ECART_MAX_JOURS:
+            continue
+        suivis += duree
+        if v0 == v1:
+            dans_cible += duree * (BAS <= v0 <= HAUT)
+            continue
+        bornes = sorted(((BAS - v0) / (v1 - v0), (HAUT - v0) / (v1 - v0)))
+        dans_cible += duree * (min(max(bornes[1], 0), 1) - min(max(bornes[0], 0), 1))
+    return 100 * dans_cible / suivis if suivis else math.nan
+
+
+def ttr_rosendaal_quotidien(dates, valeurs):
+    """Méthode d'origine : un INR interpolé par jour, jours dans la cible comptés"""
+    dans_cible = suivis = 0
+    for (d0, v0), (d1, v1) in zip(zip(dates, valeurs), zip(dates[1:], valeurs[1:])):
+        duree = (d1 - d0).days
+        if not 0 < duree <= ECART_MAX_JOURS:
+            continue
+        for jour in range(duree):
+            suivis += 1
+            dans_cible += BAS <= v0 + (v1 - v0) * (jour + 0.5) / duree <= HAUT
+    return 100 * dans_cible / suivis if suivis else math.nan
+
+
+def series_par_patient(patients, dates, inr):
+    """Mesures groupées par patient, dans l'ordre des dates"""
+    ordre = np.lexsort((dates, patients))
+    series = {}
+    for patient, jour, valeur in zip(patients[ordre].tolist(), dates[ordre].astype(object).tolist(), inr[ordre].tolist()):
+        serie = series.setdefault(patient, ([], []))
+        serie[0].append(jour)
+        serie[1].append(valeur)
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=10_000)
+    parser.add_argument("--mesures-max", type=int, default=200)
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    patients, dates, inr = registre_simule(args.patients, args.mesures_max)
+    meilleur = float("inf")
+    for _ in range(args.repetitions):
+        t0 = time.perf_counter()
+        colonnes = ttr_registre(patients, dates, inr, BAS, HAUT)
+        meilleur = min(meilleur, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    series = series_par_patient(patients, dates, inr)
+    references = {patient: ttr_boucle(*serie) for patient, serie in series.items()}
+    boucle = time.perf_counter() - t0
+    divergents = sum(
+        not (math.isnan(a) and math.isnan(references[p]) or math.isclose(a, references[p], rel_tol=1e-9, abs_tol=1e-9))
+        for p, a in zip(colonnes["patient_id"].tolist(), colonnes["ttr"].tolist())
+    )
+    echantillon = list(series.items())[:500]
+    quotidien = np.array([ttr_rosendaal_quotidien(*serie) - references[p] for p, serie in echantillon])
+
+    # score de thrombose : TTR prioritaire, INR du jour pour les patients sans TTR
+    rng = np.random.default_rng(1)
+    n = len(colonnes["ttr"])
+    fevg, fa, te, inr_jour = rng.integers(20, 70, n), rng.random(n) < 0.3, rng.random(n) < 0.1, np.round(rng.uniform(1.2, 3.5, n), 1)
+    codes, score = evaluer_risque_thrombose_vect(np.full(n, "Mécanique"), fevg, fa, te, inr_jour, colonnes["ttr"])
+    ecarts_score = sum(
+        evaluer_risque_thrombose("Mécanique", *valeurs) != (RISQUES_THROMBOSE[code], s)
+        for valeurs, code, s in zip(
+            zip(fevg.tolist(), fa.tolist(), te.tolist(), inr_jour.tolist(), colonnes["ttr"].tolist()),
+            codes.tolist(), score.tolist(),
+        )
+    )
+    sans_ttr = np.isnan(colonnes["ttr"])
+
+    rapport = {
+        "mesures": len(patients),
+        "patients": n,
+        "ttr_median": round(float(np.nanmedian(colonnes["ttr"])), 1),
+        "patients_sans_ttr": int(np.count_nonzero(sans_ttr)),
+        "registre_vectorise_s": round(meilleur, 3),
+        "registre_mesures_s": round(len(patients) / meilleur),
+        "boucle_par_patient_s": round(boucle, 2),
+        "divergences_boucle": divergents,
+        "ecart_rosendaal_quotidien": {
+            "moyen": round(float(np.nanmean(np.abs(quotidien))), 3), "max": round(float(np.nanmax(np.abs(quotidien))), 3),
+        },
+        "scores_modifies_par_ttr": int(np.count_nonzero(
+            (score != evaluer_risque_thrombose_vect(np.full(n, "Mécanique"), fevg, fa, te, inr_jour)[1])
+        )),
+        "ecarts_score_scalaire": ecarts_score,
+    }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if divergents or ecarts_score else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Coût d'un rerun de app.py par page, interactions scriptées rejouées par le pilote de test de Streamlit.
+
+Chaque page est ouverte depuis la barre latérale puis ses widgets sont
+manipulés un à un, un rerun par modification :
+
+- « balayage » : chaque slider de la page parcourt ``--points`` valeurs de
+  sa plage, chaque liste déroulante toutes ses options, chaque case est
+  cochée puis décochée (l'Accueil, sans widget, balaie les sliders de la
+  barre latérale) ;
+- Prothèses : toutes les tailles de toutes les marques des deux positions,
+  puis le balayage des sliders.
+
+Pour chaque rerun, le script mesure lui-même son temps mural et son temps
+CPU (thread du script) ; les allocations (pic et solde tracemalloc) sont
+relevées lors d'un second passage des mêmes interactions, pour ne pas
+ralentir le premier. AppTest relance tout app.py à chaque interaction : le
+coût d'un fragment seul est mesuré par bench_reruns.py.
+
+Les résultats peuvent être écrits en JSON (``--sortie``) et comparés à
+ceux d'un autre commit (``--reference``) : le script échoue (code 1) si le
+p50 mural ou CPU d'une page dépasse la référence au-delà du seuil.
+
+    python benchmarks/bench_pages.py --points 10 --sortie avant.json
+    python benchmarks/bench_pages.py --points 10 --reference avant.json --seuil 0.25
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# Le script mesure sa propre exécution : le temps mural de AppTest.run()
+# est dominé par l'attente active du pilote de test. app.py est compilé une
+# fois par session, comme le fait le serveur.
+_SCRIPT = """
+import sys, time, tracemalloc
+sys.path.insert(0, {racine!r})
+import streamlit as st
+if "_code_app" not in st.session_state:
+    with open({app!r}, encoding="utf-8") as fichier:
+        st.session_state["_code_app"] = compile(fichier.read(), {app!r}, "exec")
+allocations = tracemalloc.is_tracing()
+if allocations:
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+mur, cpu = time.perf_counter(), time.thread_time()
+exec(st.session_state["_code_app"], {{"__name__": "__main__", "__file__": {app!r}}})
+mesure = {{"mur_ms": (time.perf_counter() - mur) * 1000.0, "cpu_ms": (time.thread_time() - cpu) * 1000.0}}
+if allocations:
+    courante, pic = tracemalloc.get_traced_memory()
+    mesure.update(alloc_pic_ko=(pic - base) / 1024, alloc_solde_ko=(courante - base) / 1024)
+st.session_state["_mesure_rerun"] = mesure
+"""
+
+
+def widget(at, genre, ident):
+    """Widget ``genre`` de clé ou de libellé ``ident`` ; None s'il a disparu"""
+    return next((w for w in getattr(at, genre) if ident in (w.key, w.label)), None)
+
+
+def identifiants(widgets):
+    return [w.key or w.label for w in widgets]
+
+
+def valeurs_curseur(curseur, points):
+    """``points`` valeurs régulièrement réparties sur la plage du slider, arrondies à son pas"""
+    pas = curseur.step
+    nombre = int(round((curseur.max - curseur.min) / pas)) + 1
+    rangs = sorted({round(i * (nombre - 1) / max(points - 1, 1)) for i in range(min(points, nombre))})
+    conversion = int if isinstance(curseur.value, int) else float
+    return [conversion(round(curseur.min + rang * pas, 6)) for rang in rangs]
+
+
+def choisir(at, genre, ident, valeur):
+    """Règle un widget ; True si sa valeur change (un rerun est alors nécessaire)"""
+    element = widget(at, genre, ident)
+    if element is None or element.value == valeur:
+        return False
+    element.set_value(valeur)
+    return True
+
+
+def balayer_curseurs(at, curseurs, points):
+    for ident in identifiants(curseurs):
+        curseur = widget(at, "slider", ident)
+        if curseur is None:
+            continue
+        initiale = curseur.value
+        for valeur in valeurs_curseur(curseur, points):
+            if choisir(at, "slider", ident, valeur):
+                yield f"{ident}={valeur}"
+        # la valeur initiale est rétablie avec la modification suivante
+        choisir(at, "slider", ident, initiale)
+
+
+def balayage(at, points):
+    """Sliders de la page (ou de la barre latérale s'il n'y en a pas), listes déroulantes et cases"""
+    yield from balayer_curseurs(at, at.main.slider or at.sidebar.slider, points)
+    for genre in ("selectbox", "checkbox"):
+        for ident in identifiants(getattr(at.main, genre)):
+            element = widget(at, genre, ident)
+            initiale = element.value
+            for valeur in element.options if genre == "selectbox" else (not initiale,):
+                if choisir(at, genre, ident, valeur):
+                    yield f"{ident}={valeur}"
+            choisir(at, genre, ident, initiale)
+
+
+LISTES_PROTHESE = ("Type de prothèse", "Catégorie", "Marque/Modèle", "Taille (mm)")
+
+
+def balayage_protheses(at, points):
+    """Chaque taille de chaque marque des deux positions, puis les sliders de la page"""
+    curseurs = list(at.main.slider)
+    for ident in LISTES_PROTHESE:
+        if widget(at, "selectbox", ident) is None:
+            raise RuntimeError(f"Liste « {ident} » absente de la page Prothèses")
+
+    def parcourir(niveaux):
+        ident, suivants = niveaux[0], niveaux[1:]
+        for valeur in widget(at, "selectbox", ident).options:
+            if choisir(at, "selectbox", ident, valeur):
+                yield f"{ident}={valeur}"
+            if suivants:
+                yield from parcourir(suivants)
+
+    yield from parcourir(LISTES_PROTHESE)
+    yield from balayer_curseurs(at, curseurs, points)
+
+
+# page -> (libellé du menu, interactions)
+PAGES = {
+    "Accueil": ("🏠 Accueil", balayage),
+    "PRVG": ("🫀 Pression Remplissage VG", balayage),
+    "Diastolique": ("📊 Dysfonction Diastolique Complète", balayage),
+    "HTAP": ("🌊 Probabilité HTAP ESC 2022", balayage),
+    "Constrictive": ("🔄 Constrictive vs Restrictive", balayage),
+    "Prothèses": ("⚙️ Prothèses Valvulaires", balayage_protheses),
+}
+
+
+def rejouer(libelle, interactions, points):
+    """Mesures de chaque rerun provoqué par les interactions de la page"""
+    at = AppTest.from_string(_SCRIPT.format(racine=str(RACINE), app=str(RACINE / "app.py")), default_timeout=120)
+    at.run()
+    at.sidebar.radio[0].set_value(libelle).run()
+    mesures = []
+    for _ in interactions(at, points):
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception)
+        mesures.append(at.session_state["_mesure_rerun"])
+    return mesures
+
+
+def centiles(valeurs):
+    valeurs = sorted(valeurs)
+    rang_p95 = min(len(valeurs) - 1, max(0, round(0.95 * len(valeurs)) - 1))
+    return {"p50": round(statistics.median(valeurs), 2), "p95": round(valeurs[rang_p95], 2)}
+
+
+def mesurer_page(libelle, interactions, points):
+    temps = rejouer(libelle, interactions, points)
+    tracemalloc.start()
+    try:
+        allocations = rejouer(libelle, interactions, points)
+    finally:
+        tracemalloc.stop()
+    return {
+        "reruns": len(temps),
+        "mur_ms": centiles([m["mur_ms"] for m in temps]),
+        "cpu_ms": centiles([m["cpu_ms"] for m in temps]),
+        "alloc_pic_ko": centiles([m["alloc_pic_ko"] for m in allocations]),
+        "alloc_solde_ko": centiles([m["alloc_solde_ko"] for m in allocations]),
+    }
+
+
+def comparer(rapport, reference, seuil):
+    """Rapport p50 / p50 de référence par page ; pages dont le p50 mural ou CPU dépasse le seuil"""
+    ecarts, regressions = {}, []
+    for page, mesures in rapport["pages"].items():
+        ancienne = reference.get("pages", {}).get(page)
+        if not ancienne:
+            continue
+        ecarts[page] = {
+            grandeur: round(mesures[grandeur]["p50"] / ancienne[grandeur]["p50"], 2)
+            for grandeur in ("mur_ms", "cpu_ms", "alloc_pic_ko") if ancienne[grandeur]["p50"]
+        }
+        if any(ecarts[page].get(grandeur, 0) > 1 + seuil for grandeur in ("mur_ms", "cpu_ms")):
+            regressions.append(page)
+    return ecarts, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=10, help="Valeurs parcourues par slider")
+    parser.add_argument("--pages", nargs="*", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--sortie", type=Path, help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--reference", type=Path, help="Résultats JSON d'un autre commit")
+    parser.add_argument("--seuil", type=float, default=0.25, help="Ralentissement toléré du p50 par rapport à la référence")
+    args = parser.parse_args()
+
+    # historique des examens lu pendant les reruns, hors de la base de l'utilisateur
+    with tempfile.TemporaryDirectory() as repertoire:
+        os.environ["ECHO_EXPERT_BASE"] = str(Path(repertoire) / "examens.sqlite")
+        rapport = {"points": args.points, "pages": {page: mesurer_page(*PAGES[page], args.points) for page in args.pages}}
+
+    regressions = []
+    if args.reference:
+        rapport["seuil"] = args.seuil
+        rapport["rapport_a_la_reference"], regressions = comparer(
+            rapport, json.loads(args.reference.read_text(encoding="utf-8")), args.seuil)
+        rapport["regressions"] = regressions
+    if args.sortie:
+        args.sortie.write_text(json.dumps(rapport, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
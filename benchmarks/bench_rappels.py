@@ -0,0 +1,119 @@
+"""Rappels de contrôle : liste de travail du jour par le tas, mise à jour incrémentale et reconstruction.
+
+Le script échoue (code 1) si la liste de travail du tas diffère d'un
+parcours complet des rappels courants.
+
+    python benchmarks/bench_rappels.py --patients 50000 --mises-a-jour 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert.historique import Historique  # noqa: E402
+from echo_expert.rappels import Planning, controle, rappel  # noqa: E402
+
+PROTHESE = ("Prothèse aortique", "Mécanique", "St Jude Medical (Regent)", 21.0)
+JOUR = date(2026, 10, 17)
+# Résultat -> probabilité de tirage
+PERFORMANCES = {"Fonction normale": 0.9, "Dysfonction modérée": 0.08, "Dysfonction sévère": 0.02}
+PPM = {"absent": 0.8, "modere": 0.15, "severe": 0.05}
+RISQUES = {"faible": 0.7, "modere": 0.2, "eleve": 0.1}
+RETARD_MAX = 7
+
+
+def examens_simules(patients, graine=0):
+    """(patient_id, date, résultats) pour chaque numéro de ``patients``.
+
+    Régime établi : chaque patient a été vu depuis moins que son délai de
+    contrôle plus RETARD_MAX jours, les rappels échus sont donc les urgences
+    et les retards de la semaine.
+    """
+    rng = np.random.default_rng(graine)
+    tirages = [
+        rng.choice(list(valeurs), len(patients), p=list(valeurs.values())).tolist()
+        for valeurs in (PERFORMANCES, PPM, RISQUES)
+    ]
+    fractions = rng.random(len(patients)).tolist()
+    for i, patient in enumerate(patients.tolist()):
+        resultats = {"performance_prothese": tirages[0][i], "ppm": tirages[1][i], "risque_thrombose": tirages[2][i]}
+        delai = controle(*resultats.values())[2] + timedelta(days=RETARD_MAX)
+        yield f"P{patient:07d}", JOUR - delai * fractions[i], resultats
+
+
+def liste_de_reference(courants, jour):
+    """Référence : parcours de tous les rappels courants"""
+    echus = [element for element in courants.values() if element[0] <= jour]
+    return sorted(echus, key=lambda element: (element[1], element[0], element[2]))
+
+
+def centiles(durees):
+    durees = np.asarray(durees) * 1e6
+    return {"p50_us": round(float(np.percentile(durees, 50)), 2), "p99_us": round(float(np.percentile(durees, 99)), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=50_000)
+    parser.add_argument("--mises-a-jour", type=int, default=100_000, help="Examens enregistrés après la construction")
+    parser.add_argument("--listes", type=int, default=200, help="Listes de travail tirées pendant les mises à jour")
+    args = parser.parse_args()
+
+    # construction depuis l'historique : dernier examen de prothèse de chaque patient
+    with tempfile.TemporaryDirectory() as repertoire:
+        historique = Historique(Path(repertoire) / "examens.sqlite")
+        for patient_id, jour, resultats in examens_simules(np.arange(args.patients)):
+            historique.enregistrer(patient_id, {}, resultats, PROTHESE, jour)
+        historique.vider()
+        t0 = time.perf_counter()
+        planning = Planning.depuis_historique(historique)
+        depuis_historique = time.perf_counter() - t0
+
+    courants = {patient_id: planning.prochain(patient_id) for patient_id in (f"P{i:07d}" for i in range(args.patients))}
+    t0 = time.perf_counter()
+    Planning(courants.values())
+    reconstruction = time.perf_counter() - t0
+
+    mises_a_jour, listes, references, ecarts = [], [], [], 0
+    intervalle = max(args.mises_a_jour // args.listes, 1)
+    examens = examens_simules(np.random.default_rng(1).integers(0, args.patients, args.mises_a_jour), graine=2)
+    for rang, (patient_id, jour, resultats) in enumerate(examens):
+        t0 = time.perf_counter()
+        planning.noter(patient_id, jour, resultats)
+        mises_a_jour.append(time.perf_counter() - t0)
+        nouveau = rappel(patient_id, jour, *resultats.values())
+        if courants[patient_id][3] <= jour:
+            courants[patient_id] = nouveau
+        if rang % intervalle == 0:
+            t0 = time.perf_counter()
+            liste = planning.a_rappeler(JOUR)
+            listes.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            reference = liste_de_reference(courants, JOUR)
+            references.append(time.perf_counter() - t0)
+            ecarts += liste != reference
+
+    urgents = sum(element[1] == 0 for element in liste)
+    rapport = {
+        "patients": len(planning),
+        "construction_depuis_historique_s": round(depuis_historique, 3),
+        "reconstruction_complete_ms": round(reconstruction * 1e3, 2),
+        "mise_a_jour": centiles(mises_a_jour),
+        "liste_du_jour": {"rappels": len(liste), "urgents": urgents, **centiles(listes)},
+        "parcours_complet": centiles(references),
+        "listes_differentes": ecarts,
+    }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if ecarts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Rapports d'examen : archive zip de la liste de travail du jour, rendu sur place contre pool de processus.
+
+Le script échoue (code 1) si l'archive du pool diffère de celle rendue sur
+place (mêmes rapports, dans le même ordre), ou si un dépôt dans la file de
+fond dépasse le budget.
+
+    python benchmarks/bench_rapports.py --examens 5000 --processus 4
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert.examen import evaluer_examen, fiche_examen  # noqa: E402
+from echo_expert.historique import Historique  # noqa: E402
+from echo_expert.rapports import FileRapports, generer_archive, rapport_examen  # noqa: E402
+
+JOUR = date(2026, 10, 17)
+PROTHESE = ("Prothèse aortique", "Mécanique", "St Jude Medical (Regent)", 21.0)
+
+
+def examens_simules(examens, graine=0):
+    """(patient_id, fiche, résultats, prothèse) d'une journée : examens complets, un tiers avec prothèse"""
+    rng = np.random.default_rng(graine)
+    fevg, e_e_prime, tr_vitesse = rng.integers(25, 70, examens), rng.uniform(6, 18, examens), rng.uniform(2.0, 3.8, examens)
+    gradients, porteurs = rng.integers(8, 45, examens), rng.random(examens) < 1 / 3
+    for i in range(examens):
+        fiche = fiche_examen(
+            fevg=int(fevg[i]), e_e_prime=round(float(e_e_prime[i]), 1), tr_vitesse=round(float(tr_vitesse[i]), 1),
+            gradient_moyen=int(gradients[i]),
+        )
+        prothese = PROTHESE if porteurs[i] else None
+        yield f"P{i:07d}", fiche, evaluer_examen(fiche, 1.8, prothese and prothese[:2]), prothese
+
+
+def rss_max_mo(qui):
+    rss = resource.getrusage(qui).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def centiles(durees):
+    durees = np.asarray(durees) * 1e6
+    return {"p50_us": round(float(np.percentile(durees, 50)), 2), "p99_us": round(float(np.percentile(durees, 99)), 2)}
+
+
+def contenu(chemin):
+    with zipfile.ZipFile(chemin) as archive:
+        return [(info.filename, info.CRC, info.file_size) for info in archive.infolist()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examens", type=int, default=5_000)
+    parser.add_argument("--processus", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--taille-lot", type=int, default=200)
+    parser.add_argument("--depots", type=int, default=2_000, help="Demandes déposées dans la file de fond")
+    parser.add_argument("--budget-us", type=float, default=200.0, help="Budget p99 d'un dépôt dans la file (µs)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        repertoire = Path(repertoire)
+        historique = Historique(repertoire / "examens.sqlite")
+        for patient_id, fiche, resultats, prothese in examens_simules(args.examens):
+            historique.enregistrer(patient_id, fiche, resultats, prothese, JOUR)
+        historique.vider()
+        cles = historique.cles_examens(JOUR)
+
+        t0 = time.perf_counter()
+        generer_archive(repertoire / "sur_place.zip", cles, historique.chemin, 1, args.taille_lot)
+        sur_place = time.perf_counter() - t0
+
+        # mémoire Python du processus principal suivie pendant l'écriture de l'archive
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        rapports = generer_archive(repertoire / "pool.zip", cles, historique.chemin, args.processus, args.taille_lot)
+        pool = time.perf_counter() - t0
+        pic_pool = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        reference, obtenu = contenu(repertoire / "sur_place.zip"), contenu(repertoire / "pool.zip")
+        taille_rapports = sum(taille for _, _, taille in obtenu)
+        taille_archive = (repertoire / "pool.zip").stat().st_size
+
+        # dépôt d'une demande sur le fil du rerun, rendu par le fil de fond
+        file = FileRapports()
+        examen = historique.examens_cles(cles[:1])[0]
+        depots = []
+        for i in range(args.depots):
+            t0 = time.perf_counter()
+            file.soumettre(("patient", i), rapport_examen, examen)
+            depots.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        file.vider()
+        traitement = time.perf_counter() - t0
+
+    depot = centiles(depots)
+    rapport = {
+        "examens": len(cles),
+        "rapports": rapports,
+        "processus": args.processus,
+        "sur_place_s": round(sur_place, 2),
+        "sur_place_rapports_s": round(rapports / sur_place),
+        "pool_s": round(pool, 2),
+        "pool_rapports_s": round(rapports / pool),
+        "acceleration": round(sur_place / pool, 2),
+        "rapports_mo": round(taille_rapports / 1e6, 1),
+        "archive_mo": round(taille_archive / 1e6, 1),
+        "pic_python_principal_mo": round(pic_pool / 1e6, 1),
+        "pic_rss_mo": {"principal": rss_max_mo(resource.RUSAGE_SELF), "processus_du_pool": rss_max_mo(resource.RUSAGE_CHILDREN)},
+        "depot_file_de_fond": depot,
+        "attente_fil_de_fond_s": round(traitement, 2),
+        "archives_differentes": reference != obtenu,
+    }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if reference != obtenu or rapports != len(cles) or depot["p99_us"] > args.budget_us else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Coût d'un déplacement de slider par page : script complet contre fragment seul.
+
+« script complet » : ce qu'exécutait chaque tick avant le découpage en
+fragments (app.py entier : CSS, barre latérale, page, pied de page).
+« fragment » : ce qu'exécute désormais un tick, la seule fonction de page.
+
+    python benchmarks/bench_reruns.py --ticks 30
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# page -> (libellé du menu, fonction de vues.py, arguments, clé du slider, valeurs balayées)
+SCENARIOS = {
+    "PRVG": ("🫀 Pression Remplissage VG", "page_prvg", (), "mesure_e_e_prime", [5.0 + 0.5 * i for i in range(40)]),
+    "HTAP": ("🌊 Probabilité HTAP ESC 2022", "page_htap", (), "mesure_tr_vitesse", [1.5 + 0.1 * i for i in range(35)]),
+    "Prothèses": ("⚙️ Prothèses Valvulaires", "page_protheses", (1.8,), "mesure_gradient_moyen", list(range(5, 60))),
+    "Diastolique": ("📊 Dysfonction Diastolique Complète", "page_diastolique", (),
+                    "mesure_e_e_prime", [5.0 + 0.5 * i for i in range(40)]),
+    "Péricarde": ("🔄 Constrictive vs Restrictive", "page_pericarde", (), "mesure_strain_longitudinal", list(range(-25, -9))),
+    "Examen": ("🧾 Examen Complet", "page_examen", (1.8,), "mesure_tr_vitesse", [1.5 + 0.1 * i for i in range(35)]),
+}
+
+
+# Les scripts mesurent leur propre durée d'exécution : le temps mural de
+# AppTest.run() est dominé par l'attente active du pilote de test.
+_SCRIPT = """
+import sys, time
+sys.path.insert(0, {racine!r})
+import streamlit as st
+debut = time.perf_counter()
+{corps}
+st.session_state["_duree_script_ms"] = (time.perf_counter() - debut) * 1000.0
+"""
+
+
+def script_complet():
+    """Script AppTest qui exécute app.py en entier"""
+    corps = f"import runpy\nrunpy.run_path({str(RACINE / 'app.py')!r}, run_name='__main__')"
+    return _SCRIPT.format(racine=str(RACINE), corps=corps)
+
+
+def script_fragment(nom_fonction, arguments):
+    """Script AppTest qui n'exécute que la fonction de page"""
+    corps = f"import vues\nvues.{nom_fonction}(*{arguments!r})"
+    return _SCRIPT.format(racine=str(RACINE), corps=corps)
+
+
+def balayer(at, cle, valeurs, ticks):
+    """Durées d'exécution (ms) de ``ticks`` reruns successifs après changement du slider"""
+    durees = []
+    for i in range(ticks):
+        at.slider(key=cle).set_value(round(valeurs[i % len(valeurs)], 1))
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception)
+        durees.append(at.session_state["_duree_script_ms"])
+    return durees
+
+
+def mesurer_page(libelle, nom_fonction, arguments, cle, valeurs, ticks):
+    complet = AppTest.from_string(script_complet(), default_timeout=60)
+    complet.run()
+    complet.sidebar.radio[0].set_value(libelle).run()
+    durees_complet = balayer(complet, cle, valeurs, ticks)
+
+    fragment = AppTest.from_string(script_fragment(nom_fonction, arguments), default_timeout=60)
+    fragment.run()
+    durees_fragment = balayer(fragment, cle, valeurs, ticks)
+
+    return {
+        "script_complet_p50_ms": round(statistics.median(durees_complet), 2),
+        "fragment_p50_ms": round(statistics.median(durees_fragment), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--pages", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = parser.parse_args()
+
+    rapport = {page: mesurer_page(*SCENARIOS[page], args.ticks) for page in args.pages}
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""CPU serveur par examen complet : saisie en temps réel contre saisie groupée.
+
+Un examen consiste à modifier tous les champs de mesure d'une page (ceux
+que la saisie groupée place dans le formulaire). En temps réel, chaque
+modification relance la page ; en saisie groupée, une seule exécution a
+lieu à la validation. Le temps CPU est mesuré dans le thread du script.
+
+    python benchmarks/bench_saisie.py --examens 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# page -> (fonction de vues.py, arguments, clé du formulaire)
+PAGES = {
+    "PRVG": ("page_prvg", (), "prvg"),
+    "HTAP": ("page_htap", (), "htap"),
+    "Prothèses": ("page_protheses", (1.8,), "protheses"),
+    "Diastolique": ("page_diastolique", (), "diastolique"),
+    "Péricarde": ("page_pericarde", (), "pericarde"),
+    "Examen": ("page_examen", (1.8,), "examen"),
+}
+
+_SCRIPT = """
+import sys, time
+sys.path.insert(0, {racine!r})
+import streamlit as st
+import vues
+st.session_state.setdefault("saisie_groupee", {groupee!r})
+debut = time.thread_time()
+vues.{fonction}(*{arguments!r})
+st.session_state["_cpu_ms"] = st.session_state.get("_cpu_ms", 0.0) + (time.thread_time() - debut) * 1000.0
+st.session_state["_executions"] = st.session_state.get("_executions", 0) + 1
+"""
+
+
+def ouvrir_page(fonction, arguments, groupee):
+    at = AppTest.from_string(
+        _SCRIPT.format(racine=str(RACINE), groupee=groupee, fonction=fonction, arguments=arguments),
+        default_timeout=60,
+    )
+    at.run()
+    return at
+
+
+def champs_du_formulaire(at):
+    """(type, rang) des widgets placés dans le formulaire de la page"""
+    return [
+        (type_widget, rang)
+        for type_widget in ("slider", "selectbox", "checkbox")
+        for rang, widget in enumerate(getattr(at, type_widget))
+        if widget.form_id
+    ]
+
+
+def nouvelle_valeur(widget, fraction):
+    """Valeur à ``fraction`` de la plage du widget"""
+    if widget.type == "slider":
+        pas = widget.step
+        return round(widget.min + round((widget.max - widget.min) * fraction / pas) * pas, 2)
+    if widget.type == "selectbox":
+        return widget.options[int((len(widget.options) - 1) * fraction)]
+    return fraction > 0.5
+
+
+def saisir_examen(at, champs, fraction, cle_validation):
+    """Saisit un examen ; ``cle_validation`` à None pour le mode temps réel"""
+    for type_widget, rang in champs:
+        widget = getattr(at, type_widget)[rang]
+        widget.set_value(nouvelle_valeur(widget, fraction))
+        if cle_validation is None:
+            at.run()
+    if cle_validation is not None:
+        at.button(key=cle_validation).click().run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+
+
+def mesurer_mode(fonction, arguments, champs, cle_validation, examens):
+    at = ouvrir_page(fonction, arguments, cle_validation is not None)
+    cpu, executions = [], []
+    for i in range(examens):
+        cpu_avant = at.session_state["_cpu_ms"]
+        executions_avant = at.session_state["_executions"]
+        saisir_examen(at, champs, 0.25 if i % 2 else 0.75, cle_validation)
+        cpu.append(at.session_state["_cpu_ms"] - cpu_avant)
+        executions.append(at.session_state["_executions"] - executions_avant)
+    return {"cpu_ms_par_examen": round(statistics.median(cpu), 2), "executions_par_examen": max(executions)}
+
+
+def mesurer_page(fonction, arguments, cle, examens):
+    champs = champs_du_formulaire(ouvrir_page(fonction, arguments, True))
+    temps_reel = mesurer_mode(fonction, arguments, champs, None, examens)
+    groupee = mesurer_mode(fonction, arguments, champs, f"valider_{cle}", examens)
+    return {
+        "champs": len(champs),
+        "temps_reel": temps_reel,
+        "saisie_groupee": groupee,
+        "gain": round(temps_reel["cpu_ms_par_examen"] / groupee["cpu_ms_par_examen"], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examens", type=int, default=10)
+    parser.add_argument("--pages", nargs="*", default=list(PAGES), choices=list(PAGES))
+    args = parser.parse_args()
+
+    rapport = {page: mesurer_page(*PAGES[page], args.examens) for page in args.pages}
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
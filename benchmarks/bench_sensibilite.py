@@ -0,0 +1,79 @@
+"""Cartes de sensibilité : évaluation d'une grille 2-D en un appel, fusion en rectangles et équivalence scalaire.
+
+    python benchmarks/bench_sensibilite.py --points 200
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert import (  # noqa: E402
+    classer_prvg,
+    evaluer_pattern_diastolique,
+    evaluer_performance_prothese,
+    evaluer_prvg_fevg_preservee,
+)
+from echo_expert.regles import classements_textuels, lire_regles  # noqa: E402
+from echo_expert.sensibilite import carte_sensibilite, evaluer_grille  # noqa: E402
+
+# (règle, axe x, axe y, mesures fixées, fonction scalaire de référence)
+CARTES = (
+    ("categorie_prvg", "e_e_prime", "volume_og", {"tr_vitesse": 3.0},
+     lambda m: classer_prvg(evaluer_prvg_fevg_preservee(m["e_e_prime"], m["volume_og"], m["tr_vitesse"]))),
+    ("performance_prothese", "gradient_moyen", "eoa_mesuree", {"type_general": "Prothèse aortique", "dvi": 0.28},
+     lambda m: evaluer_performance_prothese(m["type_general"], m["gradient_moyen"], m["eoa_mesuree"], m["dvi"])[0]),
+    ("pattern_diastolique", "dt", "e_vitesse", {"e_a_ratio": 2.0},
+     lambda m: evaluer_pattern_diastolique(m["e_a_ratio"], m["dt"], m["e_vitesse"])[0]),
+)
+
+
+def chronometrer(fonction, repetitions):
+    """Meilleur temps (s) sur plusieurs répétitions"""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - t0)
+    return meilleur
+
+
+def ecarts_scalaires(regle, axe_x, axe_y, fixes, reference, points):
+    """Cases de la grille dont le résultat diffère de la fonction scalaire"""
+    x, y, resultats = evaluer_grille(regle, axe_x, axe_y, fixes, points)
+    libelles = classements_textuels(lire_regles())[regle]
+    ecarts = 0
+    for i, valeur_y in enumerate(y.tolist()):
+        for j, valeur_x in enumerate(x.tolist()):
+            ecarts += libelles[resultats[i, j]] != reference(dict(fixes, **{axe_x: valeur_x, axe_y: valeur_y}))
+    return ecarts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--repetitions", type=int, default=10)
+    args = parser.parse_args()
+
+    rapport, total = {}, 0
+    for regle, axe_x, axe_y, fixes, reference in CARTES:
+        carte_sensibilite(regle, axe_x, axe_y, fixes, args.points)
+        x, y, _ = evaluer_grille(regle, axe_x, axe_y, fixes, args.points)
+        ecarts = ecarts_scalaires(regle, axe_x, axe_y, fixes, reference, args.points)
+        total += ecarts
+        rapport[f"{regle} ({axe_x} × {axe_y})"] = {
+            "cases": len(x) * len(y),
+            "rectangles": len(carte_sensibilite(regle, axe_x, axe_y, fixes, args.points)["x0"]),
+            "grille_ms": round(chronometrer(lambda: evaluer_grille(regle, axe_x, axe_y, fixes, args.points), args.repetitions) * 1000, 2),
+            "carte_ms": round(chronometrer(lambda: carte_sensibilite(regle, axe_x, axe_y, fixes, args.points), args.repetitions) * 1000, 2),
+            "ecarts": ecarts,
+        }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Surveillance des prothèses : table d'implants jointe au référentiel, synthèse par modèle et cache du fichier.
+
+Un quart des implants porte la position courte du référentiel (« aortique »,
+« mitrale ») au lieu du libellé de l'interface. Le script échoue (code 1) si
+une évaluation vectorisée diffère des fonctions scalaires, appelées avec le
+libellé de l'interface, sur l'échantillon comparé.
+
+    python benchmarks/bench_surveillance.py --implants 1000000
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert import calculer_ppm, evaluer_performance_prothese, evaluer_risque_thrombose  # noqa: E402
+from echo_expert.referentiel import LIBELLES_POSITIONS, charger_referentiel  # noqa: E402
+from echo_expert.surveillance import NIVEAUX, evaluer_fichier_implants, synthese  # noqa: E402
+
+
+def implants_simules(n, graine=0):
+    """Implants tirés au hasard dans le référentiel, mesures du dernier contrôle autour de l'EOA théorique.
+
+    Un implant sur quatre est codé par la position courte du référentiel.
+    """
+    rng = np.random.default_rng(graine)
+    referentiel = charger_referentiel()
+    lignes = rng.integers(0, len(referentiel), n)
+    aortique = referentiel.position[lignes] == "aortique"
+    return pd.DataFrame({
+        "patient_id": np.char.add("P", np.arange(n).astype("U8")),
+        "type_general": np.where(
+            rng.random(n) < 0.25, referentiel.position[lignes], np.where(aortique, "Prothèse aortique", "Prothèse mitrale")),
+        "marque": referentiel.marque[lignes],
+        "taille": referentiel.taille[lignes],
+        "surface_corporelle": np.round(rng.uniform(1.4, 2.4, n), 1),
+        "eoa_mesuree": np.round(referentiel.eoa[lignes] * rng.uniform(0.5, 1.1, n), 1),
+        "gradient_moyen": np.where(aortique, rng.integers(5, 45, n), rng.integers(2, 15, n)),
+        "dvi": np.where(aortique, np.round(rng.uniform(0.2, 0.5, n), 2), np.nan),
+        "fevg_prothese": rng.integers(20, 70, n),
+        "fa": rng.random(n) < 0.3,
+        "antecedent_te": rng.random(n) < 0.1,
+        "inr": np.round(rng.uniform(1.2, 3.5, n), 1),
+    })
+
+
+def ecarts_scalaires(implants, evaluations, echantillon):
+    """(écarts, durée par patient) : le parcours de l'interface, patient par patient, sur un échantillon"""
+    referentiel = charger_referentiel()
+    colonnes = {nom: evaluations[nom].head(echantillon).tolist()
+                for nom in ("ratio_eoa", "ppm", "risque_thrombose", "score_thrombose", "performance_prothese")}
+    ecarts = 0
+    t0 = time.perf_counter()
+    for i, ligne in enumerate(implants.head(echantillon).itertuples(index=False)):
+        type_general = LIBELLES_POSITIONS.get(ligne.type_general, ligne.type_general)
+        donnees = referentiel.chercher(type_general, ligne.marque, ligne.taille)
+        ratio_eoa = ligne.eoa_mesuree / donnees["eoa"] * 100
+        ppm, _ = calculer_ppm(ligne.eoa_mesuree, ligne.surface_corporelle)
+        risque, score = evaluer_risque_thrombose(donnees["categorie"], ligne.fevg_prothese, ligne.fa, ligne.antecedent_te, ligne.inr)
+        dvi = ligne.dvi if type_general == "Prothèse aortique" else None
+        performance, _ = evaluer_performance_prothese(type_general, ligne.gradient_moyen, ligne.eoa_mesuree, dvi)
+        ecarts += (
+            not math.isclose(ratio_eoa, colonnes["ratio_eoa"][i])
+            or (ppm, risque, score, performance) != (
+                colonnes["ppm"][i], colonnes["risque_thrombose"][i],
+                colonnes["score_thrombose"][i], colonnes["performance_prothese"][i],
+            )
+        )
+    return ecarts, (time.perf_counter() - t0) / echantillon
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--implants", type=int, default=1_000_000)
+    parser.add_argument("--echantillon", type=int, default=20_000, help="Implants comparés aux fonctions scalaires")
+    args = parser.parse_args()
+
+    implants = implants_simules(args.implants)
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = Path(repertoire) / "implants.parquet"
+        implants.to_parquet(chemin, index=False)
+        cache = Path(repertoire) / "cache"
+
+        t0 = time.perf_counter()
+        evaluations, _ = evaluer_fichier_implants(chemin, cache)
+        premier = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        _, depuis_cache = evaluer_fichier_implants(chemin, cache)
+        en_cache = time.perf_counter() - t0
+        os.utime(chemin)
+        _, apres_modification = evaluer_fichier_implants(chemin, cache)
+
+    syntheses = {}
+    for niveau in NIVEAUX:
+        t0 = time.perf_counter()
+        groupes = len(synthese(evaluations, niveau))
+        syntheses[niveau] = {"groupes": groupes, "s": round(time.perf_counter() - t0, 4)}
+    ecarts, par_patient = ecarts_scalaires(implants, evaluations, min(args.echantillon, args.implants))
+
+    rapport = {
+        "implants": args.implants,
+        "evaluation_fichier_s": round(premier, 3),
+        "evaluation_depuis_cache_s": round(en_cache, 3),
+        "cache_utilise": depuis_cache,
+        "cache_invalide_apres_modification": not apres_modification,
+        "syntheses": syntheses,
+        "scalaire_par_patient_us": round(par_patient * 1e6, 2),
+        "scalaire_extrapole_s": round(par_patient * args.implants, 1),
+        "ecarts": ecarts,
+    }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if ecarts or not depuis_cache or apres_modification else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
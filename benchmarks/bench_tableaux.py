@@ -0,0 +1,68 @@
+"""Coût d'affichage des tableaux de résultats : échec contre succès du cache.
+
+Pour chaque tableau mémoïsé de vues.py, mesure le temps de construction et
+d'affichage (st.dataframe) lorsque le tableau doit être construit (échec :
+DataFrame pandas puis conversion Arrow, le coût de chaque rerun avant la
+mémoïsation) et lorsqu'il est servi par le cache (succès : table Arrow déjà
+construite). La mesure est faite dans un script AppTest.
+
+    python benchmarks/bench_tableaux.py --repetitions 200
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+_SCRIPT = """
+import sys, time
+sys.path.insert(0, {racine!r})
+import streamlit as st
+import vues
+
+CAS = {{
+    "table_recommandations": (1.8, "Prothèse aortique"),
+    "table_identification": (1.6, 18, "Prothèse aortique"),
+    "table_parametres_diastoliques": (1.2, 12.0, 35, 2.8, 180, 1.2, 10, 45),
+}}
+
+def chronometrer(afficher):
+    debut = time.perf_counter()
+    for _ in range({repetitions}):
+        afficher()
+    return round((time.perf_counter() - debut) / {repetitions} * 1000, 3)
+
+rapport = {{}}
+for nom, arguments in CAS.items():
+    table = vues.TABLES_MEMOISEES[nom]
+    table(*arguments)
+    rapport[nom] = {{
+        "echec_ms": chronometrer(lambda: st.dataframe(table.__wrapped__(*arguments))),
+        "succes_ms": chronometrer(lambda: st.dataframe(table(*arguments))),
+    }}
+st.session_state["rapport"] = rapport
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=200)
+    args = parser.parse_args()
+
+    at = AppTest.from_string(_SCRIPT.format(racine=str(RACINE), repetitions=args.repetitions), default_timeout=600)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+    print(json.dumps(at.session_state["rapport"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Tendances des prothèses : groupement vectorisé du registre, mise à jour incrémentale et équivalence.
+
+Le script échoue (code 1) si les deux calculs divergent pour un patient.
+
+    python benchmarks/bench_tendances.py --patients 100000 --examens-max 20
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert.tendances import SUIVIS, SuiviPatient, aggravations, tendances_registre  # noqa: E402
+
+
+def registre_simule(patients, examens_max, graine=0):
+    """Examens annuels tirés au hasard : un tiers des prothèses se dégrade, une sur dix par rupture"""
+    rng = np.random.default_rng(graine)
+    nombres = rng.integers(1, examens_max + 1, patients)
+    patient = np.repeat(np.arange(patients), nombres)
+    rang = np.arange(len(patient)) - np.repeat(np.cumsum(nombres) - nombres, nombres)
+    dates = np.datetime64("2005-01-01") + (rang * 365 + rng.integers(0, 90, len(patient))).astype("timedelta64[D]")
+    pente = rng.choice([0.0, 0.0, 3.0], patients)[patient]
+    saut = np.where((rng.random(patients) < 0.1)[patient] & (rang > nombres[patient] // 2), 12.0, 0.0)
+    gradient = np.round(rng.uniform(8, 25, patients)[patient] + pente * rang + saut + rng.normal(0, 2, len(patient)))
+    eoa = np.round(rng.uniform(1.2, 2.2, patients)[patient] - 0.03 * pente * rang + rng.normal(0, 0.1, len(patient)), 1)
+    eoa[rng.random(len(patient)) < 0.05] = np.nan
+    melange = rng.permutation(len(patient))
+    identifiants = np.char.add("P", patient.astype("U7"))
+    return identifiants[melange], dates[melange], {"gradient_moyen": gradient[melange], "eoa_mesuree": eoa[melange]}
+
+
+def suivis_incrementaux(patients, dates, mesures):
+    """Référence : un SuiviPatient par patient, examens ajoutés un à un dans l'ordre des dates"""
+    ordre = np.lexsort((dates, patients))
+    colonnes = {nom: colonne[ordre].tolist() for nom, colonne in mesures.items()}
+    suivis = {}
+    durees = []
+    for ligne, (patient, jour) in enumerate(zip(patients[ordre].tolist(), dates[ordre].tolist())):
+        suivi = suivis.setdefault(patient, SuiviPatient())
+        t0 = time.perf_counter()
+        suivi.ajouter(jour, {nom: colonne[ligne] for nom, colonne in colonnes.items()})
+        durees.append(time.perf_counter() - t0)
+    return suivis, durees
+
+
+def ecarts(colonnes, suivis):
+    """Patients dont les pentes, ruptures ou tendance diffèrent entre les deux calculs"""
+    divergents = 0
+    for ligne, patient in enumerate(colonnes["patient_id"].tolist()):
+        suivi = suivis[patient]
+        variables = suivi.variables()
+        egal = suivi.tendance() == colonnes["tendance"][ligne]
+        for suffixe, _ in SUIVIS.values():
+            a, b = variables[f"pente_{suffixe}"], float(colonnes[f"pente_{suffixe}"][ligne])
+            egal &= (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+            egal &= variables[f"rupture_{suffixe}"] == bool(colonnes[f"rupture_{suffixe}"][ligne])
+        divergents += not egal
+    return divergents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=100_000)
+    parser.add_argument("--examens-max", type=int, default=20)
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    patients, dates, mesures = registre_simule(args.patients, args.examens_max)
+    meilleur = float("inf")
+    for _ in range(args.repetitions):
+        t0 = time.perf_counter()
+        colonnes = tendances_registre(patients, dates, mesures)
+        meilleur = min(meilleur, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    suivis, durees = suivis_incrementaux(patients, dates.astype(object), mesures)
+    incremental = time.perf_counter() - t0
+    divergents = ecarts(colonnes, suivis)
+
+    suivi = next(iter(suivis.values()))
+    jour = dates[0].astype(object)
+    t0 = time.perf_counter()
+    for _ in range(10_000):
+        copie = suivi.copie()
+        copie.ajouter(jour, {"gradient_moyen": 20, "eoa_mesuree": 1.5})
+        copie.tendance()
+    rerun = (time.perf_counter() - t0) / 10_000
+
+    rapport = {
+        "examens": len(patients),
+        "patients": args.patients,
+        "aggravations": len(aggravations(colonnes)["patient_id"]),
+        "registre_vectorise_s": round(meilleur, 3),
+        "registre_examens_s": round(len(patients) / meilleur),
+        "registre_incremental_s": round(incremental, 2),
+        "ajout_examen_us": round(float(np.median(durees)) * 1e6, 2),
+        "rerun_copie_ajout_tendance_us": round(rerun * 1e6, 2),
+        "divergences": divergents,
+    }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if divergents else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Débit des évaluations vectorisées PRVG / diastolique et équivalence avec les fonctions scalaires.
+
+La colonne ``fevg`` est vérifiée sous ses deux formes : libellés de classe
+et FE VG en % (classée comme par ``examen.classe_fevg``).
+
+    python benchmarks/bench_vectoriel.py --lignes 2000000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert import (  # noqa: E402
+    classer_prvg,
+    evaluer_grade_diastolique,
+    evaluer_pattern_diastolique,
+    evaluer_prvg_fevg_preservee,
+)
+from echo_expert.examen import classe_fevg  # noqa: E402
+from echo_expert.vectoriel import (  # noqa: E402
+    CATEGORIES_PRVG,
+    PATTERNS_DIASTOLIQUES,
+    evaluer_grade_diastolique_vect,
+    evaluer_pattern_diastolique_vect,
+    evaluer_prvg_fevg_preservee_vect,
+)
+
+
+def generer_cohorte(n, graine=0):
+    """Colonnes aléatoires sur les plages des sliders, arrondies à leur pas"""
+    rng = np.random.default_rng(graine)
+    return {
+        "e_e_prime": np.round(rng.uniform(5.0, 25.0, n), 1),
+        "volume_og": rng.integers(15, 81, n),
+        "tr_vitesse": np.round(rng.uniform(1.5, 4.5, n), 1),
+        "e_a_ratio": np.round(rng.uniform(0.5, 3.0, n), 1),
+        "dt": rng.integers(100, 401, n),
+        "e_vitesse": rng.integers(20, 201, n),
+        "fevg": rng.choice(np.array(["≥50%", "41-49%", "≤40%"]), n),
+        "fevg_pourcent": rng.integers(15, 81, n),
+    }
+
+
+def verifier_equivalence(cohorte, n):
+    """Compare les n premières lignes aux fonctions scalaires ; renvoie le nombre d'écarts"""
+    c = {k: v[:n] for k, v in cohorte.items()}
+    codes, criteres = evaluer_prvg_fevg_preservee_vect(c["e_e_prime"], c["volume_og"], c["tr_vitesse"])
+    patterns = evaluer_pattern_diastolique_vect(c["e_a_ratio"], c["dt"], c["e_vitesse"])
+    grades = evaluer_grade_diastolique_vect(
+        c["e_a_ratio"], c["e_e_prime"], c["volume_og"], c["tr_vitesse"], c["dt"], c["e_vitesse"], c["fevg"]
+    )
+    ecarts = 0
+    for i in range(n):
+        ligne = {k: v[i].item() for k, v in c.items()}
+        resultats = evaluer_prvg_fevg_preservee(ligne["e_e_prime"], ligne["volume_og"], ligne["tr_vitesse"])
+        pattern, _ = evaluer_pattern_diastolique(ligne["e_a_ratio"], ligne["dt"], ligne["e_vitesse"])
+        grade, _ = evaluer_grade_diastolique(
+            ligne["e_a_ratio"], ligne["e_e_prime"], ligne["volume_og"], ligne["tr_vitesse"],
+            ligne["dt"], ligne["e_vitesse"], ligne["fevg"],
+        )
+        ecarts += (
+            CATEGORIES_PRVG[codes[i]] != classer_prvg(resultats)
+            or criteres[i] != resultats["criteres_secondaires"]
+            or PATTERNS_DIASTOLIQUES[patterns[i]] != pattern
+            or grades[i] != grade
+        )
+    return ecarts
+
+
+def verifier_fevg_numerique(cohorte, n):
+    """Écarts de grade entre une FE VG en % et sa classe (classe_fevg) sur les n premières lignes"""
+    c = {k: v[:n] for k, v in cohorte.items()}
+    mesures = (c["e_a_ratio"], c["e_e_prime"], c["volume_og"], c["tr_vitesse"], c["dt"], c["e_vitesse"])
+    classes = np.array([classe_fevg(fevg) for fevg in c["fevg_pourcent"].tolist()])
+    return int(np.count_nonzero(
+        evaluer_grade_diastolique_vect(*mesures, c["fevg_pourcent"]) != evaluer_grade_diastolique_vect(*mesures, classes)
+    ))
+
+
+def chronometrer(fonction, repetitions):
+    """Meilleur temps (s) sur plusieurs répétitions"""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - t0)
+    return meilleur
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lignes", type=int, default=2_000_000)
+    parser.add_argument("--verification", type=int, default=200_000, help="Lignes comparées au scalaire")
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    c = generer_cohorte(args.lignes)
+    ecarts = verifier_equivalence(c, min(args.verification, args.lignes))
+    ecarts_fevg = verifier_fevg_numerique(c, min(args.verification, args.lignes))
+
+    mesures = {
+        "prvg_fevg_preservee": lambda: evaluer_prvg_fevg_preservee_vect(
+            c["e_e_prime"], c["volume_og"], c["tr_vitesse"]),
+        "pattern_diastolique": lambda: evaluer_pattern_diastolique_vect(c["e_a_ratio"], c["dt"], c["e_vitesse"]),
+        "grade_diastolique": lambda: evaluer_grade_diastolique_vect(
+            c["e_a_ratio"], c["e_e_prime"], c["volume_og"], c["tr_vitesse"], c["dt"], c["e_vitesse"], c["fevg"]),
+    }
+    rapport = {"lignes": args.lignes, "ecarts_scalaire": int(ecarts), "ecarts_fevg_numerique": ecarts_fevg}
+    for nom, fonction in mesures.items():
+        duree = chronometrer(fonction, args.repetitions)
+        rapport[nom] = {"secondes": round(duree, 4), "lignes_par_s": round(args.lignes / duree)}
+    print(json.dumps(rapport, indent=2))
+    return 1 if ecarts or ecarts_fevg else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Comparaison de versions des règles : une passe commune contre une évaluation complète par version.
+
+    python benchmarks/bench_versions.py --lignes 1000000 --versions 3
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from echo_expert import cohorte  # noqa: E402
+from echo_expert.regles import compiler, variables_requises  # noqa: E402
+from echo_expert.examen import grille  # noqa: E402
+from echo_expert.vectoriel import PRIMITIVES_VECT, regles_versions_vect  # noqa: E402
+
+# Mesures absentes des grilles de saisie (FE VG en classes, comme dans les exports)
+CHOIX_SUPPLEMENTAIRES = {
+    "fevg": ("≥50%", "41-49%", "≤40%"),
+    "type_general": ("Prothèse aortique", "Prothèse mitrale"),
+}
+
+# Révisions fictives : chaque version déplace quelques seuils de la précédente
+REVISIONS = (
+    '[conditions]\nprvg_elevee = "e_e_prime > 13"\n',
+    '[classements.points_tr_htap]\ncas = [["tr_vitesse <= 2.7", 0], ["tr_vitesse <= 3.4", 1], [2]]\n',
+    '[scores.score_restrictif]\ntermes = [["strain_longitudinal > -16", 2]]\n',
+)
+
+
+def generer_cohorte(n, graine=0):
+    """Examens tirés au hasard sur les grilles de saisie de toutes les mesures comparées"""
+    rng = np.random.default_rng(graine)
+    mesures = set().union(*(variables_requises(cohorte.lire_regles(), nom) for nom in cohorte.RESULTATS_COMPARES))
+    colonnes = {}
+    for nom in sorted(mesures):
+        valeurs = CHOIX_SUPPLEMENTAIRES.get(nom) or grille(nom)
+        colonnes[nom] = np.asarray(valeurs)[rng.integers(0, len(valeurs), n)]
+    return pd.DataFrame(colonnes)
+
+
+def chronometrer(fonction, repetitions):
+    """Meilleur temps (s) sur plusieurs répétitions"""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - t0)
+    return meilleur
+
+
+def passes_separees(bloc, regles_separees, resultats):
+    """Référence : chaque version compilée seule et évaluée sur son propre dictionnaire de colonnes"""
+    valeurs = {}
+    for version, regles in regles_separees.items():
+        colonnes = {nom: bloc[nom] for nom in bloc.columns}
+        colonnes["dvi"] = np.full(len(bloc), np.nan)
+        for nom in resultats:
+            valeurs[version, nom] = np.broadcast_to(regles[nom](colonnes), (len(bloc),))
+    return valeurs
+
+
+def compter_ecarts(valeurs, versions, resultats):
+    """Examens dont le résultat change d'une version à l'autre, par résultat"""
+    reference, *autres = versions
+    ecarts = {}
+    for nom in resultats:
+        change = np.zeros(len(valeurs[reference, nom]), dtype=np.bool_)
+        for version in autres:
+            change |= valeurs[version, nom] != valeurs[reference, nom]
+        ecarts[nom] = int(np.count_nonzero(change))
+    return ecarts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lignes", type=int, default=1_000_000)
+    parser.add_argument("--versions", type=int, default=3, help=f"Versions comparées à regles.toml (1 à {len(REVISIONS)})")
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    bloc = generer_cohorte(args.lignes)
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemins = {}
+        contenu = ""
+        for rang, revision in enumerate(REVISIONS[:args.versions], start=1):
+            contenu += revision
+            chemins[f"v{rang}"] = Path(repertoire) / f"v{rang}.toml"
+            chemins[f"v{rang}"].write_text(contenu, encoding="utf-8")
+        versions = cohorte.versions_regles(chemins)
+
+    resultats = cohorte.resultats_applicables(versions, bloc.columns)
+    regles_versions = regles_versions_vect(versions)
+    regles_separees = {version: compiler(definitions, PRIMITIVES_VECT) for version, definitions in versions.items()}
+    ecarts = cohorte.comparer_bloc(bloc, versions, regles_versions, resultats)
+    par_resultat = ecarts["resultat"].value_counts().to_dict() if ecarts is not None else {}
+    attendu = compter_ecarts(passes_separees(bloc, regles_separees, resultats), versions, resultats)
+    divergences = sum(par_resultat.get(nom, 0) != nombre for nom, nombre in attendu.items())
+
+    commune = chronometrer(lambda: cohorte.comparer_bloc(bloc, versions, regles_versions, resultats), args.repetitions)
+    separees = chronometrer(lambda: passes_separees(bloc, regles_separees, resultats), args.repetitions)
+    rapport = {
+        "lignes": args.lignes,
+        "versions": len(versions),
+        "ecarts_par_resultat": attendu,
+        "divergences": divergences,
+        "passe_commune_s": round(commune, 4),
+        "passes_separees_s": round(separees, 4),
+        "acceleration": round(separees / commune, 2),
+    }
+    print(json.dumps(rapport, indent=2, ensure_ascii=False))
+    return 1 if divergences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
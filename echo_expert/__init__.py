@@ -0,0 +1,25 @@
+"""Noyau de calcul de l'application Échocardiographie Expert.
+
+Importable sans Streamlit ni pandas : les scripts batch et les services
+utilisent les mêmes fonctions que l'interface.
+"""
+
+from .protheses import protheses_aortiques, protheses_mitrales
+from .evaluations import (
+    evaluer_prvg_fevg_preservee,
+    evaluer_pattern_diastolique,
+    calculer_ppm,
+    evaluer_risque_thrombose,
+    calculer_probabilite_htap,
+    evaluer_constrictive_restrictive,
+    evaluer_dysfonction_diastolique_complete,
+    classer_prvg,
+    evaluer_grade_diastolique,
+    calculer_score_secondaire_htap,
+    classer_probabilite_htap,
+    classer_constrictive_restrictive,
+    evaluer_performance_prothese,
+    evaluer_evolution_gradient,
+    evaluer_repere,
+)
+from .examen import fiche_examen, classe_fevg, evaluer_examen
@@ -0,0 +1,281 @@
+"""Interface en ligne de commande du noyau echo_expert.
+
+    python -m echo_expert evaluer examens.csv examens_evalues.parquet --taille-bloc 100000
+    python -m echo_expert comparer examens.parquet ecarts.csv --version esc2025=regles_esc2025.toml
+    python -m echo_expert tendances aggravations.csv --aggravations
+    python -m echo_expert surveiller implants.csv synthese_modeles.csv --niveau marque
+    python -m echo_expert rappels rappels_du_jour.csv --jour 2026-10-17
+    python -m echo_expert inr mesures_inr.csv ttr_patients.csv --importer
+    python -m echo_expert rapports rapports_du_jour.zip --jour 2026-10-17 --processus 8
+"""
+
+import argparse
+import resource
+import sys
+import time
+from datetime import date
+
+
+def _rss_max_mo():
+    """Pic de mémoire résidente du processus (Mo)"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def _commande_evaluer(args):
+    from .cohorte import evaluer_fichier
+
+    debut = time.perf_counter()
+    lignes, evaluateurs = evaluer_fichier(args.entree, args.sortie, args.taille_bloc)
+    duree = time.perf_counter() - debut
+
+    print(f"Évaluateurs appliqués: {', '.join(evaluateurs) or 'aucun'}", file=sys.stderr)
+    print(
+        f"{lignes} lignes en {duree:.2f} s ({lignes / duree if duree else 0:,.0f} lignes/s), "
+        f"pic RSS {_rss_max_mo():.1f} Mo",
+        file=sys.stderr,
+    )
+    return 0
+
+def _version(texte):
+    nom, separateur, chemin = texte.partition("=")
+    if not separateur or not nom or not chemin:
+        raise argparse.ArgumentTypeError(f"attendu NOM=FICHIER.toml : {texte!r}")
+    return nom, chemin
+
+def _commande_comparer(args):
+    from .cohorte import comparer_fichier
+
+    debut = time.perf_counter()
+    lignes, resultats, transitions = comparer_fichier(
+        args.entree, args.sortie, dict(args.version), args.taille_bloc, tuple(args.identifiant)
+    )
+    duree = time.perf_counter() - debut
+
+    print(f"Résultats comparés: {', '.join(resultats) or 'aucun'}", file=sys.stderr)
+    for (resultat, *valeurs), nombre in sorted(transitions.items(), key=lambda t: (t[0][0], -t[1])):
+        print(f"{resultat}: {' → '.join(valeurs)} : {nombre}", file=sys.stderr)
+    print(
+        f"{lignes} lignes en {duree:.2f} s ({lignes / duree if duree else 0:,.0f} lignes/s), "
+        f"{sum(transitions.values())} écarts",
+        file=sys.stderr,
+    )
+    return 0
+
+def _commande_tendances(args):
+    import pandas as pd
+
+    from .cohorte import EcrivainBlocs, lire_blocs
+    from .historique import CHEMIN_BASE, Historique
+    from .tendances import SUIVIS, aggravations, tendances_historique, tendances_registre
+
+    debut = time.perf_counter()
+    if args.entree:
+        export = pd.concat(lire_blocs(args.entree, 1_000_000), ignore_index=True)
+        colonnes = tendances_registre(
+            export["patient_id"].to_numpy(), export["date_examen"].to_numpy(),
+            {nom: export[nom].to_numpy(dtype="float64", na_value=float("nan")) for nom in SUIVIS},
+        )
+        examens = len(export)
+    else:
+        colonnes = tendances_historique(Historique(args.base or CHEMIN_BASE))
+        examens = int(colonnes["examens"].sum())
+    duree = time.perf_counter() - debut
+    patients = len(colonnes["patient_id"])
+    if args.aggravations:
+        colonnes = aggravations(colonnes)
+
+    with EcrivainBlocs(args.sortie) as ecrivain:
+        ecrivain.ecrire(pd.DataFrame(colonnes))
+    print(
+        f"{examens} examens, {patients} patients en {duree:.2f} s, "
+        f"{len(colonnes['patient_id'])} lignes écrites",
+        file=sys.stderr,
+    )
+    return 0
+
+def _commande_surveiller(args):
+    import pandas as pd
+
+    from .cohorte import EcrivainBlocs
+    from .surveillance import evaluer_fichier_implants, synthese
+
+    debut = time.perf_counter()
+    evaluations, depuis_cache = evaluer_fichier_implants(args.entree)
+    tableau = synthese(evaluations, args.niveau)
+    duree = time.perf_counter() - debut
+
+    with EcrivainBlocs(args.sortie) as ecrivain:
+        ecrivain.ecrire(tableau)
+    if args.patients:
+        with EcrivainBlocs(args.patients) as ecrivain:
+            ecrivain.ecrire(pd.DataFrame(evaluations))
+    print(
+        f"{len(evaluations)} implants ({tableau.attrs['non_references']} hors référentiel), "
+        f"{len(tableau)} groupes en {duree:.2f} s{' (évaluations en cache)' if depuis_cache else ''}",
+        file=sys.stderr,
+    )
+    return 0
+
+def _commande_rappels(args):
+    import pandas as pd
+
+    from .cohorte import EcrivainBlocs
+    from .historique import CHEMIN_BASE, Historique
+    from .rappels import COLONNES_RAPPEL, Planning
+
+    debut = time.perf_counter()
+    planning = Planning.depuis_historique(Historique(args.base or CHEMIN_BASE))
+    rappels = planning.a_rappeler(args.jour)
+    duree = time.perf_counter() - debut
+
+    with EcrivainBlocs(args.sortie) as ecrivain:
+        ecrivain.ecrire(pd.DataFrame(rappels, columns=COLONNES_RAPPEL))
+    print(f"{len(planning)} patients suivis, {len(rappels)} à rappeler en {duree:.2f} s", file=sys.stderr)
+    return 0
+
+def _commande_inr(args):
+    import pandas as pd
+
+    from .cohorte import EcrivainBlocs
+    from .historique import CHEMIN_BASE, Historique
+    from .inr import lire_mesures_inr, ttr_registre
+
+    debut = time.perf_counter()
+    mesures = lire_mesures_inr(args.entree)
+    bas, haut = args.cible
+    if "cible_basse" in mesures and "cible_haute" in mesures:
+        bas, haut = mesures["cible_basse"].to_numpy(dtype="float64"), mesures["cible_haute"].to_numpy(dtype="float64")
+    colonnes = ttr_registre(
+        mesures["patient_id"].to_numpy(), mesures["date_mesure"].to_numpy(dtype="datetime64[D]"),
+        mesures["inr"].to_numpy(dtype="float64", na_value=float("nan")), bas, haut, args.debut,
+    )
+    duree = time.perf_counter() - debut
+
+    with EcrivainBlocs(args.sortie) as ecrivain:
+        ecrivain.ecrire(pd.DataFrame(colonnes))
+    if args.importer:
+        importees = Historique(args.base or CHEMIN_BASE).importer_inr(zip(
+            mesures["patient_id"].tolist(), mesures["date_mesure"].dt.strftime("%Y-%m-%d").tolist(),
+            mesures["inr"].tolist(),
+        ))
+        print(f"{importees} mesures importées dans l'historique", file=sys.stderr)
+    print(f"{len(mesures)} mesures, {len(colonnes['patient_id'])} patients en {duree:.2f} s", file=sys.stderr)
+    return 0
+
+def _commande_rapports(args):
+    from .historique import CHEMIN_BASE, Historique
+    from .rapports import cles_liste_de_travail, generer_archive
+
+    debut = time.perf_counter()
+    historique = Historique(args.base or CHEMIN_BASE)
+    cles = cles_liste_de_travail(historique, args.jour, args.rappels)
+    rapports = generer_archive(args.sortie, cles, historique.chemin, args.processus, args.taille_lot)
+    duree = time.perf_counter() - debut
+
+    print(
+        f"{rapports} rapports en {duree:.2f} s ({rapports / duree if duree else 0:,.0f} rapports/s), "
+        f"pic RSS {_rss_max_mo():.1f} Mo",
+        file=sys.stderr,
+    )
+    return 0
+
+def _jour(texte):
+    try:
+        return date.fromisoformat(texte)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"attendu AAAA-MM-JJ : {texte!r}") from None
+
+def _entier_positif(texte):
+    # tailles de bloc ou de lot, processus : une taille nulle ou négative ferait boucler la lecture par blocs
+    try:
+        valeur = int(texte)
+    except ValueError:
+        valeur = 0
+    if valeur <= 0:
+        raise argparse.ArgumentTypeError(f"attendu un entier strictement positif : {texte!r}")
+    return valeur
+
+def construire_parser():
+    parser = argparse.ArgumentParser(prog="python -m echo_expert", description="Évaluations échocardiographiques en lot")
+    sous_commandes = parser.add_subparsers(dest="commande", required=True)
+
+    evaluer = sous_commandes.add_parser("evaluer", help="Évaluer un export d'examens (CSV ou Parquet) par blocs")
+    evaluer.add_argument("entree", help="Fichier d'examens (.csv, .parquet)")
+    evaluer.add_argument("sortie", help="Fichier enrichi à écrire (.csv, .parquet)")
+    evaluer.add_argument("--taille-bloc", type=_entier_positif, default=100_000, help="Lignes par bloc (défaut: 100000)")
+    evaluer.set_defaults(fonction=_commande_evaluer)
+
+    comparer = sous_commandes.add_parser(
+        "comparer", help="Reclasser un export selon plusieurs versions des règles et écrire les écarts"
+    )
+    comparer.add_argument("entree", help="Fichier d'examens (.csv, .parquet)")
+    comparer.add_argument("sortie", help="Fichier des écarts à écrire (.csv, .parquet)")
+    comparer.add_argument(
+        "--version", type=_version, action="append", required=True, metavar="NOM=FICHIER",
+        help="Version comparée à regles.toml : fichier TOML des règles redéfinies (répétable)",
+    )
+    comparer.add_argument("--identifiant", action="append", default=[], metavar="COLONNE",
+                          help="Colonne recopiée dans les écarts (répétable)")
+    comparer.add_argument("--taille-bloc", type=_entier_positif, default=100_000, help="Lignes par bloc (défaut: 100000)")
+    comparer.set_defaults(fonction=_commande_comparer)
+
+    tendances = sous_commandes.add_parser(
+        "tendances", help="Pentes et ruptures du gradient et de l'EOA de chaque prothèse suivie"
+    )
+    tendances.add_argument("sortie", help="Fichier des tendances à écrire (.csv, .parquet)")
+    source = tendances.add_mutually_exclusive_group()
+    source.add_argument("--base", help="Historique SQLite des examens (défaut: base de l'application)")
+    source.add_argument("--entree", help="Export d'examens (.csv, .parquet) : patient_id, date_examen, gradient_moyen, eoa_mesuree")
+    tendances.add_argument("--aggravations", action="store_true",
+                           help="N'écrire que les prothèses en aggravation, pente du gradient décroissante")
+    tendances.set_defaults(fonction=_commande_tendances)
+
+    surveiller = sous_commandes.add_parser(
+        "surveiller", help="Évaluer une table d'implants et agréger les indicateurs par catégorie, modèle ou taille"
+    )
+    surveiller.add_argument("entree", help="Table d'implants (.csv, .parquet), une ligne par patient")
+    surveiller.add_argument("sortie", help="Synthèse à écrire (.csv, .parquet)")
+    surveiller.add_argument("--niveau", choices=("categorie", "marque", "taille"), default="marque",
+                            help="Regroupement de la synthèse (défaut: marque)")
+    surveiller.add_argument("--patients", help="Fichier des évaluations par patient à écrire (.csv, .parquet)")
+    surveiller.set_defaults(fonction=_commande_surveiller)
+
+    rappels = sous_commandes.add_parser(
+        "rappels", help="Patients dont le contrôle de prothèse est échu, les plus urgents d'abord"
+    )
+    rappels.add_argument("sortie", help="Liste de travail à écrire (.csv, .parquet)")
+    rappels.add_argument("--base", help="Historique SQLite des examens (défaut: base de l'application)")
+    rappels.add_argument("--jour", type=_jour, help="Jour de la liste de travail, AAAA-MM-JJ (défaut: aujourd'hui)")
+    rappels.set_defaults(fonction=_commande_rappels)
+
+    inr = sous_commandes.add_parser(
+        "inr", help="Temps dans la cible INR (TTR, Rosendaal) de chaque patient d'un fichier de mesures"
+    )
+    inr.add_argument("entree", help="Mesures d'INR (.csv, .parquet) : patient_id, date_mesure, inr [, cible_basse, cible_haute]")
+    inr.add_argument("sortie", help="TTR par patient à écrire (.csv, .parquet)")
+    inr.add_argument("--cible", type=float, nargs=2, default=(2.0, 3.0), metavar=("BAS", "HAUT"),
+                     help="Cible INR sans colonnes cible_basse et cible_haute (défaut: 2.0 3.0)")
+    inr.add_argument("--debut", type=_jour, help="Ne compter que les intervalles commençant ce jour ou après (AAAA-MM-JJ)")
+    inr.add_argument("--importer", action="store_true",
+                     help="Importer aussi les mesures dans l'historique (TTR proposé dans l'interface)")
+    inr.add_argument("--base", help="Historique SQLite des examens (défaut: base de l'application)")
+    inr.set_defaults(fonction=_commande_inr)
+
+    rapports = sous_commandes.add_parser(
+        "rapports", help="Rapports HTML des examens d'un jour, rendus par un pool de processus dans une archive zip"
+    )
+    rapports.add_argument("sortie", help="Archive zip à écrire")
+    rapports.add_argument("--base", help="Historique SQLite des examens (défaut: base de l'application)")
+    rapports.add_argument("--jour", type=_jour, help="Jour de la liste de travail, AAAA-MM-JJ (défaut: aujourd'hui)")
+    rapports.add_argument("--rappels", action="store_true",
+                          help="Rapporter le dernier examen des patients à rappeler au lieu des examens du jour")
+    rapports.add_argument("--processus", type=_entier_positif, help="Processus du pool (défaut: nombre de cœurs)")
+    rapports.add_argument("--taille-lot", type=_entier_positif, default=200, help="Examens par tâche du pool (défaut: 200)")
+    rapports.set_defaults(fonction=_commande_rapports)
+
+    return parser
+
+def main(argv=None):
+    args = construire_parser().parse_args(argv)
+    return args.fonction(args)
@@ -0,0 +1,319 @@
+"""Évaluation par blocs d'un export d'examens (CSV ou Parquet).
+
+Les colonnes d'entrée portent les noms des paramètres des fonctions
+d'évaluation (``e_e_prime``, ``volume_og``, ``tr_vitesse``...). Un évaluateur
+n'est appliqué que si toutes ses colonnes sont présentes dans le fichier.
+
+``comparer_fichier`` reclasse le même export selon plusieurs versions des
+règles en une seule passe par bloc et n'écrit que les examens dont un
+résultat change d'une version à l'autre.
+"""
+
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import vectoriel as v
+from .regles import VERSION_REFERENCE, charger_version, classements_textuels, lire_regles, variables_requises
+
+# ============================================================================
+# ÉVALUATEURS DE COHORTE
+# ============================================================================
+
+def _categories(codes, libelles):
+    """Colonne catégorielle pandas à partir de codes (catégories fixes d'un bloc à l'autre)"""
+    return pd.Categorical.from_codes(codes.astype(np.int8), categories=list(libelles))
+
+def _prvg(bloc):
+    codes, criteres = v.evaluer_prvg_fevg_preservee_vect(bloc["e_e_prime"], bloc["volume_og"], bloc["tr_vitesse"])
+    criteres = pd.array(criteres, dtype="UInt8")
+    if "fevg" in bloc:
+        # sans objet en FE VG < 50%, comme dans evaluer_examen (valeurs manquantes)
+        preservee = v._fevg_preservee(bloc["fevg"])
+        codes = np.where(preservee, codes, -1)
+        criteres[~preservee] = pd.NA
+    return {"categorie_prvg": _categories(codes, v.CATEGORIES_PRVG), "criteres_secondaires": criteres}
+
+def _diastolique(bloc):
+    resultats = v.evaluer_dysfonction_diastolique_complete_vect(
+        bloc["e_a_ratio"], bloc["e_e_prime"], bloc["volume_og"], bloc["tr_vitesse"],
+        bloc["dt"], bloc["e_vitesse"], bloc["fevg"],
+    )
+    pattern = resultats["pattern"].astype(np.int8)  # SANS_OBJET -> -1 (valeur manquante)
+    return {
+        "pattern_diastolique": pd.Categorical.from_codes(pattern, categories=list(v.PATTERNS_DIASTOLIQUES)),
+        "grade_diastolique": resultats["grade"],
+    }
+
+def _htap(bloc):
+    score = v.calculer_probabilite_htap_vect(
+        bloc["tr_vitesse"], bloc["vc_diametre"], bloc["vc_collapsus"], bloc["rv_ra_ratio"], bloc["septum_paradoxal"]
+    )
+    return {"score_htap": score}
+
+def _htap_secondaire(bloc):
+    score = v.calculer_probabilite_htap_vect(
+        bloc["tr_vitesse"], bloc["vc_diametre"], bloc["vc_collapsus"], bloc["rv_ra_ratio"], bloc["septum_paradoxal"]
+    )
+    secondaire = v.calculer_score_secondaire_htap_vect(
+        bloc["tapse"], bloc["s_tricuspide"], bloc["fac_vd"], bloc["acceleration_time"], bloc["pvr_estimee"]
+    )
+    probabilite = v.classer_probabilite_htap_vect(score, secondaire)
+    return {"score_secondaire_htap": secondaire, "probabilite_htap": _categories(probabilite, v.PROBABILITES_HTAP)}
+
+def _pericarde(bloc):
+    constriction, restrictif = v.evaluer_constrictive_restrictive_vect(
+        bloc["variation_respiratoire"], bloc["septal_bounce"], bloc["annulus_reverse"],
+        bloc["fonction_vg"], bloc["strain_longitudinal"],
+    )
+    diagnostic = v.classer_constrictive_restrictive_vect(constriction, restrictif)
+    return {
+        "score_constriction": constriction,
+        "score_restrictif": restrictif,
+        "diagnostic_pericardique": _categories(diagnostic, v.DIAGNOSTICS_PERICARDIQUES),
+    }
+
+def _ppm(bloc):
+    codes, eoai = v.calculer_ppm_vect(bloc["eoa_mesuree"], bloc["surface_corporelle"])
+    return {"eoai": eoai, "ppm": _categories(codes, v.SEVERITES_PPM)}
+
+def _thrombose(bloc):
+    # colonne ttr facultative : temps dans la cible INR, prioritaire sur l'INR là où il est connu
+    codes, score = v.evaluer_risque_thrombose_vect(
+        bloc["categorie"], bloc["fevg_prothese"], bloc["fa"], bloc["antecedent_te"], bloc["inr"],
+        bloc["ttr"] if "ttr" in bloc else None,
+    )
+    return {"score_thrombose": score, "risque_thrombose": _categories(codes, v.RISQUES_THROMBOSE)}
+
+def _performance(bloc):
+    dvi = bloc["dvi"] if "dvi" in bloc else np.full(len(bloc), np.nan)
+    codes = v.evaluer_performance_prothese_vect(bloc["type_general"], bloc["gradient_moyen"], bloc["eoa_mesuree"], dvi)
+    return {"performance_prothese": _categories(codes, v.PERFORMANCES_PROTHESE)}
+
+# (nom, colonnes requises, fonction bloc -> colonnes ajoutées)
+EVALUATEURS = (
+    ("prvg", ("e_e_prime", "volume_og", "tr_vitesse"), _prvg),
+    ("diastolique", ("e_a_ratio", "e_e_prime", "volume_og", "tr_vitesse", "dt", "e_vitesse", "fevg"), _diastolique),
+    ("htap", ("tr_vitesse", "vc_diametre", "vc_collapsus", "rv_ra_ratio", "septum_paradoxal"), _htap),
+    ("htap_secondaire", ("tr_vitesse", "vc_diametre", "vc_collapsus", "rv_ra_ratio", "septum_paradoxal",
+                         "tapse", "s_tricuspide", "fac_vd", "acceleration_time", "pvr_estimee"), _htap_secondaire),
+    ("pericarde", ("variation_respiratoire", "septal_bounce", "annulus_reverse",
+                   "fonction_vg", "strain_longitudinal"), _pericarde),
+    ("ppm", ("eoa_mesuree", "surface_corporelle"), _ppm),
+    ("thrombose", ("categorie", "fevg_prothese", "fa", "antecedent_te", "inr"), _thrombose),
+    ("performance", ("type_general", "gradient_moyen", "eoa_mesuree"), _performance),
+)
+
+def evaluateurs_applicables(colonnes):
+    """Évaluateurs dont toutes les colonnes requises sont présentes"""
+    colonnes = set(colonnes)
+    return [e for e in EVALUATEURS if colonnes.issuperset(e[1])]
+
+def evaluer_bloc(bloc, evaluateurs=None):
+    """Ajoute au DataFrame les colonnes de résultat de chaque évaluateur applicable"""
+    if evaluateurs is None:
+        evaluateurs = evaluateurs_applicables(bloc.columns)
+    resultats = {}
+    for _, _, fonction in evaluateurs:
+        resultats.update(fonction(bloc))
+    return bloc.assign(**resultats)
+
+# ============================================================================
+# LECTURE / ÉCRITURE PAR BLOCS
+# ============================================================================
+
+def _est_parquet(chemin):
+    return Path(chemin).suffix.lower() in (".parquet", ".pq")
+
+# Taille des blocs d'octets du lecteur CSV en flux. Le lecteur anticipe
+# plusieurs dizaines de blocs : une valeur plus grande fait croître la mémoire.
+OCTETS_PAR_LECTURE_CSV = 1 << 20
+
+def _regrouper(lots, taille_bloc):
+    """Regroupe des RecordBatch de tailles quelconques en tables de taille_bloc lignes"""
+    import pyarrow as pa
+
+    en_attente, lignes = [], 0
+    for lot in lots:
+        en_attente.append(lot)
+        lignes += lot.num_rows
+        while lignes >= taille_bloc:
+            table = pa.Table.from_batches(en_attente)
+            yield table.slice(0, taille_bloc)
+            reste = table.slice(taille_bloc)
+            en_attente, lignes = reste.to_batches(), reste.num_rows
+    if lignes:
+        yield pa.Table.from_batches(en_attente)
+
+def lire_blocs(chemin, taille_bloc):
+    """Itère sur le fichier d'entrée par DataFrames d'au plus taille_bloc lignes"""
+    if _est_parquet(chemin):
+        import pyarrow.parquet as pq
+
+        lots = pq.ParquetFile(chemin).iter_batches(batch_size=taille_bloc)
+    else:
+        import pyarrow.csv as pcsv
+
+        lots = pcsv.open_csv(chemin, read_options=pcsv.ReadOptions(block_size=OCTETS_PAR_LECTURE_CSV))
+    for table in _regrouper(lots, taille_bloc):
+        yield table.to_pandas()
+
+class EcrivainBlocs:
+    """Écrit les blocs successifs dans un seul fichier CSV ou Parquet"""
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.parquet = _est_parquet(chemin)
+        self._ecrivain = None
+        self._schema = None
+
+    def ecrire(self, bloc):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(bloc, preserve_index=False)
+        if self._ecrivain is None:
+            if self.parquet:
+                import pyarrow.parquet as pq
+
+                self._schema = table.schema
+                self._ecrivain = pq.ParquetWriter(self.chemin, self._schema)
+            else:
+                import pyarrow.csv as pcsv
+
+                # Les colonnes catégorielles sont écrites comme leurs libellés
+                self._schema = pa.schema([
+                    c.with_type(c.type.value_type) if pa.types.is_dictionary(c.type) else c
+                    for c in table.schema
+                ])
+                self._ecrivain = pcsv.CSVWriter(self.chemin, self._schema)
+        self._ecrivain.write_table(table.cast(self._schema))
+
+    def fermer(self):
+        if self._ecrivain is not None:
+            self._ecrivain.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+def evaluer_fichier(entree, sortie, taille_bloc=100_000):
+    """Évalue un export par blocs et écrit le fichier enrichi ; renvoie (lignes, évaluateurs appliqués)"""
+    lignes = 0
+    evaluateurs = None
+    with EcrivainBlocs(sortie) as ecrivain:
+        for bloc in lire_blocs(entree, taille_bloc):
+            if evaluateurs is None:
+                evaluateurs = evaluateurs_applicables(bloc.columns)
+            ecrivain.ecrire(evaluer_bloc(bloc, evaluateurs))
+            lignes += len(bloc)
+    return lignes, [nom for nom, _, _ in evaluateurs or ()]
+
+# ============================================================================
+# COMPARAISON DE VERSIONS DES RECOMMANDATIONS
+# ============================================================================
+
+# Résultats comparés d'une version des règles à l'autre
+RESULTATS_COMPARES = (
+    "categorie_prvg", "grade_diastolique", "score_htap", "probabilite_htap",
+    "diagnostic_pericardique", "performance_prothese",
+)
+
+# Mesures remplacées par NaN lorsqu'elles manquent (comme dans _performance)
+MESURES_FACULTATIVES = ("dvi",)
+
+def versions_regles(chemins):
+    """{version: définitions} : regles.toml puis chaque fichier de surcharge ``{nom: chemin}``"""
+    versions = {VERSION_REFERENCE: lire_regles()}
+    for nom, chemin in chemins.items():
+        versions[nom] = charger_version(chemin)
+    return versions
+
+def resultats_applicables(versions, colonnes):
+    """Résultats comparés dont toutes les mesures, dans toutes les versions, sont des colonnes"""
+    colonnes = set(colonnes).union(MESURES_FACULTATIVES)
+    return [
+        nom for nom in RESULTATS_COMPARES
+        if all(variables_requises(definitions, nom) <= colonnes for definitions in versions.values())
+    ]
+
+def _comparables(nom, versions, valeurs):
+    """Valeurs de chaque version sur une échelle commune, et libellés des codes (None si numérique)"""
+    textuels = [classements_textuels(definitions).get(nom) for definitions in versions.values()]
+    if all(resultats is None for resultats in textuels):
+        return valeurs, None
+    if any(resultats is None for resultats in textuels):
+        raise ValueError(f"{nom} : classement textuel dans une version, numérique dans une autre")
+    libelles = tuple(dict.fromkeys(libelle for resultats in textuels for libelle in resultats))
+    return [
+        np.asarray([libelles.index(libelle) for libelle in resultats], dtype=np.uint8)[codes]
+        for resultats, codes in zip(textuels, valeurs)
+    ], libelles
+
+def comparer_bloc(bloc, versions, regles_versions, resultats, identifiants=(), debut=0):
+    """Écarts entre versions sur un bloc, une ligne par (examen, résultat) qui change.
+
+    Toutes les versions sont évaluées sur un même dictionnaire de colonnes :
+    les règles qu'elles partagent ne sont calculées qu'une fois. Colonnes :
+    ``ligne`` (rang dans le fichier), ``identifiants``, ``resultat`` puis une
+    colonne par version.
+    """
+    n = len(bloc)
+    colonnes = {nom: bloc[nom] for nom in bloc.columns}
+    for nom in MESURES_FACULTATIVES:
+        colonnes.setdefault(nom, np.full(n, np.nan))
+    if "fevg" in colonnes:
+        colonnes["fevg_preservee"] = v._fevg_preservee(colonnes["fevg"])
+
+    morceaux = []
+    for nom in resultats:
+        valeurs = [np.broadcast_to(regles_versions[version][nom](colonnes), (n,)) for version in versions]
+        comparables, libelles = _comparables(nom, versions, valeurs)
+        change = np.zeros(n, dtype=np.bool_)
+        for valeur in comparables[1:]:
+            change |= valeur != comparables[0]
+        lignes = np.flatnonzero(change)
+        if not len(lignes):
+            continue
+        morceau = {"ligne": lignes + debut}
+        for identifiant in identifiants:
+            morceau[identifiant] = bloc[identifiant].to_numpy()[lignes]
+        morceau["resultat"] = pd.array([nom] * len(lignes), dtype="string")
+        for version, valeur in zip(versions, comparables):
+            valeur = valeur[lignes]
+            texte = np.asarray(libelles, dtype=object)[valeur] if libelles else valeur.astype(str)
+            morceau[version] = pd.array(texte, dtype="string")
+        morceaux.append(pd.DataFrame(morceau))
+    if not morceaux:
+        return None
+    return pd.concat(morceaux, ignore_index=True)
+
+def comparer_fichier(entree, sortie, chemins_versions, taille_bloc=100_000, identifiants=()):
+    """Reclasse un export selon regles.toml et chaque version ``{nom: chemin}`` ; écrit les écarts.
+
+    Renvoie (lignes lues, résultats comparés, Counter des transitions
+    ``(résultat, valeur par version...)``).
+    """
+    versions = versions_regles(chemins_versions)
+    regles_versions = v.regles_versions_vect(versions)
+    lignes, resultats, transitions = 0, None, Counter()
+    with EcrivainBlocs(sortie) as ecrivain:
+        for bloc in lire_blocs(entree, taille_bloc):
+            if resultats is None:
+                resultats = resultats_applicables(versions, bloc.columns)
+            ecarts = comparer_bloc(bloc, versions, regles_versions, resultats, identifiants, lignes)
+            lignes += len(bloc)
+            if ecarts is None:
+                continue
+            ecrivain.ecrire(ecarts)
+            transitions.update(ecarts[["resultat", *versions]].itertuples(index=False, name=None))
+        if not transitions:
+            # aucun écart : fichier avec les seules colonnes
+            ecrivain.ecrire(pd.DataFrame({
+                nom: pd.array([], dtype="int64" if nom == "ligne" else "string")
+                for nom in ("ligne", *identifiants, "resultat", *versions)
+            }))
+    return lignes, resultats or [], transitions
@@ -0,0 +1,86 @@
+"""Aide au choix pré-opératoire : classement des prothèses par EOAi prédite.
+
+L'EOAi prédite d'une prothèse est son EOA théorique divisée par la surface
+corporelle du patient ; la classe de PPM prédite suit les seuils de
+``calculer_ppm``. Le référentiel est parcouru par opérations vectorisées sur
+sa colonne d'EOA.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .referentiel import POSITIONS, charger_referentiel
+from .vectoriel import SEVERITES_PPM, calculer_ppm_vect
+
+# Précision de la clé de cache : la surface corporelle est saisie au 0.1 m² près
+DECIMALES_SURFACE = 2
+
+def _lignes_position(referentiel, position):
+    if position is None:
+        return np.arange(len(referentiel))
+    return np.flatnonzero(referentiel.position == POSITIONS.get(position, position))
+
+@lru_cache(maxsize=1024)
+def _recommandations(surface_corporelle, position):
+    referentiel = charger_referentiel()
+    lignes = _lignes_position(referentiel, position)
+    ppm, eoai = calculer_ppm_vect(referentiel.eoa[lignes], surface_corporelle)
+    ordre = np.argsort(-eoai, kind="stable")
+    resultat = {"ligne": lignes[ordre], "eoai": eoai[ordre], "ppm": ppm[ordre]}
+    for colonne in resultat.values():
+        colonne.flags.writeable = False
+    return resultat
+
+def recommander_protheses(surface_corporelle, position=None):
+    """Prothèses classées par EOAi prédite décroissante pour une surface corporelle.
+
+    Renvoie un dictionnaire de tableaux en lecture seule : ``ligne`` (indice
+    dans le référentiel), ``eoai`` et ``ppm`` (codes SEVERITES_PPM). Le
+    résultat est mis en cache par surface corporelle arrondie et position.
+    """
+    position = POSITIONS.get(position, position)
+    return _recommandations(round(float(surface_corporelle), DECIMALES_SURFACE), position)
+
+recommander_protheses.cache_info = _recommandations.cache_info
+
+def tableau_recommandations(surface_corporelle, position=None):
+    """Recommandations sous forme de lignes lisibles (dictionnaires), dans l'ordre du classement"""
+    referentiel = charger_referentiel()
+    recommandations = recommander_protheses(surface_corporelle, position)
+    return [
+        {
+            "Position": str(referentiel.position[i]),
+            "Catégorie": str(referentiel.categorie[i]),
+            "Marque/Modèle": str(referentiel.marque[i]),
+            "Taille (mm)": float(referentiel.taille[i]),
+            "EOA théorique (cm²)": float(referentiel.eoa[i]),
+            "EOAi prédite (cm²/m²)": round(float(eoai), 2),
+            "PPM prédit": SEVERITES_PPM[ppm],
+        }
+        for i, eoai, ppm in zip(recommandations["ligne"], recommandations["eoai"], recommandations["ppm"])
+    ]
+
+def recommander_protheses_lot(surfaces_corporelles, position=None):
+    """Classement pour une liste de patients en une passe.
+
+    L'ordre par EOAi est celui des EOA théoriques pour tous les patients :
+    il est calculé une fois, puis les EOAi et classes de PPM sont obtenues
+    par division extérieure. Renvoie ``ligne`` (ordre commun), ``eoai`` et
+    ``ppm`` (matrices patients x prothèses) et ``sans_ppm`` (nombre de
+    prothèses sans PPM prédit par patient).
+    """
+    referentiel = charger_referentiel()
+    lignes = _lignes_position(referentiel, position)
+    ordre = np.argsort(-referentiel.eoa[lignes], kind="stable")
+    lignes = lignes[ordre]
+    eoa = referentiel.eoa[lignes]
+
+    surfaces = np.asarray(surfaces_corporelles, dtype=np.float64)
+    ppm, eoai = calculer_ppm_vect(eoa[np.newaxis, :], surfaces[:, np.newaxis])
+    return {
+        "ligne": lignes,
+        "eoai": eoai,
+        "ppm": ppm,
+        "sans_ppm": np.count_nonzero(ppm == SEVERITES_PPM.index("absent"), axis=1),
+    }
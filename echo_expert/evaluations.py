@@ -0,0 +1,151 @@
+"""Fonctions de calcul des évaluations échocardiographiques, sans dépendance à l'interface.
+
+Les seuils des évaluations PRVG, diastolique, HTAP, péricardique et
+prothétique sont ceux de ``regles.toml`` (voir ``regles``).
+"""
+
+import math
+
+from .regles import regles
+
+# Libellés des patterns diastoliques et des grades
+LIBELLES_PATTERNS = {
+    "relaxation_alteree": "Pattern de Relaxation Altérée",
+    "restrictif": "Pattern Restrictif",
+    "pseudonormal": "Pattern Pseudonormal",
+}
+LIBELLES_GRADES = {
+    0: "Fonction diastolique normale",
+    1: "Dysfonction diastolique légère",
+    2: "Dysfonction diastolique modérée",
+    3: "Dysfonction diastolique sévère",
+}
+PASTILLES_PERFORMANCE = {"Fonction normale": "🟢", "Dysfonction modérée": "🟡", "Dysfonction sévère": "🔴"}
+
+# Temps dans la cible INR (%) en dessous duquel l'anticoagulation est insuffisante
+SEUIL_TTR = 60.0
+
+# ============================================================================
+# FONCTIONS DE CALCUL DYNAMIQUE COMPLÈTES
+# ============================================================================
+
+def evaluer_prvg_fevg_preservee(e_e_prime, volume_og, tr_vitesse):
+    """Évaluation dynamique de la PRVG pour FE VG ≥ 50%"""
+    r = regles()
+    mesures = {"e_e_prime": e_e_prime, "volume_og": volume_og, "tr_vitesse": tr_vitesse}
+    return {
+        nom: r[nom](mesures)
+        for nom in ("prvg_normale", "prvg_elevee", "zone_grise", "criteres_secondaires")
+    }
+
+def evaluer_pattern_diastolique(e_a_ratio, dt, e_vitesse):
+    """Détermination du pattern diastolique"""
+    pattern = regles()["pattern_diastolique"]({"e_a_ratio": e_a_ratio, "dt": dt, "e_vitesse": e_vitesse})
+    return pattern, LIBELLES_PATTERNS[pattern]
+
+def calculer_ppm(eoa_mesuree, surface_corporelle):
+    """Calcul du Patient-Prothèse Mismatch"""
+    eoai = eoa_mesuree / surface_corporelle
+    if eoai < 0.65: return "severe", eoai
+    elif eoai < 0.85: return "modere", eoai
+    else: return "absent", eoai
+
+def evaluer_risque_thrombose(categorie, fevg, fa, antecedent_te, inr, ttr=None):
+    """Évaluation du risque de thrombose.
+
+    ``ttr`` (temps dans la cible INR, %, voir ``inr``) remplace l'INR du jour
+    s'il est connu : l'anticoagulation est insuffisante si TTR < SEUIL_TTR.
+    """
+    score = 0
+    if "Mécanique" in categorie: score += 2
+    if fevg < 40: score += 1
+    if fa: score += 1
+    if antecedent_te: score += 2
+    ttr_valide = ttr is not None and not math.isnan(ttr)
+    if ttr_valide:
+        if ttr < SEUIL_TTR: score += 2
+    elif inr < 2.0: score += 2
+    
+    if score >= 5: return "eleve", score
+    elif score >= 3: return "modere", score
+    else: return "faible", score
+
+def calculer_probabilite_htap(tr_vitesse, vc_diametre, vc_collapsus, rv_ra_ratio, septum_paradoxal):
+    """Calcul du score de probabilité HTAP ESC 2022"""
+    return regles()["score_htap"]({
+        "tr_vitesse": tr_vitesse, "vc_diametre": vc_diametre, "vc_collapsus": vc_collapsus,
+        "rv_ra_ratio": rv_ra_ratio, "septum_paradoxal": septum_paradoxal,
+    })
+
+def evaluer_constrictive_restrictive(variation_respiratoire, septal_bounce, annulus_reverse, fonction_vg, strain_longitudinal):
+    """Évaluation différentielle constrictive vs restrictive"""
+    r = regles()
+    mesures = {
+        "variation_respiratoire": variation_respiratoire, "septal_bounce": septal_bounce,
+        "annulus_reverse": annulus_reverse, "fonction_vg": fonction_vg, "strain_longitudinal": strain_longitudinal,
+    }
+    return r["score_constriction"](mesures), r["score_restrictif"](mesures)
+
+def evaluer_dysfonction_diastolique_complete(e_a_ratio, e_e_prime, volume_og, tr_vitesse, dt, e_vitesse, fevg):
+    """Évaluation complète de la fonction diastolique"""
+    if regles()["fevg_preservee"]({"fevg": fevg}):
+        return evaluer_prvg_fevg_preservee(e_e_prime, volume_og, tr_vitesse)
+    else:
+        pattern, libelle = evaluer_pattern_diastolique(e_a_ratio, dt, e_vitesse)
+        return {"pattern": pattern, "libelle": libelle}
+
+# ============================================================================
+# VERDICTS (logique de décision des pages de l'interface)
+# ============================================================================
+
+def classer_prvg(resultats):
+    """Verdict PRVG à partir du résultat de evaluer_prvg_fevg_preservee"""
+    return regles()["categorie_prvg"](dict(resultats))
+
+def evaluer_grade_diastolique(e_a_ratio, e_e_prime, volume_og, tr_vitesse, dt, e_vitesse, fevg):
+    """Grade de dysfonction diastolique (0 à 3) et libellé de l'évaluation complète"""
+    grade = regles()["grade_diastolique"]({
+        "e_a_ratio": e_a_ratio, "e_e_prime": e_e_prime, "volume_og": volume_og, "tr_vitesse": tr_vitesse,
+        "dt": dt, "e_vitesse": e_vitesse, "fevg": fevg,
+    })
+    return grade, LIBELLES_GRADES[grade]
+
+def calculer_score_secondaire_htap(tapse, s_tricuspide, fac_vd, acceleration_time, pvr_estimee):
+    """Score secondaire HTAP (signes de confirmation, 0 à 5)"""
+    return regles()["score_secondaire_htap"]({
+        "tapse": tapse, "s_tricuspide": s_tricuspide, "fac_vd": fac_vd,
+        "acceleration_time": acceleration_time, "pvr_estimee": pvr_estimee,
+    })
+
+def classer_probabilite_htap(score_htap, score_secondaire):
+    """Verdict HTAP combinant score principal et score secondaire"""
+    return regles()["probabilite_htap"]({"score_htap": score_htap, "score_secondaire_htap": score_secondaire})
+
+def classer_constrictive_restrictive(score_constriction, score_restrictif):
+    """Diagnostic différentiel à partir des scores constriction/restrictif"""
+    return regles()["diagnostic_pericardique"]({"score_constriction": score_constriction, "score_restrictif": score_restrictif})
+
+def evaluer_performance_prothese(type_general, gradient_moyen, eoa_mesuree, dvi=None):
+    """Performance prothétique (libellé, pastille) selon la position de la prothèse"""
+    performance = regles()["performance_prothese"]({
+        "type_general": type_general, "gradient_moyen": gradient_moyen, "eoa_mesuree": eoa_mesuree, "dvi": dvi,
+    })
+    return performance, PASTILLES_PERFORMANCE[performance]
+
+def evaluer_evolution_gradient(gradient_moyen, gradient_precedent, delta_temps):
+    """Variation du gradient depuis l'examen précédent et évolution annualisée"""
+    if gradient_precedent:
+        delta_gradient = gradient_moyen - gradient_precedent
+        evolution_annuelle = (delta_gradient / delta_temps) * 12 if delta_temps > 0 else 0
+    else:
+        delta_gradient = 0
+        evolution_annuelle = 0
+    return delta_gradient, evolution_annuelle
+
+# ============================================================================
+# REPÈRES PAR PARAMÈTRE
+# ============================================================================
+
+def evaluer_repere(nom, **mesures):
+    """Niveau du repère ``nom`` de regles.toml ("normal", "limite", "anormal"...) pour les mesures données"""
+    return regles()[f"repere_{nom}"](mesures)
@@ -0,0 +1,197 @@
+"""Fiche de mesures unique d'un examen et évaluation complète en une passe.
+
+Chaque mesure a un nom canonique, le même sur toutes les pages de
+l'interface (la vitesse TR saisie pour la PRVG est celle de l'HTAP et de la
+fonction diastolique). Les noms reprennent ceux des colonnes d'entrée de
+``cohorte`` lorsqu'ils existent.
+"""
+
+from .evaluations import (
+    evaluer_prvg_fevg_preservee,
+    evaluer_pattern_diastolique,
+    calculer_ppm,
+    evaluer_risque_thrombose,
+    calculer_probabilite_htap,
+    evaluer_constrictive_restrictive,
+    classer_prvg,
+    evaluer_grade_diastolique,
+    calculer_score_secondaire_htap,
+    classer_probabilite_htap,
+    classer_constrictive_restrictive,
+    evaluer_performance_prothese,
+    evaluer_evolution_gradient,
+)
+
+# ============================================================================
+# SCHÉMA DE LA FICHE D'EXAMEN
+# ============================================================================
+
+# Mesures numériques : nom -> (minimum, maximum, valeur par défaut, pas)
+PLAGES = {
+    # Fonction VG et remplissage
+    "fevg": (15, 80, 60, 1),
+    "e_vitesse": (20, 200, 80, 1),
+    "a_vitesse": (20, 150, 70, 1),
+    "e_a_ratio": (0.5, 3.0, 1.2, 0.1),
+    "dt": (100, 400, 180, 1),
+    "e_prime_septal": (3.0, 20.0, 7.0, 0.1),
+    "e_prime_lateral": (3.0, 20.0, 9.0, 0.1),
+    "e_e_prime": (5.0, 25.0, 12.0, 0.1),
+    "volume_og": (15, 80, 35, 1),
+    "tr_vitesse": (1.5, 5.0, 2.8, 0.1),
+    "rapport_s_d": (0.5, 2.5, 1.2, 0.1),
+    "duree_ar_a": (-50, 100, 10, 1),
+    "vp": (30, 80, 45, 1),
+    # Valvulopathie mitrale native
+    "gradient_mitral": (2, 40, 12, 1),
+    "surface_mitrale": (0.5, 4.0, 1.3, 0.1),
+    "volume_regurgitant": (10, 150, 65, 1),
+    "pap_systolique": (15, 100, 42, 1),
+    # Cavités droites et circulation pulmonaire
+    "vc_diametre": (10, 30, 22, 1),
+    "vc_collapsus": (0, 100, 35, 1),
+    "tapse": (5, 25, 16, 1),
+    "s_tricuspide": (5.0, 15.0, 10.5, 0.1),
+    "fac_vd": (20, 60, 38, 1),
+    "acceleration_time": (40, 120, 65, 1),
+    "diam_ap": (15, 40, 32, 1),
+    "pvr_estimee": (1.0, 15.0, 4.5, 0.1),
+    "diam_og": (30, 60, 42, 1),
+    "strain_vd": (-30, -10, -18, 1),
+    # Péricarde et myocarde
+    "strain_longitudinal": (-25, -10, -18, 1),
+    # Prothèse valvulaire
+    "gradient_moyen": (2, 60, 18, 1),
+    "eoa_mesuree": (0.5, 3.0, 1.8, 0.1),
+    "dvi": (0.1, 0.5, 0.32, 0.01),
+    "acceleration_time_prothese": (50, 150, 90, 1),
+    "pht": (50, 300, 130, 1),
+    "pression_og": (5, 40, 15, 1),
+    "inr": (1.0, 5.0, 2.3, 0.1),
+    "gradient_precedent": (5, 60, 15, 1),
+    "delta_temps": (1, 60, 12, 1),
+}
+
+# Mesures qualitatives : nom -> choix possibles (le premier est la valeur par défaut)
+CHOIX = {
+    "rv_ra_ratio": ("<0.6", "0.6-1.0", "≥1.0"),
+    "septum_paradoxal": ("Absent", "Présent"),
+    "contexte_cardio_gauche": ("Non", "Oui"),
+    "variation_respiratoire": ("<10%", "10-25%", "≥25%"),
+    "variation_tricuspide": ("<15%", "15-40%", "≥40%"),
+    "augmentation_inspiratoire_tr": ("Absente", "Présente"),
+    # rebond septal de la constriction, distinct du septum paradoxal de surcharge VD (HTAP)
+    "septal_bounce": ("Absent", "Présent"),
+    "annulus_reverse": ("Non", "Oui"),
+    "epaisseur_pericarde": ("Normal (<3 mm)", "Épaissi (3-5 mm)", "Très épaissi (>5 mm)", "Calcifié"),
+    "fonction_vg": ("Normale", "Légèrement altérée", "Modérément altérée", "Sévèrement altérée"),
+    "fonction_vd": ("Normale", "Altérée"),
+    "flux_hepatique": ("Normal", "Inversion expiratoire", "Inversion continu"),
+}
+
+# Mesures booléennes : nom -> valeur par défaut
+INDICATEURS = {"fa": False, "antecedent_te": False}
+
+# Classes de FE VG utilisées par l'évaluation diastolique
+CLASSES_FEVG = ("≥50%", "41-49%", "≤40%")
+
+def valeurs_par_defaut():
+    """Fiche d'examen remplie avec les valeurs par défaut de chaque mesure"""
+    fiche = {nom: plage[2] for nom, plage in PLAGES.items()}
+    fiche.update({nom: choix[0] for nom, choix in CHOIX.items()})
+    fiche.update(INDICATEURS)
+    return fiche
+
+def fiche_examen(**mesures):
+    """Fiche d'examen complète : valeurs par défaut complétées par ``mesures``"""
+    fiche = valeurs_par_defaut()
+    inconnues = set(mesures) - set(fiche)
+    if inconnues:
+        raise KeyError(f"Mesures inconnues : {', '.join(sorted(inconnues))}")
+    fiche.update(mesures)
+    return fiche
+
+def grille(nom):
+    """Valeurs possibles d'une mesure : points de la plage du slider ou choix"""
+    if nom in CHOIX:
+        return CHOIX[nom]
+    minimum, maximum, _, pas = PLAGES[nom]
+    nombre = int(round((maximum - minimum) / pas)) + 1
+    if all(isinstance(v, int) for v in (minimum, maximum, pas)):
+        return tuple(range(minimum, maximum + 1, pas))
+    return tuple(round(minimum + i * pas, len(repr(float(pas)).split(".")[1])) for i in range(nombre))
+
+def classe_fevg(fevg):
+    """Classe de FE VG ("≥50%", "41-49%", "≤40%") à partir de la FE VG en %"""
+    if fevg >= 50: return "≥50%"
+    elif fevg > 40: return "41-49%"
+    else: return "≤40%"
+
+# ============================================================================
+# ÉVALUATION COMPLÈTE
+# ============================================================================
+
+def evaluer_examen(fiche, surface_corporelle=None, prothese=None, ttr=None):
+    """Les cinq évaluations d'un examen en une passe sur la fiche de mesures.
+
+    ``prothese`` vaut None ou ``(type_general, categorie)`` ; le PPM n'est
+    calculé que si ``surface_corporelle`` est connue. ``ttr`` (temps dans la
+    cible INR) remplace l'INR de la fiche dans le score de thrombose. Renvoie un dictionnaire
+    plat dont les clés reprennent les colonnes de sortie de ``cohorte``
+    (None pour les évaluations sans objet).
+    """
+    fevg = classe_fevg(fiche["fevg"])
+    resultats = dict.fromkeys((
+        "categorie_prvg", "criteres_secondaires", "pattern_diastolique",
+        "eoai", "ppm", "score_thrombose", "risque_thrombose", "performance_prothese",
+        "delta_gradient", "evolution_annuelle",
+    ))
+    resultats["classe_fevg"] = fevg
+
+    # PRVG et fonction diastolique
+    if fevg == "≥50%":
+        prvg = evaluer_prvg_fevg_preservee(fiche["e_e_prime"], fiche["volume_og"], fiche["tr_vitesse"])
+        resultats["categorie_prvg"] = classer_prvg(prvg)
+        resultats["criteres_secondaires"] = prvg["criteres_secondaires"]
+    else:
+        resultats["pattern_diastolique"] = evaluer_pattern_diastolique(fiche["e_a_ratio"], fiche["dt"], fiche["e_vitesse"])[0]
+    resultats["grade_diastolique"], resultats["libelle_diastolique"] = evaluer_grade_diastolique(
+        fiche["e_a_ratio"], fiche["e_e_prime"], fiche["volume_og"], fiche["tr_vitesse"],
+        fiche["dt"], fiche["e_vitesse"], fevg,
+    )
+
+    # HTAP
+    resultats["score_htap"] = calculer_probabilite_htap(
+        fiche["tr_vitesse"], fiche["vc_diametre"], fiche["vc_collapsus"], fiche["rv_ra_ratio"], fiche["septum_paradoxal"]
+    )
+    resultats["score_secondaire_htap"] = calculer_score_secondaire_htap(
+        fiche["tapse"], fiche["s_tricuspide"], fiche["fac_vd"], fiche["acceleration_time"], fiche["pvr_estimee"]
+    )
+    resultats["probabilite_htap"] = classer_probabilite_htap(resultats["score_htap"], resultats["score_secondaire_htap"])
+
+    # Péricarde
+    resultats["score_constriction"], resultats["score_restrictif"] = evaluer_constrictive_restrictive(
+        fiche["variation_respiratoire"], fiche["septal_bounce"], fiche["annulus_reverse"],
+        fiche["fonction_vg"], fiche["strain_longitudinal"],
+    )
+    resultats["diagnostic_pericardique"] = classer_constrictive_restrictive(
+        resultats["score_constriction"], resultats["score_restrictif"]
+    )
+
+    # Prothèse valvulaire
+    if prothese is not None:
+        type_general, categorie = prothese
+        dvi = fiche["dvi"] if type_general == "Prothèse aortique" else None
+        resultats["performance_prothese"] = evaluer_performance_prothese(
+            type_general, fiche["gradient_moyen"], fiche["eoa_mesuree"], dvi
+        )[0]
+        resultats["risque_thrombose"], resultats["score_thrombose"] = evaluer_risque_thrombose(
+            categorie, fiche["fevg"], fiche["fa"], fiche["antecedent_te"], fiche["inr"], ttr
+        )
+        resultats["delta_gradient"], resultats["evolution_annuelle"] = evaluer_evolution_gradient(
+            fiche["gradient_moyen"], fiche["gradient_precedent"], fiche["delta_temps"]
+        )
+        if surface_corporelle is not None:
+            resultats["ppm"], resultats["eoai"] = calculer_ppm(fiche["eoa_mesuree"], surface_corporelle)
+
+    return resultats
@@ -0,0 +1,302 @@
+"""Historique des examens : base SQLite embarquée, indexée par patient et date.
+
+Chaque examen évalué est enregistré (fiche de mesures, résultats, prothèse)
+dans une table ``examens`` indexée par (patient_id, date_examen). Un patient
+a au plus un examen par jour : les évaluations successives du même jour
+complètent l'examen du jour au lieu d'en créer un nouveau.
+
+Les écritures ne sont jamais faites sur le fil du rerun : ``enregistrer``
+dépose l'examen dans une file, un fil d'écriture les réunit par lots (au
+plus ``TAILLE_LOT`` examens ou ``DELAI_LOT`` secondes) et les écrit en une
+transaction. Les évaluations d'un même examen reçues dans un lot sont
+fusionnées avant l'écriture.
+
+La lecture de l'examen précédent d'un patient est une seule requête sur
+l'index ; ``valeurs_anterieures`` en déduit les mesures « antérieures » de la
+fiche (gradient précédent, délai depuis le dernier examen).
+
+La table ``mesures_inr`` reçoit les historiques d'INR importés en lot
+(``importer_inr``), lus par patient pour le temps dans la cible (``inr``).
+"""
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+# Fichier de la base (surchargeable par ECHO_EXPERT_BASE)
+CHEMIN_BASE = Path(os.environ.get("ECHO_EXPERT_BASE", Path.home() / ".local" / "share" / "echo_expert" / "examens.sqlite"))
+
+# Un lot est écrit dès qu'il atteint TAILLE_LOT examens, ou DELAI_LOT secondes après son premier examen
+TAILLE_LOT = 500
+DELAI_LOT = 0.5
+
+# Durée moyenne d'un mois (jours)
+JOURS_PAR_MOIS = 365.25 / 12
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS examens (
+    patient_id TEXT NOT NULL,
+    date_examen TEXT NOT NULL,
+    type_prothese TEXT,
+    categorie_prothese TEXT,
+    marque TEXT,
+    taille REAL,
+    fiche TEXT NOT NULL,
+    resultats TEXT NOT NULL,
+    enregistre_le TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS examens_patient_date ON examens (patient_id, date_examen);
+CREATE INDEX IF NOT EXISTS examens_date ON examens (date_examen);
+CREATE TABLE IF NOT EXISTS mesures_inr (
+    patient_id TEXT NOT NULL,
+    date_mesure TEXT NOT NULL,
+    inr REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS mesures_inr_patient_date ON mesures_inr (patient_id, date_mesure);
+"""
+
+COLONNES_PROTHESE = ("type_prothese", "categorie_prothese", "marque", "taille")
+
+# Examen du jour déjà présent : la fiche et les résultats sont complétés, la
+# prothèse n'est remplacée que si l'évaluation en précise une
+_INSERTION = f"""
+INSERT INTO examens (patient_id, date_examen, {", ".join(COLONNES_PROTHESE)}, fiche, resultats, enregistre_le)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (patient_id, date_examen) DO UPDATE SET
+    {", ".join(f"{nom} = COALESCE(excluded.{nom}, {nom})" for nom in COLONNES_PROTHESE)},
+    fiche = json_patch(fiche, excluded.fiche),
+    resultats = json_patch(resultats, excluded.resultats),
+    enregistre_le = excluded.enregistre_le
+"""
+
+_SELECTION = f"SELECT patient_id, date_examen, {', '.join(COLONNES_PROTHESE)}, fiche, resultats FROM examens"
+
+def _connexion(chemin):
+    connexion = sqlite3.connect(chemin, timeout=30)
+    connexion.execute("PRAGMA synchronous = NORMAL")
+    return connexion
+
+def _examen(ligne):
+    patient_id, date_examen, type_prothese, categorie, marque, taille, fiche, resultats = ligne
+    return {
+        "patient_id": patient_id,
+        "date_examen": date.fromisoformat(date_examen),
+        "prothese": (type_prothese, categorie, marque, taille) if type_prothese is not None else None,
+        "fiche": json.loads(fiche),
+        "resultats": json.loads(resultats),
+    }
+
+def _sans_valeurs_nulles(valeurs):
+    # json_patch supprime les clés nulles : une évaluation sans objet ne doit pas effacer un résultat du jour
+    return {nom: valeur for nom, valeur in valeurs.items() if valeur is not None}
+
+class Historique:
+    """Base des examens avec fil d'écriture par lots (voir le docstring du module)"""
+
+    def __init__(self, chemin=CHEMIN_BASE, taille_lot=TAILLE_LOT, delai_lot=DELAI_LOT):
+        self.chemin = Path(chemin)
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self.taille_lot = taille_lot
+        self.delai_lot = delai_lot
+        connexion = _connexion(self.chemin)
+        # WAL : les lectures ne sont pas bloquées par le lot en cours d'écriture
+        connexion.execute("PRAGMA journal_mode = WAL")
+        connexion.executescript(SCHEMA)
+        connexion.close()
+        self._file = queue.Queue()
+        self._fil = None
+        self._verrou = threading.Lock()
+        self.lots_ecrits = 0
+        self.examens_ecrits = 0
+        self.examens_perdus = 0
+        self.derniere_erreur = None
+
+    # ------------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------------
+
+    def enregistrer(self, patient_id, fiche, resultats, prothese=None, date_examen=None):
+        """Dépose un examen évalué dans la file d'écriture (retour immédiat).
+
+        ``prothese`` vaut None ou ``(type_general, categorie, marque, taille)``
+        (marque et taille éventuellement None) ; ``date_examen`` vaut le jour
+        même par défaut.
+        """
+        if self._fil is None:
+            self._demarrer()
+        jour = (date_examen or date.today()).isoformat()
+        self._file.put((patient_id, jour, prothese, dict(fiche), _sans_valeurs_nulles(resultats)))
+
+    def vider(self):
+        """Attend l'écriture de tous les examens déposés"""
+        if self._fil is not None:
+            self._file.join()
+
+    def _demarrer(self):
+        with self._verrou:
+            if self._fil is None:
+                self._fil = threading.Thread(target=self._ecrire, name="historique-examens", daemon=True)
+                self._fil.start()
+                atexit.register(self.vider)
+
+    def _ecrire(self):
+        connexion = _connexion(self.chemin)
+        while True:
+            lot = [self._file.get()]
+            echeance = time.monotonic() + self.delai_lot
+            while len(lot) < self.taille_lot:
+                try:
+                    lot.append(self._file.get(timeout=max(echeance - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                lignes = self._fusionner(lot)
+                with connexion:
+                    connexion.executemany(_INSERTION, lignes)
+                self.lots_ecrits += 1
+                self.examens_ecrits += len(lignes)
+            except Exception as erreur:
+                # le lot est perdu, le fil continue (sinon la file ne se vide plus et
+                # vider() bloque) ; l'erreur est affichée près du bouton d'enregistrement
+                self.examens_perdus += len(lot)
+                self.derniere_erreur = erreur
+            finally:
+                for _ in lot:
+                    self._file.task_done()
+
+    @staticmethod
+    def _fusionner(lot):
+        """Lignes à écrire : une par (patient, jour), évaluations du lot fusionnées dans l'ordre"""
+        examens = {}
+        for patient_id, jour, prothese, fiche, resultats in lot:
+            examen = examens.setdefault((patient_id, jour), [None, {}, {}])
+            if prothese is not None:
+                examen[0] = prothese
+            examen[1].update(fiche)
+            examen[2].update(resultats)
+        horodatage = datetime.now().isoformat(timespec="seconds")
+        return [
+            (patient_id, jour, *(prothese or (None,) * len(COLONNES_PROTHESE)),
+             json.dumps(fiche, ensure_ascii=False), json.dumps(resultats, ensure_ascii=False), horodatage)
+            for (patient_id, jour), (prothese, fiche, resultats) in examens.items()
+        ]
+
+    # ------------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------------
+
+    def _lire(self, requete, parametres):
+        connexion = _connexion(self.chemin)
+        try:
+            return connexion.execute(requete, parametres).fetchall()
+        finally:
+            connexion.close()
+
+    def dernier_examen(self, patient_id, avant=None):
+        """Examen le plus récent du patient antérieur au jour ``avant`` (aujourd'hui par défaut), ou None.
+
+        Une seule requête sur l'index (patient_id, date_examen). Renvoie un
+        dictionnaire ``patient_id``, ``date_examen``, ``prothese``, ``fiche``,
+        ``resultats``.
+        """
+        lignes = self._lire(
+            f"{_SELECTION} WHERE patient_id = ? AND date_examen < ? ORDER BY date_examen DESC LIMIT 1",
+            (patient_id, (avant or date.today()).isoformat()),
+        )
+        return _examen(lignes[0]) if lignes else None
+
+    def examens(self, patient_id, avant=None):
+        """Examens du patient (antérieurs au jour ``avant`` s'il est donné), du plus ancien au plus récent"""
+        lignes = self._lire(
+            f"{_SELECTION} WHERE patient_id = ? AND date_examen < ? ORDER BY date_examen",
+            (patient_id, (avant or date.max).isoformat()),
+        )
+        return [_examen(ligne) for ligne in lignes]
+
+    def cles_examens(self, jour):
+        """Examens (patient_id, date_examen) du jour ``jour``, par patient (index sur date_examen)"""
+        return [
+            (patient_id, date.fromisoformat(date_examen)) for patient_id, date_examen in self._lire(
+                "SELECT patient_id, date_examen FROM examens WHERE date_examen = ? ORDER BY patient_id",
+                (jour.isoformat(),),
+            )
+        ]
+
+    def examens_cles(self, cles):
+        """Examens des clés (patient_id, date_examen) en une requête sur l'index, dans l'ordre des clés ; les absents sont omis"""
+        cles = [(patient_id, jour.isoformat() if isinstance(jour, date) else jour) for patient_id, jour in cles]
+        if not cles:
+            return []
+        lignes = self._lire(
+            f"{_SELECTION} WHERE (patient_id, date_examen) IN (VALUES {', '.join(['(?, ?)'] * len(cles))})",
+            [valeur for cle in cles for valeur in cle],
+        )
+        rangs = {cle: rang for rang, cle in enumerate(cles)}
+        lignes.sort(key=lambda ligne: rangs[ligne[:2]])
+        return [_examen(ligne) for ligne in lignes]
+
+    def series_protheses(self, noms):
+        """Lignes (patient_id, date_examen, mesures ``noms``...) des examens de prothèse, par patient et date"""
+        extraits = ", ".join(f"json_extract(fiche, '$.{nom}')" for nom in noms)
+        return self._lire(
+            f"SELECT patient_id, date_examen, {extraits} FROM examens "
+            "WHERE type_prothese IS NOT NULL ORDER BY patient_id, date_examen", (),
+        )
+
+    def derniers_resultats_protheses(self, noms):
+        """Lignes (patient_id, date_examen, résultats ``noms``...) du dernier examen de prothèse de chaque patient"""
+        extraits = ", ".join(f"json_extract(resultats, '$.{nom}')" for nom in noms)
+        # avec MAX(), SQLite lit les colonnes non agrégées sur la ligne du maximum
+        return self._lire(
+            f"SELECT patient_id, MAX(date_examen), {extraits} FROM examens "
+            "WHERE type_prothese IS NOT NULL GROUP BY patient_id", (),
+        )
+
+    # ------------------------------------------------------------------------
+    # Mesures d'INR
+    # ------------------------------------------------------------------------
+
+    def importer_inr(self, lignes):
+        """Enregistre des mesures (patient_id, date ISO, inr) en une transaction ; une mesure du même jour est remplacée.
+
+        Import en lot, hors du fil du rerun : l'écriture est faite sur le fil appelant.
+        """
+        connexion = _connexion(self.chemin)
+        try:
+            with connexion:
+                curseur = connexion.executemany(
+                    "INSERT INTO mesures_inr (patient_id, date_mesure, inr) VALUES (?, ?, ?) "
+                    "ON CONFLICT (patient_id, date_mesure) DO UPDATE SET inr = excluded.inr", lignes,
+                )
+            return curseur.rowcount
+        finally:
+            connexion.close()
+
+    def mesures_inr(self, patient_id):
+        """Mesures (date ISO, inr) du patient, de la plus ancienne à la plus récente"""
+        return self._lire(
+            "SELECT date_mesure, inr FROM mesures_inr WHERE patient_id = ? ORDER BY date_mesure", (patient_id,)
+        )
+
+def valeurs_anterieures(examen, date_examen=None):
+    """Mesures antérieures de la fiche déduites de l'examen précédent.
+
+    ``gradient_precedent`` reprend le gradient moyen de l'examen précédent
+    s'il portait sur une prothèse ; ``delta_temps`` est le délai en mois, au
+    centième (un contrôle à dix jours vaut 0.33 mois, pas 0 ni 1). Les
+    valeurs ne sont pas bornées aux plages des sliders, qui s'élargissent pour
+    les contenir. Renvoie {} sans examen précédent.
+    """
+    if examen is None:
+        return {}
+    jours = ((date_examen or date.today()) - examen["date_examen"]).days
+    valeurs = {"delta_temps": round(jours / JOURS_PAR_MOIS, 2)}
+    if examen["prothese"] is not None and "gradient_moyen" in examen["fiche"]:
+        valeurs["gradient_precedent"] = examen["fiche"]["gradient_moyen"]
+    return valeurs
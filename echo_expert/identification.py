@@ -0,0 +1,67 @@
+"""Identification d'une prothèse de modèle inconnu à partir de l'EOA et du gradient mesurés.
+
+Les EOA théoriques de chaque position sont triées une fois ; une requête
+récupère les plus proches voisins en EOA par recherche dichotomique puis
+expansion des deux côtés (O(log n + k)), et les classe :
+
+1. gradient mesuré dans la plage ``Gradient_moyen_normal`` d'abord ;
+2. puis par écart croissant à l'EOA théorique ;
+3. puis par écart du gradient à la plage.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .referentiel import POSITIONS, charger_referentiel
+
+@lru_cache(maxsize=None)
+def _index_eoa(position):
+    """EOA théoriques triées et lignes du référentiel correspondantes pour une position"""
+    referentiel = charger_referentiel()
+    lignes = np.flatnonzero(referentiel.position == position)
+    ordre = np.argsort(referentiel.eoa[lignes], kind="stable")
+    return referentiel.eoa[lignes][ordre], lignes[ordre]
+
+def plus_proches_en_eoa(eoa_mesuree, position, k):
+    """Lignes des k prothèses dont l'EOA théorique est la plus proche de la mesure"""
+    eoa_triees, lignes = _index_eoa(POSITIONS.get(position, position))
+    k = min(k, len(eoa_triees))
+    droite = int(np.searchsorted(eoa_triees, eoa_mesuree))
+    gauche = droite - 1
+    retenues = []
+    while len(retenues) < k:
+        if droite >= len(eoa_triees) or (gauche >= 0 and eoa_mesuree - eoa_triees[gauche] <= eoa_triees[droite] - eoa_mesuree):
+            retenues.append(lignes[gauche])
+            gauche -= 1
+        else:
+            retenues.append(lignes[droite])
+            droite += 1
+    return np.array(retenues, dtype=np.int64)
+
+def identifier_prothese(eoa_mesuree, gradient_moyen, position, nombre=5, voisins=20):
+    """Candidats (marque, taille) les plus compatibles avec les mesures, du plus au moins probable.
+
+    ``voisins`` prothèses sont présélectionnées sur l'EOA puis classées ; les
+    ``nombre`` premières sont renvoyées sous forme de dictionnaires.
+    """
+    referentiel = charger_referentiel()
+    lignes = plus_proches_en_eoa(eoa_mesuree, position, voisins)
+    ecart_eoa = np.abs(referentiel.eoa[lignes] - eoa_mesuree)
+    ecart_gradient = np.maximum(referentiel.gradient_min[lignes] - gradient_moyen, 0) + np.maximum(
+        gradient_moyen - referentiel.gradient_max[lignes], 0
+    )
+    ordre = np.lexsort((ecart_gradient, ecart_eoa, ecart_gradient > 0))[:nombre]
+    return [
+        {
+            "categorie": str(referentiel.categorie[i]),
+            "marque": str(referentiel.marque[i]),
+            "taille": float(referentiel.taille[i]),
+            "eoa_theorique": float(referentiel.eoa[i]),
+            "gradient_normal": (float(referentiel.gradient_min[i]), float(referentiel.gradient_max[i])),
+            "gradient_dans_plage": bool(eg == 0),
+            "ecart_eoa": round(float(ee), 3),
+            "ecart_gradient": float(eg),
+        }
+        for i, ee, eg in zip(lignes[ordre], ecart_eoa[ordre], ecart_gradient[ordre])
+    ]
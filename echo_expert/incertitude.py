@@ -0,0 +1,104 @@
+"""Mode incertitude : probabilité de chaque résultat sous l'erreur de mesure.
+
+Un examen proche d'un seuil change de catégorie avec le bruit de mesure
+ordinaire (E/e' de 13.9 contre 14.1). Chaque mesure numérique est tirée
+autour de la valeur saisie selon un modèle d'erreur gaussien d'écart-type
+``ERREURS_MESURE``, arrondie au pas de saisie et bornée à la plage du slider
+(``examen.PLAGES``) : chaque tirage est une mesure que l'opérateur aurait pu
+saisir. Les tirages sont évalués par les règles vectorisées et la fréquence
+de chaque résultat estime sa probabilité.
+
+Les tirages normaux centrés réduits sont générés une fois par (nombre de
+tirages, graine) et réutilisés à chaque rerun : seuls le décalage, l'arrondi
+et l'évaluation des règles sont recalculés.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .examen import PLAGES
+from .regles import classements_textuels, lire_regles
+from .vectoriel import regles_vect
+
+# Écart-type de l'erreur de mesure, dans l'unité de la mesure (valeurs
+# indicatives de reproductibilité inter-mesures, à adapter au laboratoire)
+ERREURS_MESURE = {
+    # Fonction VG et remplissage
+    "e_vitesse": 5.0,
+    "e_a_ratio": 0.1,
+    "dt": 15.0,
+    "e_e_prime": 1.0,
+    "volume_og": 3.0,
+    "tr_vitesse": 0.1,
+    # Cavités droites et circulation pulmonaire
+    "vc_diametre": 1.5,
+    "vc_collapsus": 7.0,
+    "tapse": 1.5,
+    "s_tricuspide": 0.8,
+    "fac_vd": 4.0,
+    "acceleration_time": 8.0,
+    "pvr_estimee": 0.5,
+    # Péricarde
+    "strain_longitudinal": 1.5,
+    # Prothèses
+    "gradient_moyen": 2.0,
+    "eoa_mesuree": 0.1,
+    "dvi": 0.02,
+}
+
+TIRAGES = 100_000
+
+# Ligne de chaque mesure dans la matrice des tirages normaux
+_RANGS = {nom: rang for rang, nom in enumerate(ERREURS_MESURE)}
+
+@lru_cache(maxsize=4)
+def tirages_normaux(tirages=TIRAGES, graine=0):
+    """Tirages normaux centrés réduits (float32), une ligne par mesure de ERREURS_MESURE"""
+    rng = np.random.default_rng(graine)
+    normales = rng.standard_normal((len(ERREURS_MESURE), tirages), dtype=np.float32)
+    normales.flags.writeable = False
+    return normales
+
+def _decimales(pas):
+    return 0 if float(pas).is_integer() else len(repr(float(pas)).split(".")[1])
+
+def echantillonner(mesures, tirages=TIRAGES, graine=0):
+    """Colonnes de mesures : tirages bruités pour les mesures de ERREURS_MESURE, valeurs saisies pour les autres.
+
+    Une mesure None (non disponible) devient NaN, comme dans ``cohorte``.
+    """
+    normales = tirages_normaux(tirages, graine)
+    colonnes = {}
+    for nom, valeur in mesures.items():
+        if valeur is None:
+            # mesure non disponible : ne satisfait aucune condition
+            colonnes[nom] = np.nan
+            continue
+        if nom not in ERREURS_MESURE:
+            colonnes[nom] = valeur
+            continue
+        minimum, maximum, _, pas = PLAGES[nom]
+        colonne = np.multiply(normales[_RANGS[nom]], ERREURS_MESURE[nom], dtype=np.float64)
+        colonne += valeur
+        # arrondi décimal (et non multiple du pas) : mêmes flottants que les sliders
+        np.round(colonne, _decimales(pas), out=colonne)
+        np.clip(colonne, minimum, maximum, out=colonne)
+        colonnes[nom] = colonne
+    return colonnes
+
+def probabilites(nom, mesures, tirages=TIRAGES, graine=0):
+    """Probabilité de chaque résultat de la règle ``nom`` sous l'erreur de mesure.
+
+    Renvoie {résultat: probabilité} : tous les résultats possibles dans
+    l'ordre de leurs codes pour un classement textuel, les seules valeurs
+    atteintes par ordre croissant pour un score ou un classement numérique.
+    """
+    valeurs = np.broadcast_to(regles_vect()[nom](echantillonner(mesures, tirages, graine)), (tirages,))
+    comptes = np.bincount(valeurs, minlength=1)
+    resultats = classements_textuels(lire_regles()).get(nom)
+    if resultats is not None:
+        comptes = np.pad(comptes, (0, len(resultats) - len(comptes)))
+        return dict(zip(resultats, (comptes / tirages).tolist()))
+    atteintes = np.flatnonzero(comptes)
+    return dict(zip(atteintes.tolist(), (comptes[atteintes] / tirages).tolist()))
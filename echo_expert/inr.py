@@ -0,0 +1,102 @@
+"""Historiques d'INR : temps passé dans la cible thérapeutique (TTR, méthode de Rosendaal).
+
+Entre deux mesures successives d'un patient, l'INR est interpolé
+linéairement ; le TTR est la part des jours suivis où l'INR interpolé est
+dans la cible ``[bas, haut]``. Sur un segment, cette part est l'intersection
+de [0, 1] avec l'intervalle où la droite d'interpolation est dans la cible,
+calculée exactement (sans tirer un INR par jour). Les intervalles de plus de
+``ECART_MAX_JOURS`` jours entre deux mesures ne sont pas interpolés et ne
+comptent pas dans les jours suivis.
+
+``ttr_registre`` traite tous les patients en une passe : tri par patient et
+date, segments entre mesures consécutives d'un même patient, puis sommes
+par patient (``np.bincount``).
+
+Le TTR est une entrée alternative du score de thrombose : s'il est connu,
+``evaluer_risque_thrombose`` compte une anticoagulation insuffisante pour un
+TTR < ``evaluations.SEUIL_TTR`` au lieu d'un INR du jour < 2.
+"""
+
+import numpy as np
+
+# Cible INR des prothèses mécaniques selon la position
+CIBLES_INR = {"Prothèse aortique": (2.0, 3.0), "Prothèse mitrale": (2.5, 3.5)}
+
+# Au-delà de cet écart entre deux mesures, l'INR n'est pas interpolé
+ECART_MAX_JOURS = 56
+
+# Colonnes d'un fichier de mesures ; cible_basse et cible_haute sont facultatives
+COLONNES_INR = ("patient_id", "date_mesure", "inr")
+
+def ttr_registre(patients, dates, inr, bas=2.0, haut=3.0, debut=None):
+    """TTR (%) de chaque patient d'un registre de mesures d'INR, en une passe vectorisée.
+
+    ``patients``, ``dates`` (dates ou chaînes ISO) et ``inr`` sont des
+    colonnes d'une ligne par mesure, dans un ordre quelconque ; ``bas`` et
+    ``haut`` sont la cible, commune ou par mesure (la cible d'un segment est
+    celle de sa première mesure). Avec ``debut``, seuls les segments
+    commençant ce jour-là ou après sont comptés. Renvoie un dictionnaire de
+    colonnes, une ligne par patient : ``patient_id``, ``mesures``,
+    ``jours_suivis`` et ``ttr`` (NaN sans segment interpolé).
+    """
+    patients = np.asarray(patients)
+    jours = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    valeurs = np.asarray(inr, dtype=np.float64)
+    bas = np.broadcast_to(np.asarray(bas, dtype=np.float64), valeurs.shape)
+    haut = np.broadcast_to(np.asarray(haut, dtype=np.float64), valeurs.shape)
+
+    valides = ~np.isnan(valeurs)
+    ordre = np.flatnonzero(valides)[np.lexsort((jours[valides], patients[valides]))]
+    patients, jours, valeurs, bas, haut = patients[ordre], jours[ordre], valeurs[ordre], bas[ordre], haut[ordre]
+    debuts = np.ones(len(patients), dtype=np.bool_)
+    debuts[1:] = patients[1:] != patients[:-1]
+    groupes = np.cumsum(debuts) - 1
+    nombre = int(np.count_nonzero(debuts))
+
+    # segment i : de la mesure i à la mesure i + 1 du même patient
+    duree = np.diff(jours)
+    retenus = ~debuts[1:] & (duree > 0) & (duree <= ECART_MAX_JOURS)
+    if debut is not None:
+        retenus &= jours[:-1] >= np.datetime64(debut, "D").astype(np.int64)
+    segments = np.flatnonzero(retenus)
+    v0, v1 = valeurs[segments], valeurs[segments + 1]
+    b, h = bas[segments], haut[segments]
+    pente = v1 - v0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # fractions du segment où la droite atteint chaque borne de la cible
+        s_bas, s_haut = (b - v0) / pente, (h - v0) / pente
+    entree = np.clip(np.minimum(s_bas, s_haut), 0.0, 1.0)
+    sortie = np.clip(np.maximum(s_bas, s_haut), 0.0, 1.0)
+    dans_cible = np.where(pente == 0, (v0 >= b) & (v0 <= h), sortie - entree)
+
+    groupe, duree = groupes[segments], duree[segments].astype(np.float64)
+    jours_suivis = np.bincount(groupe, duree, nombre)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ttr = 100 * np.bincount(groupe, duree * dans_cible, nombre) / jours_suivis
+    return {
+        "patient_id": patients[debuts],
+        "mesures": np.bincount(groupes, minlength=nombre),
+        "jours_suivis": jours_suivis.astype(np.int64),
+        "ttr": ttr,
+    }
+
+def ttr_patient(dates, inr, bas, haut, debut=None):
+    """(TTR en %, jours suivis) d'un seul patient ; TTR NaN sans segment interpolé"""
+    if len(dates) < 2:
+        return float("nan"), 0
+    colonnes = ttr_registre(np.zeros(len(dates), dtype=np.int8), dates, inr, bas, haut, debut)
+    return float(colonnes["ttr"][0]), int(colonnes["jours_suivis"][0])
+
+def lire_mesures_inr(chemin):
+    """Fichier de mesures d'INR (CSV ou Parquet) en DataFrame trié par patient et date"""
+    import pandas as pd
+
+    from .cohorte import lire_blocs
+
+    mesures = pd.concat(lire_blocs(chemin, 1_000_000), ignore_index=True)
+    manquantes = set(COLONNES_INR) - set(mesures.columns)
+    if manquantes:
+        raise KeyError(f"Colonnes manquantes : {', '.join(sorted(manquantes))}")
+    mesures["patient_id"] = mesures["patient_id"].astype(str)
+    mesures["date_mesure"] = pd.to_datetime(mesures["date_mesure"]).dt.normalize()
+    return mesures.sort_values(["patient_id", "date_mesure"], ignore_index=True)
@@ -0,0 +1,57 @@
+"""Mémoïsation bornée indexée par des arguments canoniques.
+
+Les sliders discrétisent les mesures : les mêmes combinaisons (valeurs par
+défaut, tableaux cliniques courants) reviennent d'une session à l'autre.
+``memoiser`` place un cache LRU borné devant une fonction, indexé par ses
+arguments arrondis (``canonique``) ; le cache est une variable de module,
+donc commun à toutes les sessions du processus.
+
+À réserver aux résultats coûteux à construire (tableaux affichés) : les
+évaluations scalaires coûtent moins qu'une construction de clé.
+"""
+
+from functools import lru_cache, wraps
+from types import MappingProxyType
+
+# Nombre de combinaisons conservées par défaut
+TAILLE_CACHE = 4096
+
+# Arrondi des flottants dans les clés : absorbe les erreurs de représentation
+# des pas de slider (0.30000000000000004 -> 0.3) sans confondre deux pas
+DECIMALES_CLE = 6
+
+def canonique(valeur):
+    """Forme canonique et hachable d'un argument"""
+    if isinstance(valeur, float):
+        return round(valeur, DECIMALES_CLE)
+    if isinstance(valeur, (bool, int, str)) or valeur is None:
+        return valeur
+    if isinstance(valeur, (tuple, list)):
+        return tuple(canonique(v) for v in valeur)
+    return round(float(valeur), DECIMALES_CLE)
+
+def _figer(resultat):
+    return MappingProxyType(resultat) if isinstance(resultat, dict) else resultat
+
+def memoiser(taille_max=TAILLE_CACHE):
+    """Décorateur : cache LRU borné indexé par les arguments canoniques.
+
+    La fonction décorée expose ``cache_info()`` et ``cache_clear()`` comme
+    une fonction ``functools.lru_cache``. Le résultat est partagé entre
+    appelants : les dictionnaires sont renvoyés en lecture seule.
+    """
+    def decorateur(fonction):
+        calcul = lru_cache(maxsize=taille_max)(lambda *args, **kwargs: _figer(fonction(*args, **kwargs)))
+
+        @wraps(fonction)
+        def memoisee(*args, **kwargs):
+            return calcul(*(canonique(a) for a in args), **{cle: canonique(v) for cle, v in kwargs.items()})
+
+        memoisee.cache_info = calcul.cache_info
+        memoisee.cache_clear = calcul.cache_clear
+        return memoisee
+    return decorateur
+
+def statistiques(fonctions):
+    """Succès, échecs et remplissage du cache de chaque fonction mémoïsée (nom -> fonction)"""
+    return {nom: fonction.cache_info()._asdict() for nom, fonction in fonctions.items()}
@@ -0,0 +1,114 @@
+"""Bases de données des prothèses valvulaires (EOA théorique et gradient moyen normal)."""
+
+# ============================================================================
+# BASES DE DONNÉES COMPLÈTES DES PROTHÈSES
+# ============================================================================
+
+protheses_aortiques = {
+    "Mécaniques": {
+        "St Jude Medical (Regent)": {
+            "19": {"EOA_théorique": 1.3, "Gradient_moyen_normal": "10-15"},
+            "21": {"EOA_théorique": 1.5, "Gradient_moyen_normal": "8-12"},
+            "23": {"EOA_théorique": 1.7, "Gradient_moyen_normal": "7-11"},
+            "25": {"EOA_théorique": 2.0, "Gradient_moyen_normal": "6-10"},
+            "27": {"EOA_théorique": 2.4, "Gradient_moyen_normal": "5-9"},
+            "29": {"EOA_théorique": 2.8, "Gradient_moyen_normal": "4-8"}
+        },
+        "Carbomedics (Top Hat)": {
+            "19": {"EOA_théorique": 1.2, "Gradient_moyen_normal": "12-16"},
+            "21": {"EOA_théorique": 1.4, "Gradient_moyen_normal": "10-14"},
+            "23": {"EOA_théorique": 1.6, "Gradient_moyen_normal": "9-13"},
+            "25": {"EOA_théorique": 1.9, "Gradient_moyen_normal": "8-12"},
+            "27": {"EOA_théorique": 2.2, "Gradient_moyen_normal": "7-11"},
+            "29": {"EOA_théorique": 2.6, "Gradient_moyen_normal": "6-10"}
+        },
+        "On-X": {
+            "19": {"EOA_théorique": 1.5, "Gradient_moyen_normal": "9-13"},
+            "21": {"EOA_théorique": 1.8, "Gradient_moyen_normal": "7-11"},
+            "23": {"EOA_théorique": 2.1, "Gradient_moyen_normal": "6-10"},
+            "25": {"EOA_théorique": 2.5, "Gradient_moyen_normal": "5-9"},
+            "27": {"EOA_théorique": 2.9, "Gradient_moyen_normal": "4-8"},
+            "29": {"EOA_théorique": 3.3, "Gradient_moyen_normal": "4-7"}
+        }
+    },
+    "Biologiques": {
+        "Carpentier-Edwards Perimount": {
+            "19": {"EOA_théorique": 1.1, "Gradient_moyen_normal": "14-18"},
+            "21": {"EOA_théorique": 1.3, "Gradient_moyen_normal": "12-16"},
+            "23": {"EOA_théorique": 1.5, "Gradient_moyen_normal": "10-14"},
+            "25": {"EOA_théorique": 1.7, "Gradient_moyen_normal": "9-13"},
+            "27": {"EOA_théorique": 1.9, "Gradient_moyen_normal": "8-12"},
+            "29": {"EOA_théorique": 2.1, "Gradient_moyen_normal": "7-11"}
+        },
+        "Medtronic Mosaic": {
+            "19": {"EOA_théorique": 1.0, "Gradient_moyen_normal": "15-20"},
+            "21": {"EOA_théorique": 1.2, "Gradient_moyen_normal": "13-17"},
+            "23": {"EOA_théorique": 1.4, "Gradient_moyen_normal": "11-15"},
+            "25": {"EOA_théorique": 1.6, "Gradient_moyen_normal": "10-14"},
+            "27": {"EOA_théorique": 1.8, "Gradient_moyen_normal": "9-13"},
+            "29": {"EOA_théorique": 2.0, "Gradient_moyen_normal": "8-12"}
+        },
+        "St Jude Medical Biocor": {
+            "19": {"EOA_théorique": 1.2, "Gradient_moyen_normal": "13-17"},
+            "21": {"EOA_théorique": 1.4, "Gradient_moyen_normal": "11-15"},
+            "23": {"EOA_théorique": 1.6, "Gradient_moyen_normal": "10-14"},
+            "25": {"EOA_théorique": 1.8, "Gradient_moyen_normal": "9-13"},
+            "27": {"EOA_théorique": 2.0, "Gradient_moyen_normal": "8-12"},
+            "29": {"EOA_théorique": 2.2, "Gradient_moyen_normal": "7-11"}
+        }
+    },
+    "TAVI": {
+        "Edwards SAPIEN 3": {
+            "20": {"EOA_théorique": 1.4, "Gradient_moyen_normal": "8-12"},
+            "23": {"EOA_théorique": 1.7, "Gradient_moyen_normal": "7-11"},
+            "26": {"EOA_théorique": 2.0, "Gradient_moyen_normal": "6-10"},
+            "29": {"EOA_théorique": 2.3, "Gradient_moyen_normal": "5-9"}
+        },
+        "Medtronic Evolut": {
+            "23": {"EOA_théorique": 1.9, "Gradient_moyen_normal": "6-10"},
+            "26": {"EOA_théorique": 2.2, "Gradient_moyen_normal": "5-9"},
+            "29": {"EOA_théorique": 2.6, "Gradient_moyen_normal": "4-8"},
+            "34": {"EOA_théorique": 3.2, "Gradient_moyen_normal": "3-7"}
+        },
+        "Boston Scientific ACURATE": {
+            "23": {"EOA_théorique": 1.8, "Gradient_moyen_normal": "7-11"},
+            "25": {"EOA_théorique": 2.0, "Gradient_moyen_normal": "6-10"},
+            "27": {"EOA_théorique": 2.3, "Gradient_moyen_normal": "5-9"}
+        }
+    }
+}
+
+protheses_mitrales = {
+    "Mécaniques": {
+        "St Jude Medical": {
+            "25": {"EOA_théorique": 2.1, "Gradient_moyen_normal": "3-5"},
+            "27": {"EOA_théorique": 2.3, "Gradient_moyen_normal": "2.5-4.5"},
+            "29": {"EOA_théorique": 2.5, "Gradient_moyen_normal": "2-4"},
+            "31": {"EOA_théorique": 2.7, "Gradient_moyen_normal": "2-3.5"},
+            "33": {"EOA_théorique": 2.9, "Gradient_moyen_normal": "1.5-3"}
+        },
+        "Carbomedics": {
+            "25": {"EOA_théorique": 2.0, "Gradient_moyen_normal": "3.5-5.5"},
+            "27": {"EOA_théorique": 2.2, "Gradient_moyen_normal": "3-5"},
+            "29": {"EOA_théorique": 2.4, "Gradient_moyen_normal": "2.5-4.5"},
+            "31": {"EOA_théorique": 2.6, "Gradient_moyen_normal": "2-4"},
+            "33": {"EOA_théorique": 2.8, "Gradient_moyen_normal": "2-3.5"}
+        }
+    },
+    "Biologiques": {
+        "Carpentier-Edwards Perimount": {
+            "25": {"EOA_théorique": 1.8, "Gradient_moyen_normal": "4-6"},
+            "27": {"EOA_théorique": 2.0, "Gradient_moyen_normal": "3.5-5.5"},
+            "29": {"EOA_théorique": 2.2, "Gradient_moyen_normal": "3-5"},
+            "31": {"EOA_théorique": 2.4, "Gradient_moyen_normal": "2.5-4.5"},
+            "33": {"EOA_théorique": 2.6, "Gradient_moyen_normal": "2-4"}
+        },
+        "Hancock II": {
+            "25": {"EOA_théorique": 1.7, "Gradient_moyen_normal": "4.5-6.5"},
+            "27": {"EOA_théorique": 1.9, "Gradient_moyen_normal": "4-6"},
+            "29": {"EOA_théorique": 2.1, "Gradient_moyen_normal": "3.5-5.5"},
+            "31": {"EOA_théorique": 2.3, "Gradient_moyen_normal": "3-5"},
+            "33": {"EOA_théorique": 2.5, "Gradient_moyen_normal": "2.5-4.5"}
+        }
+    }
+}
@@ -0,0 +1,165 @@
+"""Rappels de contrôle des prothèses : échéance du prochain examen et liste de travail du jour.
+
+Le dernier examen de prothèse de chaque patient fixe son prochain contrôle :
+le classement ``controle_prothese`` (regles.toml) lit la performance
+prothétique, le PPM et le risque de thrombose, et ``DELAIS_CONTROLE`` en
+déduit l'échéance (une consultation urgente est due le jour de l'examen).
+
+``Planning`` range un rappel par patient dans un tas binaire indexé, ordonné
+par échéance, avec la position de chaque patient dans le tas :
+
+- la liste de travail d'un jour (rappels échus) est un parcours du tas
+  arrêté aux nœuds non échus : O(k) pour k patients à rappeler, quel que
+  soit le nombre de patients suivis ;
+- un nouvel examen remplace le rappel du patient à sa place dans le tas, qui
+  est rétabli en le faisant monter ou descendre : O(log n), sans reconstruire
+  le planning.
+
+Un rappel est un tuple ``(echeance, urgence, patient_id, date_examen,
+controle)`` (voir COLONNES_RAPPEL), ``urgence`` étant le rang du résultat
+dans ``controle_prothese`` (0 : consultation urgente).
+"""
+
+import heapq
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+from operator import itemgetter
+
+from .historique import JOURS_PAR_MOIS
+from .regles import classements_textuels, evaluer, lire_regles
+
+# Résultat de controle_prothese -> délai avant le prochain examen (mois)
+DELAIS_CONTROLE = {"consultation_urgente": 0, "controle_6_mois": 6, "controle_annuel": 12}
+
+# Résultats du dernier examen lus par controle_prothese
+RESULTATS_CONTROLE = ("performance_prothese", "ppm", "risque_thrombose")
+
+COLONNES_RAPPEL = ("echeance", "urgence", "patient_id", "date_examen", "controle")
+
+@lru_cache(maxsize=None)
+def controle(performance_prothese, ppm, risque_thrombose):
+    """(résultat de controle_prothese, urgence, délai en jours), évalué une fois par combinaison de résultats"""
+    resultat = evaluer(
+        "controle_prothese", performance_prothese=performance_prothese, ppm=ppm, risque_thrombose=risque_thrombose,
+    )
+    urgence = classements_textuels(lire_regles())["controle_prothese"].index(resultat)
+    return resultat, urgence, timedelta(days=round(DELAIS_CONTROLE[resultat] * JOURS_PAR_MOIS))
+
+def rappel(patient_id, date_examen, performance_prothese, ppm, risque_thrombose):
+    """Rappel du patient après son examen du jour ``date_examen``"""
+    resultat, urgence, delai = controle(performance_prothese, ppm, risque_thrombose)
+    return date_examen + delai, urgence, patient_id, date_examen, resultat
+
+class Planning:
+    """Rappel courant de chaque patient dans un tas indexé par échéance (voir le docstring du module)"""
+
+    def __init__(self, rappels=()):
+        courants = {}
+        for element in rappels:
+            courant = courants.get(element[2])
+            if courant is None or courant[3] <= element[3]:
+                courants[element[2]] = element
+        self._tas = list(courants.values())
+        heapq.heapify(self._tas)
+        self._positions = {element[2]: i for i, element in enumerate(self._tas)}
+        self._verrou = threading.Lock()
+
+    @classmethod
+    def depuis_historique(cls, historique):
+        """Planning construit sur le dernier examen de prothèse de chaque patient d'un ``Historique``"""
+        return cls(
+            rappel(patient_id, date.fromisoformat(jour), *resultats)
+            for patient_id, jour, *resultats in historique.derniers_resultats_protheses(RESULTATS_CONTROLE)
+        )
+
+    def __len__(self):
+        return len(self._tas)
+
+    def noter(self, patient_id, date_examen, resultats):
+        """Met à jour le rappel du patient après un examen (O(log n)) et renvoie son rappel courant.
+
+        ``resultats`` contient les RESULTATS_CONTROLE de l'examen (les absents
+        ne satisfont aucune condition). Un examen antérieur au dernier examen
+        connu du patient ne change pas son rappel.
+        """
+        nouveau = rappel(patient_id, date_examen, *(resultats.get(nom) for nom in RESULTATS_CONTROLE))
+        with self._verrou:
+            i = self._positions.get(patient_id)
+            if i is None:
+                self._tas.append(nouveau)
+                self._monter(len(self._tas) - 1)
+                return nouveau
+            courant = self._tas[i]
+            if courant[3] > date_examen or courant == nouveau:
+                return courant
+            self._tas[i] = nouveau
+            if nouveau < courant:
+                self._monter(i)
+            else:
+                self._descendre(i)
+        return nouveau
+
+    def prochain(self, patient_id):
+        """Rappel courant du patient, ou None"""
+        i = self._positions.get(patient_id)
+        return self._tas[i] if i is not None else None
+
+    def a_rappeler(self, jour=None):
+        """Rappels échus au jour ``jour`` (aujourd'hui par défaut), les plus urgents puis les plus anciens d'abord"""
+        jour = jour or date.today()
+        echus = []
+        with self._verrou:
+            tas = self._tas
+            taille = len(tas)
+            # les enfants d'un nœud ont une échéance au moins égale : un nœud non échu clôt sa branche
+            pile = [0] if taille else []
+            while pile:
+                i = pile.pop()
+                element = tas[i]
+                if element[0] <= jour:
+                    echus.append(element)
+                    enfant = 2 * i + 1
+                    if enfant < taille:
+                        pile.append(enfant)
+                        if enfant + 1 < taille:
+                            pile.append(enfant + 1)
+        # tri par échéance puis patient, puis tri stable par urgence
+        echus.sort()
+        echus.sort(key=itemgetter(1))
+        return echus
+
+    # ------------------------------------------------------------------------
+    # Tas indexé : chaque déplacement met à jour la position du patient
+    # ------------------------------------------------------------------------
+
+    def _placer(self, i, element):
+        self._tas[i] = element
+        self._positions[element[2]] = i
+
+    def _monter(self, i):
+        tas = self._tas
+        element = tas[i]
+        while i:
+            parent = (i - 1) >> 1
+            if not element < tas[parent]:
+                break
+            self._placer(i, tas[parent])
+            i = parent
+        self._placer(i, element)
+
+    def _descendre(self, i):
+        tas = self._tas
+        taille = len(tas)
+        element = tas[i]
+        while True:
+            enfant = 2 * i + 1
+            if enfant >= taille:
+                break
+            if enfant + 1 < taille and tas[enfant + 1] < tas[enfant]:
+                enfant += 1
+            if not tas[enfant] < element:
+                break
+            self._placer(i, tas[enfant])
+            i = enfant
+        self._placer(i, element)
@@ -0,0 +1,401 @@
+"""Rapports d'examen : verdicts, tableaux de paramètres et métriques de prothèse.
+
+``rapport_examen`` rend un examen enregistré dans l'historique en une page
+HTML autonome (style d'impression compris) : identification, verdict de
+chaque évaluation présente dans les résultats suivi du tableau des mesures
+qui l'ont produite, métriques de la prothèse (EOA théorique du référentiel,
+rapport EOA mesurée/théorique, EOAi, TTR) et prochain contrôle.
+
+Génération en lot : ``generer_archive`` répartit les examens d'une liste de
+travail en lots de ``TAILLE_LOT_RAPPORTS`` entre les processus d'un pool ;
+chaque processus ouvre l'historique une fois et lit un lot en une requête.
+Les rapports d'un lot sont écrits dans l'archive zip dès son retour, dans
+l'ordre de la liste, et au plus deux lots par processus sont en cours : du
+contenu des rapports, seuls ces lots sont en mémoire (l'archive ne garde que
+l'entrée de répertoire de chaque rapport écrit).
+
+Depuis l'interface, les rapports sont rendus par ``FileRapports`` : le rerun
+dépose la demande et rend la main, un fil de fond la traite.
+"""
+
+import hashlib
+import html
+import multiprocessing
+import os
+import queue
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from .historique import CHEMIN_BASE, Historique
+from .rappels import RESULTATS_CONTROLE, Planning, rappel
+from .referentiel import charger_referentiel
+
+# Examens lus et rendus par tâche du pool
+TAILLE_LOT_RAPPORTS = 200
+
+# Résultats de la file de fond conservés (les plus anciens sont oubliés)
+RAPPORTS_CONSERVES = 64
+
+# ============================================================================
+# LIBELLÉS DES VERDICTS (communs à l'interface et aux rapports)
+# ============================================================================
+
+# Verdict -> (libellé, classe CSS de l'alerte)
+VERDICTS_PRVG = {
+    "normale": ("✅ PRVG normale", "success-alert"),
+    "elevee": ("🔴 PRVG élevée", "critical-alert"),
+    "probablement_elevee": ("🟡 PRVG probablement élevée", "warning-alert"),
+    "indeterminee": ("🟡 PRVG indéterminée", "dynamic-result"),
+    "non_classee": ("PRVG non classée", "dynamic-result"),
+}
+VERDICTS_PATTERN = {
+    "relaxation_alteree": ("📊 Relaxation altérée - PRVG probablement normale", "success-alert"),
+    "pseudonormal": ("🟡 Pattern pseudonormal - PRVG élevée", "warning-alert"),
+    "restrictif": ("🔴 Pattern restrictif - PRVG très élevée", "critical-alert"),
+}
+VERDICTS_GRADE = {0: "success-alert", 1: "dynamic-result", 2: "warning-alert", 3: "critical-alert"}
+VERDICTS_HTAP = {
+    "faible": ("✅ Probabilité HTAP faible", "success-alert"),
+    "faible_surveillance": ("🟡 Probabilité HTAP faible - surveillance", "dynamic-result"),
+    "intermediaire": ("⚠️ Probabilité HTAP intermédiaire", "warning-alert"),
+    "elevee": ("🔴 Probabilité HTAP élevée", "critical-alert"),
+}
+VERDICTS_PERICARDE = {
+    "constriction": ("🎯 Constriction péricardique probable", "critical-alert"),
+    "restriction": ("🎯 Cardiomyopathie restrictive probable", "warning-alert"),
+    "indetermine": ("❓ Pas d'argument décisif", "success-alert"),
+}
+VERDICTS_PERFORMANCE = {
+    "Fonction normale": "success-alert",
+    "Dysfonction modérée": "warning-alert",
+    "Dysfonction sévère": "critical-alert",
+}
+LIBELLES_PPM = {"severe": "PPM sévère", "modere": "PPM modéré", "absent": "Pas de PPM"}
+LIBELLES_THROMBOSE = {"eleve": "risque thrombotique élevé", "modere": "risque thrombotique modéré", "faible": "risque thrombotique faible"}
+LIBELLES_CONTROLE = {
+    "consultation_urgente": "🔴 Consultation chirurgicale urgente",
+    "controle_6_mois": "🟡 Contrôle 6 mois",
+    "controle_annuel": "🟢 Contrôle annuel",
+}
+
+COULEURS_ALERTE = {
+    "success-alert": "#28a745",
+    "dynamic-result": "#17a2b8",
+    "warning-alert": "#ffc107",
+    "critical-alert": "#dc3545",
+}
+
+def verdicts_examen(resultats, type_general=None):
+    """Verdict de chaque évaluation présente dans ``resultats`` : section -> (titre, libellé, classe CSS, détail).
+
+    Sections ``prvg``, ``diastolique``, ``htap``, ``pericarde`` et
+    ``prothese``, dans cet ordre ; une évaluation absente (résultat nul ou
+    manquant, examen de prothèse seule par exemple) n'a pas de verdict.
+    """
+    verdicts = {}
+    if resultats.get("categorie_prvg") is not None:
+        libelle, classe = VERDICTS_PRVG[resultats["categorie_prvg"]]
+        detail = f"FE VG {resultats['classe_fevg']} - {resultats['criteres_secondaires']}/3 critères secondaires"
+        verdicts["prvg"] = ("🫀 Pression de remplissage VG", libelle, classe, detail)
+    elif resultats.get("pattern_diastolique") is not None:
+        libelle, classe = VERDICTS_PATTERN[resultats["pattern_diastolique"]]
+        detail = f"FE VG {resultats['classe_fevg']} - évaluation par le pattern mitral"
+        verdicts["prvg"] = ("🫀 Pression de remplissage VG", libelle, classe, detail)
+    if resultats.get("grade_diastolique") is not None:
+        verdicts["diastolique"] = (
+            "📊 Fonction diastolique", resultats["libelle_diastolique"],
+            VERDICTS_GRADE[resultats["grade_diastolique"]], f"Grade {resultats['grade_diastolique']}/3",
+        )
+    if resultats.get("probabilite_htap") is not None:
+        libelle, classe = VERDICTS_HTAP[resultats["probabilite_htap"]]
+        verdicts["htap"] = (
+            "🌊 Hypertension pulmonaire", libelle, classe,
+            f"Score principal {resultats['score_htap']}/7 - secondaire {resultats['score_secondaire_htap']}/5",
+        )
+    if resultats.get("diagnostic_pericardique") is not None:
+        libelle, classe = VERDICTS_PERICARDE[resultats["diagnostic_pericardique"]]
+        verdicts["pericarde"] = (
+            "🔄 Constriction vs restriction", libelle, classe,
+            f"Score constriction {resultats['score_constriction']}/6 - restrictif {resultats['score_restrictif']}/4",
+        )
+    if resultats.get("performance_prothese") is not None:
+        details = []
+        if resultats.get("ppm") is not None:
+            details.append(f"{LIBELLES_PPM[resultats['ppm']]} (EOAi {resultats['eoai']:.2f} cm²/m²)")
+        if resultats.get("risque_thrombose") is not None:
+            details.append(f"{LIBELLES_THROMBOSE[resultats['risque_thrombose']]} ({resultats['score_thrombose']}/8)")
+        if resultats.get("ttr") is not None:
+            details.append(f"TTR {resultats['ttr']:.0f}%")
+        if resultats.get("evolution_annuelle") is not None:
+            details.append(f"évolution {resultats['evolution_annuelle']:+.1f} mmHg/an")
+        verdicts["prothese"] = (
+            f"⚙️ {type_general or 'Prothèse valvulaire'}", resultats["performance_prothese"],
+            VERDICTS_PERFORMANCE[resultats["performance_prothese"]], " - ".join(details),
+        )
+    return verdicts
+
+# ============================================================================
+# RAPPORT D'UN EXAMEN
+# ============================================================================
+
+# Section -> mesures de la fiche reprises dans son tableau (nom, libellé)
+MESURES_SECTIONS = {
+    "prvg": (
+        ("fevg", "FE VG (%)"), ("e_e_prime", "E/e' moyen"), ("volume_og", "Volume OG indexé (ml/m²)"),
+        ("tr_vitesse", "Vitesse TR max (m/s)"),
+    ),
+    "diastolique": (
+        ("e_vitesse", "Vitesse E (cm/s)"), ("e_a_ratio", "Rapport E/A"), ("dt", "Temps décélération (ms)"),
+        ("e_e_prime", "E/e' moyen"), ("volume_og", "Volume OG indexé (ml/m²)"), ("tr_vitesse", "Vitesse TR max (m/s)"),
+    ),
+    "htap": (
+        ("tr_vitesse", "Vitesse TR max (m/s)"), ("vc_diametre", "Diamètre VCI (mm)"),
+        ("vc_collapsus", "Collapsus VCI (%)"), ("rv_ra_ratio", "Rapport VD/OG"),
+        ("septum_paradoxal", "Mouvement septum paradoxal"), ("tapse", "TAPSE (mm)"),
+        ("s_tricuspide", "S' tricuspide (cm/s)"), ("fac_vd", "FAC VD (%)"),
+        ("acceleration_time", "Temps accélération VTID (ms)"), ("pvr_estimee", "PVR estimée (UW)"),
+    ),
+    "pericarde": (
+        ("variation_respiratoire", "Variation respiratoire flux mitral E"),
+        ("septal_bounce", "Mouvement septal paradoxal"),
+        ("annulus_reverse", "Annulus paradoxal (e' latéral > e' septal)"),
+        ("fonction_vg", "Fonction VG systolique"), ("strain_longitudinal", "Strain longitudinal global (%)"),
+    ),
+    "prothese": (
+        ("gradient_moyen", "Gradient moyen (mmHg)"), ("eoa_mesuree", "EOA mesurée (cm²)"), ("dvi", "DVI"),
+        ("fa", "Fibrillation auriculaire"), ("antecedent_te", "Antécédent thrombo-embolique"), ("inr", "INR"),
+        ("gradient_precedent", "Gradient précédent (mmHg)"), ("delta_temps", "Délai depuis dernier examen (mois)"),
+    ),
+}
+
+STYLE_RAPPORT = f"""
+body {{ font-family: "Segoe UI", Helvetica, Arial, sans-serif; color: #222; max-width: 50rem; margin: 2rem auto; }}
+h1 {{ font-size: 1.4rem; border-bottom: 3px solid #1f77b4; padding-bottom: .3rem; }}
+h2 {{ font-size: 1.1rem; margin: 1.2rem 0 .3rem; }}
+.verdict {{ border-left: 5px solid; padding: .4rem .8rem; margin-bottom: .4rem; }}
+{"".join(f".{classe} {{ border-color: {couleur}; background: {couleur}18; }}" for classe, couleur in COULEURS_ALERTE.items())}
+table {{ border-collapse: collapse; width: 100%; font-size: .9rem; }}
+td {{ border-bottom: 1px solid #ddd; padding: .2rem .5rem; }}
+td:last-child {{ text-align: right; }}
+footer {{ margin-top: 2rem; color: #888; font-size: .8rem; }}
+@media print {{ body {{ margin: 0; }} section {{ break-inside: avoid; }} }}
+"""
+
+def _valeur(valeur):
+    if isinstance(valeur, bool):
+        return "Oui" if valeur else "Non"
+    if isinstance(valeur, float):
+        return f"{valeur:g}"
+    return str(valeur)
+
+def _tableau(lignes):
+    return "<table>" + "".join(
+        f"<tr><td>{html.escape(libelle)}</td><td>{html.escape(_valeur(valeur))}</td></tr>" for libelle, valeur in lignes
+    ) + "</table>"
+
+def metriques_prothese(examen):
+    """Métriques de la prothèse de l'examen (libellé, valeur), EOA théorique et rapport si le modèle est au référentiel"""
+    type_general, categorie, marque, taille = examen["prothese"]
+    fiche, resultats = examen["fiche"], examen["resultats"]
+    lignes = [("Prothèse", f"{type_general} - {categorie}")]
+    if marque is not None and taille is not None:
+        lignes.append(("Modèle", f"{marque} {taille:g} mm"))
+        try:
+            eoa_theorique = charger_referentiel().chercher(type_general, marque, taille)["eoa"]
+        except KeyError:
+            eoa_theorique = None
+        if eoa_theorique is not None:
+            lignes.append(("EOA théorique (cm²)", eoa_theorique))
+            if fiche.get("eoa_mesuree") is not None:
+                lignes.append(("EOA mesurée/théorique (%)", f"{fiche['eoa_mesuree'] / eoa_theorique * 100:.1f}"))
+    if resultats.get("eoai") is not None:
+        lignes.append(("EOAi (cm²/m²)", f"{resultats['eoai']:.2f}"))
+    if resultats.get("delta_gradient") is not None:
+        lignes.append(("Variation du gradient (mmHg)", f"{resultats['delta_gradient']:+.1f}"))
+    if resultats.get("ttr") is not None:
+        lignes.append(("Temps dans la cible INR (%)", f"{resultats['ttr']:.0f}"))
+    return lignes
+
+def rapport_examen(examen, identite=None):
+    """Rapport HTML autonome d'un examen de l'historique (dictionnaire de ``Historique.examens``).
+
+    ``identite`` (facultatif) complète l'en-tête : ``age``, ``sexe``,
+    ``surface_corporelle``, non enregistrés dans l'historique.
+    """
+    patient_id, jour = examen["patient_id"], examen["date_examen"]
+    fiche, resultats, prothese = examen["fiche"], examen["resultats"], examen["prothese"]
+    parties = [
+        "<!DOCTYPE html><html lang='fr'><head><meta charset='utf-8'>",
+        f"<title>Rapport échocardiographique {html.escape(patient_id)} {jour.isoformat()}</title>",
+        f"<style>{STYLE_RAPPORT}</style></head><body>",
+        "<h1>RAPPORT ÉCHOCARDIOGRAPHIQUE</h1>",
+        f"<p><strong>Patient :</strong> {html.escape(patient_id)} | <strong>Examen du</strong> {jour.strftime('%d/%m/%Y')}</p>",
+    ]
+    if identite:
+        parties.append(
+            f"<p>Âge : {html.escape(_valeur(identite['age']))} ans | Sexe : {html.escape(identite['sexe'])} | "
+            f"Surface corporelle : {html.escape(_valeur(identite['surface_corporelle']))} m²</p>"
+        )
+    verdicts = verdicts_examen(resultats, prothese and prothese[0])
+    if not verdicts:
+        parties.append("<p>Aucune évaluation enregistrée pour cet examen.</p>")
+    for section, (titre, libelle, classe, detail) in verdicts.items():
+        mesures = MESURES_SECTIONS[section]
+        if section == "prothese" and prothese is not None and prothese[0] != "Prothèse aortique":
+            mesures = [(nom, libelle_mesure) for nom, libelle_mesure in mesures if nom != "dvi"]
+        lignes = [(libelle_mesure, fiche[nom]) for nom, libelle_mesure in mesures if fiche.get(nom) is not None]
+        if section == "prothese" and prothese is not None:
+            lignes = metriques_prothese(examen) + lignes
+        parties.append(
+            f"<section><h2>{html.escape(titre)}</h2>"
+            f"<div class='verdict {classe}'><strong>{html.escape(libelle)}</strong><br>{html.escape(detail)}</div>"
+            f"{_tableau(lignes)}</section>"
+        )
+    if prothese is not None and "performance_prothese" in resultats:
+        echeance, _, _, _, controle = rappel(patient_id, jour, *(resultats.get(nom) for nom in RESULTATS_CONTROLE))
+        parties.append(
+            f"<p>📅 <strong>Prochain contrôle :</strong> {echeance.strftime('%d/%m/%Y')} "
+            f"({html.escape(LIBELLES_CONTROLE[controle])})</p>"
+        )
+    parties.append(
+        "<footer>Rapport généré automatiquement par le système d'aide à l'évaluation échocardiographique, "
+        "à partir des mesures enregistrées et des règles en vigueur.</footer></body></html>"
+    )
+    return "".join(parties)
+
+def nom_rapport(examen):
+    """Nom de fichier du rapport d'un examen : AAAA-MM-JJ_patient.html.
+
+    Un identifiant modifié par le nettoyage reçoit un court hachage de
+    l'identifiant d'origine : « PAT 001 », « PAT/001 » et « PAT_001 » ont
+    chacun leur entrée dans l'archive du jour.
+    """
+    patient_id = examen["patient_id"]
+    patient = "".join(c if c.isalnum() or c in "-_" else "_" for c in patient_id)
+    if patient != patient_id:
+        patient += "_" + hashlib.sha1(patient_id.encode()).hexdigest()[:8]
+    return f"{examen['date_examen'].isoformat()}_{patient}.html"
+
+# ============================================================================
+# GÉNÉRATION EN LOT
+# ============================================================================
+
+def cles_liste_de_travail(historique, jour=None, rappels=False):
+    """Examens (patient_id, date_examen) à rapporter pour le jour ``jour`` (aujourd'hui par défaut).
+
+    Examens du jour, ou avec ``rappels`` le dernier examen de chaque patient
+    dont le contrôle est échu.
+    """
+    jour = jour or date.today()
+    if not rappels:
+        return historique.cles_examens(jour)
+    return [(patient_id, date_examen) for _, _, patient_id, date_examen, _ in Planning.depuis_historique(historique).a_rappeler(jour)]
+
+# Historique ouvert une fois par processus du pool
+_historique_processus = None
+
+def _ouvrir_historique(chemin_base):
+    global _historique_processus
+    _historique_processus = Historique(chemin_base)
+
+def _rendre_lot(cles, historique=None):
+    # lecture du lot en une requête, rapports encodés prêts pour l'archive
+    examens = (historique or _historique_processus).examens_cles(cles)
+    return [(nom_rapport(examen), rapport_examen(examen).encode()) for examen in examens]
+
+def _lots_rendus(lots, chemin_base, processus):
+    if processus <= 1 or len(lots) <= 1:
+        historique = Historique(chemin_base)
+        for lot in lots:
+            yield _rendre_lot(lot, historique)
+        return
+    # spawn : le pool peut être créé depuis un processus multifil (serveur Streamlit, file de fond)
+    contexte = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(processus, contexte, _ouvrir_historique, (str(chemin_base),)) as pool:
+        en_cours = deque()
+        for lot in lots:
+            en_cours.append(pool.submit(_rendre_lot, lot))
+            if len(en_cours) >= 2 * processus:
+                yield en_cours.popleft().result()
+        while en_cours:
+            yield en_cours.popleft().result()
+
+def generer_archive(chemin_zip, cles, chemin_base=CHEMIN_BASE, processus=None, taille_lot=TAILLE_LOT_RAPPORTS):
+    """Écrit le rapport de chaque examen ``cles`` (patient_id, date_examen) dans une archive zip ; renvoie le nombre de rapports.
+
+    Les lots sont rendus par ``processus`` processus (tous les cœurs par
+    défaut, rendu sur place avec 1) et écrits dans l'archive au fil de
+    l'eau, dans l'ordre des clés (voir le docstring du module).
+    """
+    cles = list(cles)
+    lots = [cles[i:i + taille_lot] for i in range(0, len(cles), taille_lot)]
+    nombre = 0
+    with zipfile.ZipFile(chemin_zip, "w", zipfile.ZIP_DEFLATED) as archive:
+        for rapports in _lots_rendus(lots, chemin_base, processus or os.cpu_count() or 1):
+            for nom, contenu in rapports:
+                archive.writestr(nom, contenu)
+            nombre += len(rapports)
+    return nombre
+
+# ============================================================================
+# FILE DE FOND DE L'INTERFACE
+# ============================================================================
+
+class FileRapports:
+    """Demandes de rapports traitées par des fils de fond, hors du rerun.
+
+    ``soumettre`` dépose la demande et rend la main ; ``etat`` renvoie None
+    (demande inconnue ou oubliée), ``("en_attente", None)``, ``("pret",
+    valeur)`` ou ``("erreur", message)``. Une demande déjà en attente ou
+    prête sous la même clé n'est pas refaite. Plusieurs fils : une archive
+    du jour en cours n'attarde pas le rapport d'un patient.
+    """
+
+    def __init__(self, fils=2, conserves=RAPPORTS_CONSERVES):
+        self.fils = fils
+        self.conserves = conserves
+        self._file = queue.Queue()
+        self._etats = OrderedDict()
+        self._verrou = threading.Lock()
+        self._demarres = False
+
+    def soumettre(self, cle, fonction, *args):
+        """Dépose la demande ``fonction(*args)`` sous la clé ``cle`` (retour immédiat)"""
+        with self._verrou:
+            etat = self._etats.get(cle)
+            if etat is not None and etat[0] != "erreur":
+                return
+            self._etats[cle] = ("en_attente", None)
+            if not self._demarres:
+                for i in range(self.fils):
+                    threading.Thread(target=self._traiter, name=f"rapports-{i}", daemon=True).start()
+                self._demarres = True
+        self._file.put((cle, fonction, args))
+
+    def etat(self, cle):
+        """État de la demande ``cle`` (voir le docstring de la classe)"""
+        with self._verrou:
+            return self._etats.get(cle)
+
+    def vider(self):
+        """Attend le traitement de toutes les demandes déposées"""
+        self._file.join()
+
+    def _traiter(self):
+        while True:
+            cle, fonction, args = self._file.get()
+            try:
+                etat = ("pret", fonction(*args))
+            except Exception as erreur:
+                # l'erreur est rendue à l'interface, le fil continue
+                etat = ("erreur", str(erreur))
+            with self._verrou:
+                self._etats[cle] = etat
+                self._etats.move_to_end(cle)
+                termines = [c for c, (e, _) in self._etats.items() if e != "en_attente"]
+                for ancienne in termines[:max(len(termines) - self.conserves, 0)]:
+                    del self._etats[ancienne]
+            self._file.task_done()
@@ -0,0 +1,152 @@
+"""Référentiel colonnaire des prothèses valvulaires.
+
+Les tables ``protheses_aortiques`` et ``protheses_mitrales`` sont aplaties en
+colonnes NumPy typées (une ligne par position/marque/taille), avec les plages
+``Gradient_moyen_normal`` analysées une fois pour toutes en bornes flottantes.
+
+Index disponibles :
+
+- table de hachage (position, marque, taille) -> ligne, pour les recherches unitaires ;
+- tailles triées par modèle, pour la taille la plus proche en O(log n) ;
+- clés composites triées, pour les jointures vectorisées sur des milliers de patients.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .protheses import protheses_aortiques, protheses_mitrales
+
+# Libellés de l'interface -> position dans le référentiel
+POSITIONS = {"Prothèse aortique": "aortique", "Prothèse mitrale": "mitrale"}
+# Position du référentiel -> libellé de l'interface (celui que lisent les règles)
+LIBELLES_POSITIONS = {position: libelle for libelle, position in POSITIONS.items()}
+
+# Facteur de la clé composite : taille au dixième de mm, < 10000
+_FACTEUR_TAILLE = 10
+_FACTEUR_MODELE = 10_000
+
+def analyser_plage_gradient(texte):
+    """Convertit une plage "10-15" ou "2.5-4.5" en bornes (min, max) flottantes"""
+    bas, haut = texte.split("-")
+    return float(bas), float(haut)
+
+class ReferentielProtheses:
+    """Table colonnaire indexée des prothèses (voir le docstring du module)"""
+
+    def __init__(self, tables):
+        """``tables`` associe une position à une table imbriquée catégorie -> marque -> taille"""
+        lignes = [
+            (position, categorie, marque, float(taille), donnees["EOA_théorique"],
+             *analyser_plage_gradient(donnees["Gradient_moyen_normal"]))
+            for position, table in tables.items()
+            for categorie, marques in table.items()
+            for marque, tailles in marques.items()
+            for taille, donnees in tailles.items()
+        ]
+        colonnes = list(zip(*lignes))
+        self.position = np.array(colonnes[0])
+        self.categorie = np.array(colonnes[1])
+        self.marque = np.array(colonnes[2])
+        self.taille = np.array(colonnes[3], dtype=np.float64)
+        self.eoa = np.array(colonnes[4], dtype=np.float64)
+        self.gradient_min = np.array(colonnes[5], dtype=np.float64)
+        self.gradient_max = np.array(colonnes[6], dtype=np.float64)
+
+        self._index = {
+            (p, m, t): i
+            for i, (p, m, t) in enumerate(zip(self.position.tolist(), self.marque.tolist(), self.taille.tolist()))
+        }
+
+        # Modèles (position, marque) numérotés, tailles triées et lignes correspondantes
+        self._modeles = {}
+        self._tailles_par_modele = {}
+        for i, modele in enumerate(zip(self.position.tolist(), self.marque.tolist())):
+            self._modeles.setdefault(modele, len(self._modeles))
+            self._tailles_par_modele.setdefault(modele, []).append(i)
+        for modele, indices in self._tailles_par_modele.items():
+            indices = np.array(indices)
+            ordre = np.argsort(self.taille[indices], kind="stable")
+            self._tailles_par_modele[modele] = (self.taille[indices][ordre], indices[ordre])
+
+        # Clés composites triées pour les jointures vectorisées
+        code_modele = np.array([self._modeles[m] for m in zip(self.position.tolist(), self.marque.tolist())])
+        cles = self._cles(code_modele, self.taille)
+        self._ordre_cles = np.argsort(cles, kind="stable")
+        self._cles_triees = cles[self._ordre_cles]
+
+    def __len__(self):
+        return len(self.taille)
+
+    @staticmethod
+    def _cles(code_modele, taille):
+        return code_modele * _FACTEUR_MODELE + np.rint(np.asarray(taille, dtype=np.float64) * _FACTEUR_TAILLE).astype(np.int64)
+
+    # ------------------------------------------------------------------
+    # Recherches unitaires
+    # ------------------------------------------------------------------
+
+    def ligne(self, position, marque, taille):
+        """Indice de ligne de (position, marque, taille) ; KeyError si absente"""
+        return self._index[(POSITIONS.get(position, position), marque, float(taille))]
+
+    def chercher(self, position, marque, taille):
+        """Données de référence d'une prothèse sous forme de dictionnaire"""
+        i = self.ligne(position, marque, taille)
+        return {
+            "position": str(self.position[i]),
+            "categorie": str(self.categorie[i]),
+            "marque": str(self.marque[i]),
+            "taille": float(self.taille[i]),
+            "eoa": float(self.eoa[i]),
+            "gradient_min": float(self.gradient_min[i]),
+            "gradient_max": float(self.gradient_max[i]),
+        }
+
+    def tailles(self, position, marque):
+        """Tailles disponibles d'un modèle, triées"""
+        return self._tailles_par_modele[(POSITIONS.get(position, position), marque)][0]
+
+    def taille_la_plus_proche(self, position, marque, taille):
+        """Ligne de la taille disponible la plus proche de ``taille`` pour ce modèle"""
+        tailles, indices = self._tailles_par_modele[(POSITIONS.get(position, position), marque)]
+        j = int(np.searchsorted(tailles, taille))
+        if j == len(tailles) or (j > 0 and taille - tailles[j - 1] <= tailles[j] - taille):
+            j -= 1
+        return int(indices[j])
+
+    # ------------------------------------------------------------------
+    # Jointures vectorisées
+    # ------------------------------------------------------------------
+
+    def joindre(self, positions, marques, tailles):
+        """Indices de ligne pour des colonnes (position, marque, taille) ; -1 si absente.
+
+        Les couples (position, marque) distincts sont codés une seule fois,
+        puis chaque ligne est retrouvée par recherche dichotomique sur les
+        clés composites triées.
+        """
+        positions_uniques, inverse_position = np.unique(np.asarray(positions).astype(str), return_inverse=True)
+        marques_uniques, inverse_marque = np.unique(np.asarray(marques).astype(str), return_inverse=True)
+        codes_couples = np.array(
+            [[self._modeles.get((POSITIONS.get(p, p), m), -1) for m in marques_uniques.tolist()]
+             for p in positions_uniques.tolist()],
+            dtype=np.int64,
+        ).reshape(len(positions_uniques), len(marques_uniques))
+        code_modele = codes_couples[inverse_position.reshape(-1), inverse_marque.reshape(-1)]
+
+        cles = self._cles(code_modele, tailles)
+        j = np.minimum(np.searchsorted(self._cles_triees, cles), len(self._cles_triees) - 1)
+        trouve = (self._cles_triees[j] == cles) & (code_modele >= 0)
+        return np.where(trouve, self._ordre_cles[j], -1)
+
+    def gradient_dans_plage(self, lignes, gradient):
+        """Position du gradient mesuré par rapport à la plage normale : -1 sous, 0 dans, 1 au-dessus"""
+        lignes = np.asarray(lignes)
+        gradient = np.asarray(gradient, dtype=np.float64)
+        return (gradient > self.gradient_max[lignes]).astype(np.int8) - (gradient < self.gradient_min[lignes])
+
+@lru_cache(maxsize=None)
+def charger_referentiel():
+    """Référentiel des prothèses aortiques et mitrales, construit une fois par processus"""
+    return ReferentielProtheses({"aortique": protheses_aortiques, "mitrale": protheses_mitrales})
@@ -0,0 +1,295 @@
+"""Règles de décision déclaratives compilées en fonctions d'évaluation.
+
+Les seuils des évaluations sont définis une seule fois dans ``regles.toml``.
+Le fichier est lu et compilé une fois par processus :
+
+- ``regles()`` : fonctions scalaires (une fermeture par règle nommée),
+  utilisées par ``evaluations`` et par les repères de l'interface ;
+- ``vectoriel.regles_vect()`` : la même compilation avec des masques NumPy,
+  utilisée par les évaluations de cohortes.
+
+Une règle compilée prend un dictionnaire de variables (les mesures) et y
+range les règles intermédiaires qu'elle calcule : chaque règle n'est évaluée
+qu'une fois par appel, et une variable fournie par l'appelant prend le pas
+sur la règle du même nom.
+
+Une version des recommandations est un fichier TOML de même format qui ne
+redéfinit que les règles modifiées (``charger_version``). ``compiler_versions``
+compile plusieurs versions dans un même espace de noms : une règle identique
+d'une version à l'autre (définition et règles lues comprises) n'est calculée
+qu'une fois pour toutes les versions.
+"""
+
+import operator
+import os
+import re
+from functools import lru_cache
+
+CHEMIN_REGLES = os.path.join(os.path.dirname(__file__), "regles.toml")
+
+OPERATEURS = {
+    "<=": operator.le, ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, ">": operator.gt,
+}
+
+# Motifs compilés à la première compilation des règles (cache du module re)
+_COMPARAISON = r"^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(.+?)\s*$"
+_NOM = r"^\s*([A-Za-z_]\w*)\s*$"
+
+# Opérande de droite d'une comparaison qui n'est pas un littéral
+VARIABLE = object()
+
+SECTIONS = ("conditions", "scores", "classements")
+
+# Nom de la version définie par regles.toml
+VERSION_REFERENCE = "reference"
+
+# ============================================================================
+# LECTURE DU FICHIER DE RÈGLES
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def lire_regles(chemin=CHEMIN_REGLES):
+    """Définitions du fichier de règles : ``conditions``, ``scores`` et ``classements``"""
+    import tomllib
+    with open(chemin, "rb") as fichier:
+        definitions = tomllib.load(fichier)
+    for section in SECTIONS:
+        definitions.setdefault(section, {})
+    return definitions
+
+def charger_version(chemin, base=CHEMIN_REGLES):
+    """Définitions de ``base`` dont les règles redéfinies dans le fichier ``chemin`` sont remplacées"""
+    surcharge = lire_regles(chemin)
+    definitions = {section: dict(regles) for section, regles in lire_regles(base).items()}
+    for section in SECTIONS:
+        for nom, definition in surcharge[section].items():
+            for autre in SECTIONS:
+                definitions[autre].pop(nom, None)
+            definitions[section][nom] = definition
+    return definitions
+
+def analyser_operande(texte):
+    """Littéral (nombre ou libellé entre guillemets) ou VARIABLE pour un nom"""
+    texte = texte.strip()
+    if len(texte) >= 2 and texte[0] == texte[-1] and texte[0] in "\"'":
+        return texte[1:-1]
+    if re.match(_NOM, texte):
+        return VARIABLE
+    try:
+        return int(texte)
+    except ValueError:
+        return float(texte)
+
+def resultats_classement(definition):
+    """Résultats possibles d'un classement, dans l'ordre de ses codes"""
+    if "resultats" in definition:
+        return tuple(definition["resultats"])
+    return tuple(dict.fromkeys(cas[-1] for cas in definition["cas"]))
+
+def classements_textuels(definitions):
+    """Résultats possibles des classements à résultats textuels, par nom"""
+    return {
+        nom: resultats_classement(definition)
+        for nom, definition in definitions["classements"].items()
+        if all(isinstance(cas[-1], str) for cas in definition["cas"])
+    }
+
+# ============================================================================
+# DÉPENDANCES ENTRE RÈGLES
+# ============================================================================
+
+def _noms_condition(expression):
+    if isinstance(expression, dict):
+        (termes,) = expression.values()
+        for terme in termes if isinstance(termes, list) else [termes]:
+            yield from _noms_condition(terme)
+        return
+    nom = re.match(_NOM, expression)
+    if nom:
+        yield nom.group(1)
+        return
+    comparaison = re.match(_COMPARAISON, expression)
+    if comparaison is None:
+        raise ValueError(f"Condition invalide : {expression!r}")
+    gauche, _, droite = comparaison.groups()
+    yield gauche
+    if analyser_operande(droite) is VARIABLE:
+        yield droite.strip()
+
+def references(definitions, nom):
+    """Noms (règles ou mesures) lus directement par la règle ``nom``"""
+    if nom in definitions["conditions"]:
+        yield from _noms_condition(definitions["conditions"][nom])
+    elif nom in definitions["scores"]:
+        for terme in definitions["scores"][nom]["termes"]:
+            if isinstance(terme, str):
+                yield terme
+            else:
+                yield from _noms_condition(terme[0])
+    elif nom in definitions["classements"]:
+        for cas in definitions["classements"][nom]["cas"][:-1]:
+            yield from _noms_condition(cas[0])
+
+def _est_regle(definitions, nom):
+    return any(nom in definitions[section] for section in SECTIONS)
+
+def variables_requises(definitions, nom):
+    """Mesures lues par la règle ``nom`` et par les règles dont elle dépend"""
+    requises, vues, a_voir = set(), set(), [nom]
+    while a_voir:
+        courant = a_voir.pop()
+        if courant in vues:
+            continue
+        vues.add(courant)
+        if _est_regle(definitions, courant):
+            a_voir.extend(references(definitions, courant))
+        else:
+            requises.add(courant)
+    return requises
+
+def signatures(definitions):
+    """Signature de chaque règle : sa définition et les signatures des règles qu'elle lit.
+
+    Deux versions donnent la même signature à une règle si et seulement si
+    elle y calcule la même chose.
+    """
+    resultat = {}
+    def signature(nom):
+        if not _est_regle(definitions, nom):
+            return nom
+        if nom not in resultat:
+            section = next(section for section in SECTIONS if nom in definitions[section])
+            resultat[nom] = repr((
+                section, definitions[section][nom], [signature(lu) for lu in references(definitions, nom)]
+            ))
+        return resultat[nom]
+    for section in SECTIONS:
+        for nom in definitions[section]:
+            signature(nom)
+    return resultat
+
+# ============================================================================
+# COMPILATION
+# ============================================================================
+
+def compiler(definitions, primitives, cles=None):
+    """Compile chaque condition, score et classement nommé en fonction ``variables -> valeur``.
+
+    ``primitives`` fournit la réalisation des opérations élémentaires
+    (``comparer``, ``tous``, ``un_parmi``, ``non``, ``points``, ``somme``,
+    ``classer``) : scalaire ici, NumPy dans ``vectoriel``. ``cles`` donne la
+    clé sous laquelle une règle intermédiaire est rangée dans le dictionnaire
+    de variables (son nom par défaut).
+    """
+    compilees = {}
+    cles = cles or {}
+    textuels = classements_textuels(definitions)
+
+    def lecture(nom):
+        if not _est_regle(definitions, nom):
+            return operator.itemgetter(nom)
+        cle = cles.get(nom, nom)
+        def lire(variables):
+            try:
+                return variables[cle]
+            except KeyError:
+                valeur = variables[cle] = compilees[nom](variables)
+                return valeur
+        return lire
+
+    def condition(expression):
+        if isinstance(expression, dict):
+            (cle, termes), = expression.items()
+            if cle == "non":
+                return primitives["non"](condition(termes))
+            if cle not in ("tous", "un_parmi"):
+                raise ValueError(f"Combinaison de conditions inconnue : {cle}")
+            return primitives[cle]([condition(terme) for terme in termes])
+        nom = re.match(_NOM, expression)
+        if nom:
+            return lecture(nom.group(1))
+        comparaison = re.match(_COMPARAISON, expression)
+        if comparaison is None:
+            raise ValueError(f"Condition invalide : {expression!r}")
+        gauche, symbole, droite = comparaison.groups()
+        litteral = analyser_operande(droite)
+        return primitives["comparer"](
+            lecture(gauche), OPERATEURS[symbole],
+            lecture(droite.strip()) if litteral is VARIABLE else litteral,
+            litteral is not VARIABLE, textuels.get(gauche),
+        )
+
+    for nom, expression in definitions["conditions"].items():
+        compilees[nom] = condition(expression)
+    for nom, definition in definitions["scores"].items():
+        compilees[nom] = primitives["somme"]([
+            lecture(terme) if isinstance(terme, str) else primitives["points"](condition(terme[0]), terme[1])
+            for terme in definition["termes"]
+        ])
+    for nom, definition in definitions["classements"].items():
+        *cas, (defaut,) = definition["cas"]
+        compilees[nom] = primitives["classer"](
+            [(condition(expression), resultat) for expression, resultat in cas], defaut, textuels.get(nom),
+        )
+    return compilees
+
+def _lecteur(cle, fonction):
+    def lire(variables):
+        try:
+            return variables[cle]
+        except KeyError:
+            valeur = variables[cle] = fonction(variables)
+            return valeur
+    return lire
+
+def compiler_versions(versions, primitives):
+    """Compile plusieurs versions des règles pour une évaluation sur un même dictionnaire de variables.
+
+    ``versions`` : {nom de version: définitions}. Renvoie {nom de version:
+    {règle: fonction variables -> valeur}}. Une règle de même signature dans
+    plusieurs versions est rangée sous la même clé : son nom pour la première
+    version qui la définit, ``règle@version`` pour une redéfinition.
+    """
+    cle_par_signature = {}
+    compilees = {}
+    for version, definitions in versions.items():
+        cles = {
+            nom: cle_par_signature.setdefault(signature, nom if not compilees else f"{nom}@{version}")
+            for nom, signature in signatures(definitions).items()
+        }
+        fonctions = compiler(definitions, primitives, cles)
+        compilees[version] = {nom: _lecteur(cles[nom], fonction) for nom, fonction in fonctions.items()}
+    return compilees
+
+def _comparer(gauche, fonction, droite, litteral, codes):
+    if litteral:
+        return lambda variables: fonction(gauche(variables), droite)
+    return lambda variables: fonction(gauche(variables), droite(variables))
+
+def _classer(cas, defaut, codes):
+    def classer(variables):
+        for condition, resultat in cas:
+            if condition(variables):
+                return resultat
+        return defaut
+    return classer
+
+PRIMITIVES_SCALAIRES = {
+    "comparer": _comparer,
+    "tous": lambda conditions: lambda variables: all(c(variables) for c in conditions),
+    "un_parmi": lambda conditions: lambda variables: any(c(variables) for c in conditions),
+    "non": lambda condition: lambda variables: not condition(variables),
+    "points": lambda condition, points: lambda variables: points if condition(variables) else 0,
+    "somme": lambda termes: lambda variables: sum(terme(variables) for terme in termes),
+    "classer": _classer,
+}
+
+@lru_cache(maxsize=None)
+def regles():
+    """Règles compilées en fonctions scalaires (une fois par processus)"""
+    return compiler(lire_regles(), PRIMITIVES_SCALAIRES)
+
+def evaluer(nom, **variables):
+    """Valeur de la règle ``nom`` pour les mesures données"""
+    return regles()[nom](variables)
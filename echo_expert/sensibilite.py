@@ -0,0 +1,78 @@
+"""Cartes de sensibilité aux seuils : résultat d'une règle sur une grille de deux mesures.
+
+Deux mesures balayent toute la plage de leur slider (``examen.PLAGES``, au
+pas de saisie, ramené à ``POINTS`` valeurs au plus) ; les autres mesures lues
+par la règle sont fixées. La grille entière est évaluée en un appel des
+règles vectorisées, les deux axes étant diffusés l'un contre l'autre.
+
+Une carte est renvoyée sous forme de rectangles : sur chaque ligne de la
+grille, les cases consécutives de même résultat sont fusionnées. Les cartes
+de catégories étant constantes par morceaux, quelques centaines de
+rectangles remplacent les 40 000 cases d'une grille 200 × 200.
+"""
+
+import numpy as np
+
+from .examen import PLAGES, grille
+from .regles import classements_textuels, lire_regles, variables_requises
+from .vectoriel import regles_vect
+
+# Valeurs par axe au plus
+POINTS = 200
+
+def mesures_lues(regle):
+    """Mesures lues par la règle et par les règles dont elle dépend"""
+    return variables_requises(lire_regles(), regle)
+
+def mesures_balayables(regle):
+    """Mesures numériques lues par la règle, dans l'ordre de ``examen.PLAGES``"""
+    requises = mesures_lues(regle)
+    return [nom for nom in PLAGES if nom in requises]
+
+def axe(nom, points=POINTS):
+    """Valeurs balayées d'une mesure : grille du slider, sous-échantillonnée à ``points`` valeurs"""
+    valeurs = np.asarray(grille(nom))
+    if len(valeurs) > points:
+        valeurs = valeurs[np.linspace(0, len(valeurs) - 1, points).round().astype(np.intp)]
+    return valeurs
+
+def _bords(valeurs):
+    """Limites des cases centrées sur les valeurs (milieux entre valeurs voisines)"""
+    milieux = (valeurs[:-1] + valeurs[1:]) / 2
+    premier = valeurs[0] - (milieux[0] - valeurs[0]) if len(valeurs) > 1 else valeurs[0] - 0.5
+    dernier = valeurs[-1] + (valeurs[-1] - milieux[-1]) if len(valeurs) > 1 else valeurs[-1] + 0.5
+    return np.concatenate(([premier], milieux, [dernier]))
+
+def evaluer_grille(regle, axe_x, axe_y, fixes, points=POINTS):
+    """(valeurs x, valeurs y, résultats[len(y), len(x)]) de la règle, les autres mesures valant ``fixes``"""
+    x, y = axe(axe_x, points), axe(axe_y, points)
+    colonnes = dict(fixes)
+    colonnes[axe_x] = x[np.newaxis, :]
+    colonnes[axe_y] = y[:, np.newaxis]
+    return x, y, np.broadcast_to(regles_vect()[regle](colonnes), (len(y), len(x)))
+
+def carte_sensibilite(regle, axe_x, axe_y, fixes, points=POINTS):
+    """Rectangles de même résultat de la règle sur la grille ``axe_x`` × ``axe_y``.
+
+    Renvoie un dictionnaire de colonnes : ``x0``, ``x1``, ``y0``, ``y1``
+    (limites des rectangles dans les unités des mesures) et ``resultat``
+    (libellé d'un classement textuel, valeur sinon).
+    """
+    x, y, resultats = evaluer_grille(regle, axe_x, axe_y, fixes, points)
+    largeur = len(x)
+    debuts = np.ones(resultats.shape, dtype=np.bool_)
+    debuts[:, 1:] = resultats[:, 1:] != resultats[:, :-1]
+    debut = np.flatnonzero(debuts)
+    # chaque ligne commence une suite : une suite se termine avant la suivante
+    fin = np.append(debut[1:], resultats.size) - 1
+    bords_x, bords_y = _bords(x), _bords(y)
+    ligne = debut // largeur
+    valeurs = resultats.ravel()[debut]
+    libelles = classements_textuels(lire_regles()).get(regle)
+    return {
+        "x0": bords_x[debut % largeur],
+        "x1": bords_x[fin % largeur + 1],
+        "y0": bords_y[ligne],
+        "y1": bords_y[ligne + 1],
+        "resultat": np.asarray(libelles, dtype=object)[valeurs] if libelles is not None else valeurs,
+    }
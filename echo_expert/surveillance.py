@@ -0,0 +1,224 @@
+"""Surveillance des prothèses implantées : évaluation par patient et synthèse par modèle.
+
+Une table d'implants (une ligne par patient : position, marque, taille et
+mesures du dernier contrôle) est jointe au référentiel des prothèses par
+``ReferentielProtheses.joindre``. Chaque patient reçoit alors, par opérations
+vectorisées, le rapport EOA mesurée / EOA théorique, la classe de PPM
+(``calculer_ppm``), le score de thrombose (``evaluer_risque_thrombose``, la
+catégorie venant du référentiel) et la performance prothétique.
+
+La synthèse regroupe les patients par catégorie, par modèle ou par taille :
+le groupe d'un patient est lu sur la ligne du référentiel à laquelle il est
+joint, et chaque indicateur est une somme ``np.bincount`` par groupe.
+
+Les évaluations d'un fichier sont conservées dans un cache Parquet (une
+entrée par fichier d'implants, répertoire ``ECHO_EXPERT_CACHE``) avec une
+empreinte du fichier (taille, date de modification), des règles et du
+référentiel : elles ne sont recalculées que si l'un d'eux change.
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import vectoriel as v
+from .cohorte import _categories, lire_blocs
+from .referentiel import LIBELLES_POSITIONS, POSITIONS, charger_referentiel
+from .regles import CHEMIN_REGLES
+
+# Colonnes de la table d'implants. Facultatives : ``dvi`` (lue en aortique
+# seulement) et ``ttr`` (temps dans la cible INR, remplace l'INR s'il est connu)
+COLONNES_REQUISES = (
+    "patient_id", "type_general", "marque", "taille", "surface_corporelle",
+    "eoa_mesuree", "gradient_moyen", "fevg_prothese", "fa", "antecedent_te", "inr",
+)
+
+# Niveau de synthèse -> colonnes du référentiel qui définissent un groupe
+NIVEAUX = {
+    "categorie": ("position", "categorie"),
+    "marque": ("position", "categorie", "marque"),
+    "taille": ("position", "categorie", "marque", "taille"),
+}
+
+REPERTOIRE_CACHE = Path(os.environ.get("ECHO_EXPERT_CACHE", Path.home() / ".cache" / "echo_expert")) / "surveillance"
+
+TAILLE_BLOC = 500_000
+
+# ============================================================================
+# ÉVALUATION PAR PATIENT
+# ============================================================================
+
+def evaluer_implants(bloc):
+    """Évaluations de chaque implant d'un DataFrame de COLONNES_REQUISES.
+
+    Ajoute ``ligne_referentiel`` (-1 pour un modèle ou une taille absente du
+    référentiel, dont les évaluations sont alors manquantes), ``categorie``,
+    ``eoa_theorique``, ``ratio_eoa`` (%), ``eoai``, ``ppm``,
+    ``score_thrombose``, ``risque_thrombose`` et ``performance_prothese``.
+    ``type_general`` est ramené au libellé de l'interface (« aortique » ->
+    « Prothèse aortique »), le seul que lisent les règles de performance ;
+    une position inconnue n'a pas de performance.
+    """
+    manquantes = set(COLONNES_REQUISES) - set(bloc.columns)
+    if manquantes:
+        raise KeyError(f"Colonnes manquantes : {', '.join(sorted(manquantes))}")
+    codes, positions = pd.factorize(bloc["type_general"])
+    libelles = np.array([LIBELLES_POSITIONS.get(p, p) for p in positions.tolist()], dtype=object)
+    type_general = libelles[codes]
+    position_connue = np.isin(libelles, list(POSITIONS))[codes]
+    referentiel = charger_referentiel()
+    lignes = referentiel.joindre(type_general, bloc["marque"], bloc["taille"])
+    connues = lignes >= 0
+    ligne = np.where(connues, lignes, 0)
+
+    eoa_theorique = np.where(connues, referentiel.eoa[ligne], np.nan)
+    eoa_mesuree = bloc["eoa_mesuree"].to_numpy(dtype=np.float64)
+    categorie = np.where(connues, referentiel.categorie[ligne], "")
+    dvi = bloc["dvi"] if "dvi" in bloc else np.full(len(bloc), np.nan)
+
+    ppm, eoai = v.calculer_ppm_vect(eoa_mesuree, bloc["surface_corporelle"])
+    risque, score = v.evaluer_risque_thrombose_vect(
+        categorie, bloc["fevg_prothese"], bloc["fa"], bloc["antecedent_te"], bloc["inr"],
+        bloc["ttr"] if "ttr" in bloc else None,
+    )
+    performance = v.evaluer_performance_prothese_vect(type_general, bloc["gradient_moyen"], eoa_mesuree, dvi)
+    performance = np.where(position_connue, performance, -1)
+
+    # modèle absent du référentiel : catégorie inconnue, pas de risque de thrombose
+    # (le PPM et la performance ne lisent pas le référentiel)
+    risque = np.where(connues, risque, -1)
+    score = pd.array(score, dtype="UInt8")
+    score[~connues] = pd.NA
+    return bloc.assign(
+        type_general=type_general,
+        ligne_referentiel=lignes,
+        categorie=pd.Categorical(np.where(connues, categorie, None)),
+        eoa_theorique=eoa_theorique,
+        ratio_eoa=eoa_mesuree / eoa_theorique * 100,
+        eoai=eoai,
+        ppm=_categories(ppm, v.SEVERITES_PPM),
+        score_thrombose=score,
+        risque_thrombose=_categories(risque, v.RISQUES_THROMBOSE),
+        performance_prothese=_categories(performance, v.PERFORMANCES_PROTHESE),
+    )
+
+# ============================================================================
+# SYNTHÈSE PAR CATÉGORIE, MODÈLE OU TAILLE
+# ============================================================================
+
+# Indicateur -> (colonne évaluée, valeur comptée ; None pour une moyenne de la colonne)
+INDICATEURS = {
+    "ratio_eoa_moyen": ("ratio_eoa", None),
+    "eoai_moyen": ("eoai", None),
+    "taux_ppm_modere": ("ppm", "modere"),
+    "taux_ppm_severe": ("ppm", "severe"),
+    "taux_dysfonction_moderee": ("performance_prothese", "Dysfonction modérée"),
+    "taux_dysfonction_severe": ("performance_prothese", "Dysfonction sévère"),
+    "score_thrombose_moyen": ("score_thrombose", None),
+    "taux_risque_thrombose_eleve": ("risque_thrombose", "eleve"),
+}
+
+@lru_cache(maxsize=None)
+def _groupes_referentiel(niveau):
+    """(groupe de chaque ligne du référentiel, colonnes décrivant chaque groupe)"""
+    referentiel = charger_referentiel()
+    colonnes = NIVEAUX[niveau]
+    cles = list(zip(*(getattr(referentiel, nom).tolist() for nom in colonnes)))
+    uniques = sorted(set(cles))
+    numeros = {cle: rang for rang, cle in enumerate(uniques)}
+    groupes = np.array([numeros[cle] for cle in cles], dtype=np.intp)
+    return groupes, {nom: [cle[i] for cle in uniques] for i, nom in enumerate(colonnes)}
+
+def synthese(evaluations, niveau="marque"):
+    """Indicateurs agrégés par groupe du niveau ``niveau`` (voir NIVEAUX), un groupe par ligne.
+
+    Les patients joints à aucune ligne du référentiel sont exclus (leur
+    nombre est dans ``synthese.attrs["non_references"]``). Les taux et
+    moyennes ignorent les valeurs manquantes ; les groupes sans implant ne
+    sont pas listés.
+    """
+    groupes_lignes, description = _groupes_referentiel(niveau)
+    lignes = evaluations["ligne_referentiel"].to_numpy()
+    connues = lignes >= 0
+    groupe = groupes_lignes[lignes[connues]]
+    nombre = len(description[NIVEAUX[niveau][0]])
+
+    resultat = dict(description)
+    resultat["implants"] = np.bincount(groupe, minlength=nombre)
+    for indicateur, (colonne, valeur) in INDICATEURS.items():
+        serie = evaluations[colonne]
+        if valeur is None:
+            valeurs = serie.to_numpy(dtype=np.float64, na_value=np.nan)[connues]
+            presentes = ~np.isnan(valeurs)
+        else:
+            # colonnes catégorielles : comparaison des codes, -1 pour une valeur manquante
+            codes = serie.cat.codes.to_numpy()[connues]
+            valeurs = (codes == serie.cat.categories.get_loc(valeur)).astype(np.float64)
+            presentes = codes >= 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            resultat[indicateur] = (
+                np.bincount(groupe[presentes], valeurs[presentes], nombre)
+                / np.bincount(groupe[presentes], minlength=nombre)
+            )
+    tableau = pd.DataFrame(resultat)
+    tableau = tableau[tableau["implants"] > 0].reset_index(drop=True)
+    tableau.attrs["non_references"] = int(np.count_nonzero(~connues))
+    return tableau
+
+# ============================================================================
+# FICHIERS D'IMPLANTS : ÉVALUATIONS EN CACHE
+# ============================================================================
+
+def empreinte_fichier(chemin):
+    """Empreinte du fichier d'implants (chemin, taille, date de modification), des règles et du référentiel"""
+    etat = os.stat(chemin)
+    h = hashlib.sha256(repr((str(Path(chemin).resolve()), etat.st_size, etat.st_mtime_ns)).encode())
+    h.update(Path(CHEMIN_REGLES).read_bytes())
+    h.update(Path(__file__).with_name("protheses.py").read_bytes())
+    return h.hexdigest()
+
+def _chemin_cache(chemin, repertoire):
+    nom = hashlib.sha256(str(Path(chemin).resolve()).encode()).hexdigest()[:16]
+    return Path(repertoire) / f"{nom}.parquet"
+
+def _lire_cache(chemin_cache, signature):
+    import pyarrow.parquet as pq
+
+    try:
+        if pq.read_schema(chemin_cache).metadata.get(b"empreinte") != signature.encode():
+            return None
+        return pq.read_table(chemin_cache).to_pandas()
+    except (OSError, AttributeError, ValueError):
+        return None
+
+def _ecrire_cache(evaluations, chemin_cache, signature):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(evaluations, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"empreinte": signature.encode()})
+    chemin_cache.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = chemin_cache.with_name(f"{chemin_cache.stem}.{os.getpid()}.tmp.parquet")
+    pq.write_table(table, temporaire)
+    os.replace(temporaire, chemin_cache)
+
+def evaluer_fichier_implants(chemin, repertoire_cache=None, taille_bloc=TAILLE_BLOC):
+    """(évaluations par patient, lues depuis le cache ?) pour un fichier d'implants CSV ou Parquet.
+
+    Un répertoire de cache non inscriptible n'empêche pas le calcul.
+    """
+    signature = empreinte_fichier(chemin)
+    chemin_cache = _chemin_cache(chemin, repertoire_cache or REPERTOIRE_CACHE)
+    evaluations = _lire_cache(chemin_cache, signature)
+    if evaluations is not None:
+        return evaluations, True
+    evaluations = pd.concat([evaluer_implants(bloc) for bloc in lire_blocs(chemin, taille_bloc)], ignore_index=True)
+    try:
+        _ecrire_cache(evaluations, chemin_cache, signature)
+    except OSError:
+        pass
+    return evaluations, False
@@ -0,0 +1,215 @@
+"""Tendances longitudinales des prothèses : pente et rupture par patient et par mesure.
+
+Pour chaque patient et chaque mesure suivie (gradient moyen, EOA), deux
+statistiques résument tout l'historique :
+
+- la pente de la régression linéaire de la mesure sur le temps (par an),
+  calculée dès ``MIN_EXAMENS_PENTE`` examens ;
+- une alarme de rupture (CUSUM) : l'aggravation de chaque examen par rapport
+  à la moyenne des examens précédents, en écarts-types d'erreur de mesure
+  (``incertitude.ERREURS_MESURE``), est cumulée au-delà d'une marge
+  ``CUSUM_MARGE`` ; l'alarme est levée au-delà de ``CUSUM_SEUIL``.
+
+Deux calculs donnent les mêmes statistiques :
+
+- ``SuiviPatient`` : moyennes et co-moments courants (Welford) et somme
+  CUSUM, mis à jour en O(1) à chaque nouvel examen sans relire l'historique ;
+- ``tendances_registre`` : tout un registre en une passe vectorisée groupée
+  par patient (sommes par ``np.bincount``, CUSUM déroulé par rang d'examen,
+  tous les patients à la fois).
+
+Les seuils de pente du classement ``tendance_prothese`` sont dans
+``regles.toml``.
+"""
+
+import math
+from datetime import date
+
+import numpy as np
+
+from .incertitude import ERREURS_MESURE
+from .regles import classements_textuels, evaluer, lire_regles
+from .vectoriel import regles_vect
+
+# Mesure suivie -> (suffixe des variables de tendance, sens de l'aggravation)
+SUIVIS = {"gradient_moyen": ("gradient", 1), "eoa_mesuree": ("eoa", -1)}
+
+MIN_EXAMENS_PENTE = 4
+
+# Paramètres du CUSUM, en écarts-types d'erreur de mesure
+CUSUM_MARGE = 0.5
+CUSUM_SEUIL = 4.0
+
+_ORIGINE = date(1970, 1, 1)
+JOURS_PAR_AN = 365.25
+
+def annees(jour):
+    """Date en années depuis 1970 (même origine que les dates NumPy)"""
+    return (jour - _ORIGINE).days / JOURS_PAR_AN
+
+# ============================================================================
+# SUIVI INCRÉMENTAL D'UN PATIENT
+# ============================================================================
+
+class SuiviMesure:
+    """Statistiques courantes d'une mesure : régression sur le temps et CUSUM"""
+
+    __slots__ = ("sens", "sigma", "n", "somme", "moyenne_t", "moyenne", "c_tt", "c_ty", "cusum")
+
+    def __init__(self, nom):
+        self.sens = SUIVIS[nom][1]
+        self.sigma = ERREURS_MESURE[nom]
+        self.n = 0
+        self.somme = self.moyenne_t = self.moyenne = self.c_tt = self.c_ty = self.cusum = 0.0
+
+    def ajouter(self, t, valeur):
+        """Ajoute un examen à la date ``t`` (années) ; une valeur None ou NaN est ignorée"""
+        if valeur is None or valeur != valeur:
+            return
+        if self.n:
+            # moyenne des examens précédents par leur somme : mêmes opérations que _cusum,
+            # l'alarme ne dépend pas du calcul aux seuils près
+            ecart = self.sens * (valeur - self.somme / self.n) / self.sigma
+            self.cusum = max(0.0, self.cusum + ecart - CUSUM_MARGE)
+        self.somme += valeur
+        self.n += 1
+        ecart_t = t - self.moyenne_t
+        self.moyenne_t += ecart_t / self.n
+        self.moyenne += (valeur - self.moyenne) / self.n
+        self.c_tt += ecart_t * (t - self.moyenne_t)
+        self.c_ty += ecart_t * (valeur - self.moyenne)
+
+    def copie(self):
+        copie = SuiviMesure.__new__(SuiviMesure)
+        for attribut in self.__slots__:
+            setattr(copie, attribut, getattr(self, attribut))
+        return copie
+
+    @property
+    def pente(self):
+        """Pente de la régression (unité de la mesure par an), NaN avant MIN_EXAMENS_PENTE examens"""
+        return self.c_ty / self.c_tt if self.n >= MIN_EXAMENS_PENTE and self.c_tt > 0 else math.nan
+
+    @property
+    def rupture(self):
+        return self.cusum > CUSUM_SEUIL
+
+class SuiviPatient:
+    """Suivi des mesures de SUIVIS pour un patient, examen par examen"""
+
+    def __init__(self):
+        self.mesures = {nom: SuiviMesure(nom) for nom in SUIVIS}
+
+    @classmethod
+    def depuis_examens(cls, examens):
+        """Suivi construit à partir des examens de prothèse d'un historique (``Historique.examens``)"""
+        suivi = cls()
+        for examen in examens:
+            if examen["prothese"] is not None:
+                suivi.ajouter(examen["date_examen"], examen["fiche"])
+        return suivi
+
+    def ajouter(self, jour, mesures):
+        """Ajoute l'examen du jour ``jour`` (mesures : nom -> valeur, les mesures absentes sont ignorées)"""
+        t = annees(jour)
+        for nom, suivi in self.mesures.items():
+            suivi.ajouter(t, mesures.get(nom))
+
+    def copie(self):
+        copie = SuiviPatient.__new__(SuiviPatient)
+        copie.mesures = {nom: suivi.copie() for nom, suivi in self.mesures.items()}
+        return copie
+
+    @property
+    def examens(self):
+        return max(suivi.n for suivi in self.mesures.values())
+
+    def variables(self):
+        """Variables du classement ``tendance_prothese`` : pente_<suffixe>, rupture_<suffixe>"""
+        variables = {}
+        for nom, (suffixe, _) in SUIVIS.items():
+            variables[f"pente_{suffixe}"] = self.mesures[nom].pente
+            variables[f"rupture_{suffixe}"] = self.mesures[nom].rupture
+        return variables
+
+    def tendance(self):
+        return evaluer("tendance_prothese", **self.variables())
+
+# ============================================================================
+# REGISTRE COMPLET : GROUPEMENT VECTORISÉ PAR PATIENT
+# ============================================================================
+
+def _cusum(groupes, valeurs, nombre, sens, sigma):
+    """Somme CUSUM finale de chaque groupe (lignes triées par groupe puis par date)"""
+    premiers = np.ones(len(groupes), dtype=np.bool_)
+    premiers[1:] = groupes[1:] != groupes[:-1]
+    positions = np.arange(len(groupes))
+    rangs = positions - np.maximum.accumulate(np.where(premiers, positions, 0))
+    # lignes par rang d'examen : chaque patient apparaît au plus une fois par rang
+    ordre = np.argsort(rangs, kind="stable")
+    bornes = np.cumsum(np.bincount(rangs))
+    sommes = np.zeros(nombre)
+    cusum = np.zeros(nombre)
+    debut = 0
+    for rang, fin in enumerate(bornes.tolist()):
+        lignes = ordre[debut:fin]
+        groupe, valeur = groupes[lignes], valeurs[lignes]
+        if rang:
+            ecart = sens * (valeur - sommes[groupe] / rang) / sigma
+            cusum[groupe] = np.maximum(cusum[groupe] + ecart - CUSUM_MARGE, 0.0)
+        sommes[groupe] += valeur
+        debut = fin
+    return cusum
+
+def tendances_registre(patients, dates, mesures):
+    """Statistiques de tendance de chaque patient d'un registre, en une passe vectorisée.
+
+    ``patients`` et ``dates`` (dates ou chaînes ISO) sont des colonnes d'une
+    ligne par examen, dans un ordre quelconque ; ``mesures`` associe chaque
+    mesure de SUIVIS à sa colonne (NaN ou None si non mesurée). Renvoie un
+    dictionnaire de colonnes, une ligne par patient : ``patient_id``,
+    ``examens``, ``pente_<suffixe>``, ``rupture_<suffixe>`` et ``tendance``.
+    """
+    patients = np.asarray(patients)
+    t = np.asarray(dates, dtype="datetime64[D]").astype(np.int64) / JOURS_PAR_AN
+    ordre = np.lexsort((t, patients))
+    patients, t = patients[ordre], t[ordre]
+    debuts = np.ones(len(patients), dtype=np.bool_)
+    debuts[1:] = patients[1:] != patients[:-1]
+    groupes = np.cumsum(debuts) - 1
+    nombre = int(np.count_nonzero(debuts))
+    colonnes = {"patient_id": patients[debuts], "examens": np.bincount(groupes, minlength=nombre)}
+
+    for nom, (suffixe, sens) in SUIVIS.items():
+        valeurs = np.asarray(mesures[nom], dtype=np.float64)[ordre]
+        valides = ~np.isnan(valeurs)
+        groupe, tv, yv = groupes[valides], t[valides], valeurs[valides]
+        n = np.bincount(groupe, minlength=nombre)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            moyenne_t = np.bincount(groupe, tv, nombre) / n
+            moyenne = np.bincount(groupe, yv, nombre) / n
+            centre_t = tv - moyenne_t[groupe]
+            c_tt = np.bincount(groupe, centre_t * centre_t, nombre)
+            c_ty = np.bincount(groupe, centre_t * (yv - moyenne[groupe]), nombre)
+            colonnes[f"pente_{suffixe}"] = np.where((n >= MIN_EXAMENS_PENTE) & (c_tt > 0), c_ty / c_tt, np.nan)
+        colonnes[f"rupture_{suffixe}"] = _cusum(groupe, yv, nombre, sens, ERREURS_MESURE[nom]) > CUSUM_SEUIL
+
+    codes = regles_vect()["tendance_prothese"](dict(colonnes))
+    libelles = np.asarray(classements_textuels(lire_regles())["tendance_prothese"], dtype=object)
+    colonnes["tendance"] = libelles[np.broadcast_to(codes, (nombre,))]
+    return colonnes
+
+def tendances_historique(historique):
+    """``tendances_registre`` sur tous les examens de prothèse d'un ``Historique``"""
+    lignes = historique.series_protheses(tuple(SUIVIS))
+    if not lignes:
+        return tendances_registre([], [], {nom: [] for nom in SUIVIS})
+    patients, dates, *valeurs = zip(*lignes)
+    mesures = {nom: np.array(colonne, dtype=np.float64) for nom, colonne in zip(SUIVIS, valeurs)}
+    return tendances_registre(patients, dates, mesures)
+
+def aggravations(colonnes):
+    """Lignes des patients en aggravation, pente du gradient décroissante (pentes inconnues en dernier)"""
+    lignes = np.flatnonzero(colonnes["tendance"] == "aggravation")
+    lignes = lignes[np.argsort(-np.nan_to_num(colonnes["pente_gradient"][lignes], nan=-np.inf), kind="stable")]
+    return {nom: colonne[lignes] for nom, colonne in colonnes.items()}
@@ -0,0 +1,290 @@
+"""Versions vectorisées (NumPy) des évaluations échocardiographiques.
+
+Chaque fonction prend des colonnes (tableaux ou listes) et renvoie des codes de
+catégorie en tableaux NumPy. Les codes sont les indices dans les tuples de
+libellés ci-dessous, qui reprennent les valeurs renvoyées par les fonctions
+scalaires de ``evaluations``.
+
+Les évaluations PRVG, diastolique, HTAP, péricardique et prothétique sont
+compilées à partir de ``regles.toml`` avec des masques NumPy
+(``regles_vect``) ; une mesure NaN ne satisfait aucune condition.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .evaluations import SEUIL_TTR
+from .regles import OPERATEURS, compiler, compiler_versions, lire_regles, resultats_classement
+
+# ============================================================================
+# CODES DE CATÉGORIE
+# ============================================================================
+
+def _codes_classement(nom):
+    return resultats_classement(lire_regles()["classements"][nom])
+
+CATEGORIES_PRVG = _codes_classement("categorie_prvg")
+PATTERNS_DIASTOLIQUES = _codes_classement("pattern_diastolique")
+PROBABILITES_HTAP = _codes_classement("probabilite_htap")
+DIAGNOSTICS_PERICARDIQUES = _codes_classement("diagnostic_pericardique")
+SEVERITES_PPM = ("severe", "modere", "absent")
+RISQUES_THROMBOSE = ("eleve", "modere", "faible")
+PERFORMANCES_PROTHESE = _codes_classement("performance_prothese")
+SANS_OBJET = 255
+
+# ============================================================================
+# OUTILS
+# ============================================================================
+
+def _colonne(valeurs):
+    """Convertit une colonne en tableau NumPy, les flottants réduits étant promus en float64.
+
+    La promotion garantit les mêmes comparaisons aux seuils que les fonctions
+    scalaires appelées sur ``float(valeur)``.
+    """
+    tableau = np.asarray(valeurs)
+    if tableau.dtype.kind == "f" and tableau.dtype != np.float64:
+        tableau = tableau.astype(np.float64)
+    return tableau
+
+def _fevg_preservee(fevg):
+    """Masque FE VG ≥ 50% à partir d'une colonne booléenne, de libellés ("≥50%", ...) ou de FE VG en %.
+
+    Une FE VG numérique est classée comme par ``examen.classe_fevg`` (une
+    valeur NaN n'est pas préservée). Toute autre colonne lève TypeError :
+    comparée au libellé, elle classerait chaque ligne en FE VG réduite.
+    """
+    if not hasattr(fevg, "dtype"):
+        fevg = np.asarray(fevg)
+    genre = fevg.dtype.kind
+    if genre == "b":
+        return np.asarray(fevg, dtype=np.bool_)
+    if genre in "iuf":
+        return np.asarray(_colonne(fevg) >= 50, dtype=np.bool_)
+    if genre in "OUS":
+        return _egal(fevg, "≥50%")
+    raise TypeError(f"Colonne fevg de type {fevg.dtype} : libellés, booléens ou FE VG en % attendus")
+
+def _egal(colonne, libelle):
+    """Masque d'égalité d'une colonne de libellés.
+
+    Les colonnes qui ont leur propre comparaison vectorisée (tableaux NumPy,
+    séries pandas de chaînes Arrow) sont comparées directement, sans passer
+    par un tableau d'objets Python.
+    """
+    if not hasattr(colonne, "dtype"):
+        colonne = np.asarray(colonne)
+    return np.asarray(colonne == libelle, dtype=np.bool_)
+
+def _contient(colonne, motif):
+    """Masque des libellés contenant le motif (équivalent de ``motif in libelle``)"""
+    if hasattr(colonne, "str"):
+        return np.asarray(colonne.str.contains(motif, regex=False), dtype=np.bool_)
+    return np.char.find(np.asarray(colonne).astype(str), motif) >= 0
+
+def _u8(masque):
+    """Masque booléen vu comme entiers 0/1"""
+    return np.asarray(masque, dtype=np.bool_).view(np.uint8)
+
+# ============================================================================
+# RÈGLES COMPILÉES EN MASQUES
+# ============================================================================
+
+def _comparer(gauche, fonction, droite, litteral, codes):
+    if litteral and codes is not None:
+        # classement textuel : comparaison de ses codes
+        code = np.uint8(codes.index(droite))
+        return lambda variables: fonction(gauche(variables), code)
+    if litteral and isinstance(droite, str):
+        if fonction not in (_EGAL, _DIFFERENT):
+            raise ValueError(f"Comparaison d'ordre avec un libellé : {droite!r}")
+        if fonction is _EGAL:
+            return lambda variables: _egal(gauche(variables), droite)
+        return lambda variables: ~_egal(gauche(variables), droite)
+    if litteral:
+        return lambda variables: fonction(_colonne(gauche(variables)), droite)
+    return lambda variables: fonction(_colonne(gauche(variables)), _colonne(droite(variables)))
+
+def _cumuler(termes, fonction, dtype):
+    """Combine les termes (masques ou points) par ``fonction`` en place, avec diffusion des formes"""
+    def cumuler(variables):
+        valeurs = [terme(variables) for terme in termes]
+        total = np.empty(np.broadcast(*valeurs).shape, dtype=dtype)
+        total[...] = valeurs[0]
+        for valeur in valeurs[1:]:
+            fonction(total, valeur, out=total)
+        return total
+    return cumuler
+
+def _classer(cas, defaut, codes):
+    """Codes (classement textuel, indices dans ``codes``) ou valeurs numériques du premier cas vérifié.
+
+    Sortie = défaut + somme des écarts (modulo 256) des cas retenus : un seul
+    cas est retenu par ligne, le premier dont la condition est vérifiée.
+    """
+    code = (lambda resultat: codes.index(resultat)) if codes is not None else (lambda resultat: resultat)
+    defaut = code(defaut)
+    ecarts = [(condition, np.uint8((code(resultat) - defaut) % 256)) for condition, resultat in cas]
+    defaut = np.uint8(defaut)
+    def classer(variables):
+        sortie = reste = None
+        for condition, ecart in ecarts:
+            masque = np.asarray(condition(variables), dtype=np.bool_)
+            if reste is None:
+                retenu, reste = masque, np.logical_not(masque, out=np.empty(masque.shape, dtype=np.bool_))
+            else:
+                retenu = np.asarray(masque & reste)
+                reste = _en_place(np.logical_and, reste, ~masque)
+            increment = retenu.view(np.uint8) if ecart == 1 else retenu.view(np.uint8) * ecart
+            if sortie is None:
+                sortie = np.add(increment, defaut, out=np.empty(np.shape(increment), dtype=np.uint8))
+            else:
+                sortie = _en_place(np.add, sortie, increment)
+        return sortie
+    return classer
+
+def _en_place(fonction, total, valeur):
+    """``fonction(total, valeur)``, calculé dans ``total`` lorsque le résultat a sa forme"""
+    if np.broadcast_shapes(total.shape, np.shape(valeur)) == total.shape:
+        return fonction(total, valeur, out=total)
+    return fonction(total, valeur)
+
+def _points(condition, points):
+    if points == 1:
+        return lambda variables: _u8(condition(variables))
+    return lambda variables: _u8(condition(variables)) * np.uint8(points)
+
+_EGAL = OPERATEURS["=="]
+_DIFFERENT = OPERATEURS["!="]
+
+PRIMITIVES_VECT = {
+    "comparer": _comparer,
+    "tous": lambda conditions: _cumuler(conditions, np.logical_and, np.bool_),
+    "un_parmi": lambda conditions: _cumuler(conditions, np.logical_or, np.bool_),
+    "non": lambda condition: lambda variables: ~np.asarray(condition(variables), dtype=np.bool_),
+    "points": _points,
+    "somme": lambda termes: _cumuler(termes, np.add, np.uint8),
+    "classer": _classer,
+}
+
+@lru_cache(maxsize=None)
+def regles_vect():
+    """Règles compilées en évaluateurs de masques NumPy (une fois par processus)"""
+    return compiler(lire_regles(), PRIMITIVES_VECT)
+
+def regles_versions_vect(versions):
+    """Règles de plusieurs versions compilées en masques, les règles communes étant partagées"""
+    return compiler_versions(versions, PRIMITIVES_VECT)
+
+# ============================================================================
+# ÉVALUATIONS VECTORISÉES
+# ============================================================================
+
+def _evaluer(noms, **colonnes):
+    """Règles ``noms`` évaluées sur les colonnes (les règles intermédiaires sont partagées)"""
+    r = regles_vect()
+    return [r[nom](colonnes) for nom in noms]
+
+def evaluer_prvg_fevg_preservee_vect(e_e_prime, volume_og, tr_vitesse):
+    """Catégorie PRVG (codes CATEGORIES_PRVG) et nombre de critères secondaires, FE VG ≥ 50%"""
+    return tuple(_evaluer(
+        ("categorie_prvg", "criteres_secondaires"), e_e_prime=e_e_prime, volume_og=volume_og, tr_vitesse=tr_vitesse,
+    ))
+
+def evaluer_pattern_diastolique_vect(e_a_ratio, dt, e_vitesse):
+    """Pattern diastolique (codes PATTERNS_DIASTOLIQUES)"""
+    return _evaluer(("pattern_diastolique",), e_a_ratio=e_a_ratio, dt=dt, e_vitesse=e_vitesse)[0]
+
+def evaluer_dysfonction_diastolique_complete_vect(e_a_ratio, e_e_prime, volume_og, tr_vitesse, dt, e_vitesse, fevg):
+    """Évaluation diastolique complète par ligne selon la catégorie de FE VG.
+
+    Renvoie un dictionnaire de tableaux : ``categorie_prvg`` et
+    ``criteres_secondaires`` (lignes FE VG ≥ 50%), ``pattern`` (autres lignes)
+    et ``grade`` (0 à 3, toutes lignes). Les cases non applicables valent SANS_OBJET.
+    """
+    preservee = _fevg_preservee(fevg)
+    categorie, criteres, pattern, grade = _evaluer(
+        ("categorie_prvg", "criteres_secondaires", "pattern_diastolique", "grade_diastolique"),
+        e_a_ratio=e_a_ratio, e_e_prime=e_e_prime, volume_og=volume_og, tr_vitesse=tr_vitesse,
+        dt=dt, e_vitesse=e_vitesse, fevg_preservee=preservee,
+    )
+    return {
+        "categorie_prvg": np.where(preservee, categorie, SANS_OBJET).astype(np.uint8),
+        "criteres_secondaires": np.where(preservee, criteres, SANS_OBJET).astype(np.uint8),
+        "pattern": np.where(preservee, SANS_OBJET, pattern).astype(np.uint8),
+        "grade": grade,
+    }
+
+def evaluer_grade_diastolique_vect(e_a_ratio, e_e_prime, volume_og, tr_vitesse, dt, e_vitesse, fevg):
+    """Grade de dysfonction diastolique (0 à 3), comme evaluer_grade_diastolique"""
+    return _evaluer(
+        ("grade_diastolique",), e_a_ratio=e_a_ratio, e_e_prime=e_e_prime, volume_og=volume_og,
+        tr_vitesse=tr_vitesse, dt=dt, e_vitesse=e_vitesse, fevg_preservee=_fevg_preservee(fevg),
+    )[0]
+
+def calculer_probabilite_htap_vect(tr_vitesse, vc_diametre, vc_collapsus, rv_ra_ratio, septum_paradoxal):
+    """Score de probabilité HTAP ESC 2022, comme calculer_probabilite_htap"""
+    return _evaluer(
+        ("score_htap",), tr_vitesse=tr_vitesse, vc_diametre=vc_diametre, vc_collapsus=vc_collapsus,
+        rv_ra_ratio=rv_ra_ratio, septum_paradoxal=septum_paradoxal,
+    )[0]
+
+def calculer_score_secondaire_htap_vect(tapse, s_tricuspide, fac_vd, acceleration_time, pvr_estimee):
+    """Score secondaire HTAP (0 à 5), comme calculer_score_secondaire_htap"""
+    return _evaluer(
+        ("score_secondaire_htap",), tapse=tapse, s_tricuspide=s_tricuspide, fac_vd=fac_vd,
+        acceleration_time=acceleration_time, pvr_estimee=pvr_estimee,
+    )[0]
+
+def classer_probabilite_htap_vect(score_htap, score_secondaire):
+    """Probabilité HTAP (codes PROBABILITES_HTAP), comme classer_probabilite_htap"""
+    return _evaluer(("probabilite_htap",), score_htap=score_htap, score_secondaire_htap=score_secondaire)[0]
+
+def evaluer_constrictive_restrictive_vect(variation_respiratoire, septal_bounce, annulus_reverse, fonction_vg, strain_longitudinal):
+    """Scores constriction et restrictif, comme evaluer_constrictive_restrictive"""
+    return tuple(_evaluer(
+        ("score_constriction", "score_restrictif"), variation_respiratoire=variation_respiratoire,
+        septal_bounce=septal_bounce, annulus_reverse=annulus_reverse, fonction_vg=fonction_vg,
+        strain_longitudinal=strain_longitudinal,
+    ))
+
+def classer_constrictive_restrictive_vect(score_constriction, score_restrictif):
+    """Diagnostic différentiel (codes DIAGNOSTICS_PERICARDIQUES)"""
+    return _evaluer(
+        ("diagnostic_pericardique",), score_constriction=score_constriction, score_restrictif=score_restrictif,
+    )[0]
+
+def calculer_ppm_vect(eoa_mesuree, surface_corporelle):
+    """Patient-Prothèse Mismatch (codes SEVERITES_PPM) et EOAi, comme calculer_ppm"""
+    eoai = _colonne(eoa_mesuree) / _colonne(surface_corporelle)
+    codes = np.where(eoai < 0.65, 0, np.where(eoai < 0.85, 1, 2)).astype(np.uint8)
+    return codes, eoai
+
+def evaluer_risque_thrombose_vect(categorie, fevg, fa, antecedent_te, inr, ttr=None):
+    """Risque de thrombose (codes RISQUES_THROMBOSE) et score, comme evaluer_risque_thrombose.
+
+    ``ttr`` (facultatif) remplace l'INR sur les lignes où il n'est pas NaN.
+    """
+    score = _u8(_contient(categorie, "Mécanique")) * np.uint8(2)
+    score += _u8(_colonne(fevg) < 40)
+    score += _u8(np.asarray(fa).astype(bool))
+    score += _u8(np.asarray(antecedent_te).astype(bool)) * np.uint8(2)
+    anticoagulation_insuffisante = _colonne(inr) < 2.0
+    if ttr is not None:
+        ttr = np.asarray(ttr, dtype=np.float64)
+        anticoagulation_insuffisante = np.where(np.isnan(ttr), anticoagulation_insuffisante, ttr < SEUIL_TTR)
+    score += _u8(anticoagulation_insuffisante) * np.uint8(2)
+    codes = np.where(score >= 5, 0, np.where(score >= 3, 1, 2)).astype(np.uint8)
+    return codes, score
+
+def evaluer_performance_prothese_vect(type_general, gradient_moyen, eoa_mesuree, dvi):
+    """Performance prothétique (codes PERFORMANCES_PROTHESE), comme evaluer_performance_prothese.
+
+    ``dvi`` n'est lu que pour les prothèses aortiques ; une valeur NaN ne
+    satisfait aucun critère.
+    """
+    return _evaluer(
+        ("performance_prothese",), type_general=type_general, gradient_moyen=gradient_moyen,
+        eoa_mesuree=eoa_mesuree, dvi=dvi,
+    )[0]
@@ -0,0 +1,1591 @@
+"""Pages de l'interface Streamlit.
+
+Chaque page d'évaluation est un fragment Streamlit : déplacer un slider ne
+réexécute que la page concernée, sans renvoyer le CSS, la barre latérale ni
+l'en-tête. En mode « saisie groupée », les champs d'une page sont réunis
+dans un formulaire et évalués une seule fois à la validation. En mode
+« incertitude », la carte de résultat est complétée par la probabilité de
+chaque catégorie sous l'erreur de mesure (``echo_expert.incertitude``). Les
+examens sont enregistrés dans l'historique du patient
+(``echo_expert.historique``) sur le bouton « Enregistrer l'examen », jamais
+au simple rendu d'une page, par un fil d'écriture hors du rerun ; les
+rapports demandés sont rendus par une file de fond (``echo_expert.rapports``)
+et le rerun ne fait que suivre leur état. La
+page « Sensibilité aux seuils » dessine la carte des catégories d'une
+évaluation sur deux mesures ; la carte est mémoïsée par les seules mesures
+fixées, déplacer l'examen sur les axes ne redessine que son point. Les
+ressources statiques (CSS, cartes de l'accueil, tableaux de référence) sont
+construites une fois par processus.
+"""
+
+import math
+import re
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+import pandas as pd
+import pyarrow as pa
+import altair as alt
+
+from echo_expert import (
+    evaluer_prvg_fevg_preservee,
+    evaluer_pattern_diastolique,
+    calculer_ppm,
+    evaluer_risque_thrombose,
+    calculer_probabilite_htap,
+    evaluer_constrictive_restrictive,
+    evaluer_dysfonction_diastolique_complete,
+    classer_prvg,
+    evaluer_grade_diastolique,
+    calculer_score_secondaire_htap,
+    classer_probabilite_htap,
+    classer_constrictive_restrictive,
+    evaluer_performance_prothese,
+    evaluer_evolution_gradient,
+    evaluer_repere,
+    protheses_aortiques,
+    protheses_mitrales,
+)
+from echo_expert.examen import PLAGES, CHOIX, valeurs_par_defaut, classe_fevg, evaluer_examen
+from echo_expert.historique import Historique, valeurs_anterieures
+from echo_expert.tendances import MIN_EXAMENS_PENTE, SuiviPatient
+from echo_expert.rappels import Planning
+from echo_expert.inr import CIBLES_INR, ttr_patient
+from echo_expert.rapports import (
+    COULEURS_ALERTE,
+    LIBELLES_CONTROLE,
+    VERDICTS_GRADE,
+    VERDICTS_HTAP,
+    VERDICTS_PATTERN,
+    VERDICTS_PERFORMANCE,
+    VERDICTS_PERICARDE,
+    VERDICTS_PRVG,
+    FileRapports,
+    cles_liste_de_travail,
+    generer_archive,
+    nom_rapport,
+    rapport_examen,
+    verdicts_examen,
+)
+from echo_expert.incertitude import TIRAGES, probabilites
+from echo_expert.memoisation import memoiser, statistiques
+from echo_expert.referentiel import charger_referentiel
+from echo_expert.regles import evaluer
+from echo_expert.sensibilite import carte_sensibilite, mesures_balayables, mesures_lues
+from echo_expert.dimensionnement import tableau_recommandations
+from echo_expert.identification import identifier_prothese
+
+FICHIER_STYLE = Path(__file__).parent / "assets" / "style.css"
+
+# Valeurs par défaut du schéma, affichées tant qu'une mesure n'est pas saisie
+VALEURS_PAR_DEFAUT = valeurs_par_defaut()
+
+# ============================================================================
+# SAISIE : FICHE D'EXAMEN PARTAGÉE ET MODE DE SAISIE
+# ============================================================================
+
+def fiche_session():
+    """Fiche de mesures de l'examen en cours, commune à toutes les pages"""
+    if "fiche_examen" not in st.session_state:
+        st.session_state["fiche_examen"] = valeurs_par_defaut()
+    return st.session_state["fiche_examen"]
+
+def mesures_saisies():
+    """Mesures saisies par l'utilisateur ou reprises de l'examen précédent du patient"""
+    return st.session_state.setdefault("mesures_saisies", set())
+
+def mesure(libelle, nom, minimum=None, maximum=None, defaut=None):
+    """Widget lié à la mesure ``nom`` de la fiche d'examen.
+
+    Le type de widget et la plage viennent du schéma de ``echo_expert.examen`` ;
+    ``minimum``/``maximum`` restreignent la plage pour une page et ``defaut``
+    remplace la valeur par défaut du schéma. La clé ``mesure_<nom>`` est la
+    même sur toutes les pages : une fois saisie, une valeur est retrouvée sur
+    les autres (la plage d'une page est alors élargie pour la contenir, la
+    fiche n'est jamais tronquée) ; tant qu'elle ne l'est pas, chaque page
+    affiche sa propre valeur par défaut.
+    """
+    fiche = fiche_session()
+    cle = f"mesure_{nom}"
+    saisies = mesures_saisies()
+    if cle in st.session_state and st.session_state[cle] != fiche[nom]:
+        saisies.add(nom)
+    if nom in saisies:
+        valeur = st.session_state.get(cle, fiche[nom])
+    else:
+        valeur = VALEURS_PAR_DEFAUT[nom] if defaut is None else defaut
+    st.session_state[cle] = valeur
+    if nom in PLAGES:
+        bas, haut, _, pas = PLAGES[nom]
+        bas = min(bas if minimum is None else minimum, valeur)
+        haut = max(haut if maximum is None else maximum, valeur)
+        if isinstance(valeur, float):
+            # valeur décimale (délai repris de l'historique) : slider décimal
+            bas, haut, pas = float(bas), float(haut), float(pas)
+        fiche[nom] = st.slider(libelle, bas, haut, step=pas, key=cle)
+    elif nom in CHOIX:
+        fiche[nom] = st.selectbox(libelle, CHOIX[nom], key=cle)
+    else:
+        fiche[nom] = st.checkbox(libelle, key=cle)
+    return fiche[nom]
+
+@contextmanager
+def zone_saisie(cle):
+    """Regroupe les champs d'une page dans un formulaire en mode « saisie groupée ».
+
+    En temps réel (mode par défaut) chaque widget relance la page ; en saisie
+    groupée les valeurs ne sont transmises qu'à la validation du formulaire,
+    et l'examen est évalué une seule fois.
+    """
+    if not st.session_state.get("saisie_groupee", False):
+        yield
+        return
+    with st.form(f"saisie_{cle}", border=False):
+        yield
+        st.form_submit_button("✅ Évaluer l'examen", key=f"valider_{cle}", type="primary")
+
+# ============================================================================
+# HISTORIQUE DES EXAMENS (echo_expert.historique)
+# ============================================================================
+
+# Mesures de la fiche reprises de l'examen précédent du patient
+MESURES_ANTERIEURES = ("gradient_precedent", "delta_temps")
+
+@st.cache_resource
+def historique_examens():
+    """Base des examens, un fil d'écriture commun à toutes les sessions du processus"""
+    return Historique()
+
+def ouvrir_patient(patient_id):
+    """Lit l'historique du patient, une fois par patient ouvert (une requête indexée).
+
+    Les mesures antérieures sont pré-remplies depuis le dernier examen ; le
+    suivi des tendances de la prothèse est construit sur les examens
+    antérieurs, l'examen du jour y est ajouté à chaque rerun en O(1).
+    """
+    if st.session_state.get("patient_ouvert") == patient_id:
+        return
+    st.session_state["patient_ouvert"] = patient_id
+    examens = historique_examens().examens(patient_id, avant=date.today())
+    st.session_state["suivi_patient"] = SuiviPatient.depuis_examens(examens)
+    st.session_state["mesures_inr"] = historique_examens().mesures_inr(patient_id)
+    anterieures = valeurs_anterieures(examens[-1] if examens else None)
+    fiche = fiche_session()
+    saisies = mesures_saisies()
+    for nom in MESURES_ANTERIEURES:
+        # sans examen précédent, les valeurs du patient précédent ne sont pas conservées
+        fiche[nom] = st.session_state[f"mesure_{nom}"] = anterieures.get(nom, PLAGES[nom][2])
+        if nom in anterieures:
+            saisies.add(nom)
+        else:
+            saisies.discard(nom)
+
+@st.cache_resource
+def planning_rappels():
+    """Rappels de contrôle de tous les patients suivis, construits une fois depuis l'historique"""
+    historique = historique_examens()
+    historique.vider()
+    return Planning.depuis_historique(historique)
+
+def archiver_examen(patient_id, resultats, prothese=None):
+    """Dépose l'examen évalué dans la file d'écriture de l'historique (sans attendre l'écriture).
+
+    Un examen de prothèse met aussi à jour le rappel de contrôle du patient :
+    le planning ne change qu'avec un examen enregistré.
+    """
+    historique_examens().enregistrer(patient_id, fiche_session(), resultats, prothese)
+    if prothese is not None:
+        planning_rappels().noter(patient_id, date.today(), resultats)
+
+def bouton_enregistrement(cle, resultats, prothese=None):
+    """Bouton « Enregistrer l'examen » : l'examen n'est archivé que sur ce clic, jamais au rendu de la page"""
+    patient_id = st.session_state.get("patient_id")
+    if st.button("💾 Enregistrer l'examen", key=f"enregistrer_{cle}", disabled=not patient_id,
+                 help="Archive les mesures et les verdicts affichés dans l'historique du patient (un examen par jour)"):
+        archiver_examen(patient_id, resultats, prothese)
+        st.success(f"Examen de {patient_id} enregistré ({date.today().strftime('%d/%m/%Y')})")
+    historique = historique_examens()
+    if historique.derniere_erreur is not None:
+        # écriture asynchrone : l'échec d'un lot apparaît au rerun suivant
+        st.error(f"{historique.examens_perdus} examen(s) non archivé(s) dans l'historique : "
+                 f"{historique.derniere_erreur}")
+
+def rappel_patient():
+    """Rappel de contrôle courant du patient ouvert, lu dans le planning sans le modifier (None sinon)"""
+    patient_id = st.session_state.get("patient_id")
+    return planning_rappels().prochain(patient_id) if patient_id else None
+
+def saisie_ttr(type_general):
+    """TTR du patient si son historique d'INR en permet le calcul et que l'option est cochée, sinon None.
+
+    Le TTR remplace alors l'INR du jour dans le score de thrombose ; la cible
+    est celle de la position de la prothèse (CIBLES_INR).
+    """
+    mesures = st.session_state.get("mesures_inr") or []
+    if len(mesures) < 2:
+        return None
+    bas, haut = CIBLES_INR[type_general]
+    dates, valeurs = zip(*mesures)
+    ttr, jours_suivis = ttr_patient(dates, valeurs, bas, haut)
+    if math.isnan(ttr):
+        return None
+    utiliser = st.toggle(
+        f"Score de thrombose sur le TTR : {ttr:.0f}% ({len(mesures)} INR, {jours_suivis} jours, cible {bas:g}-{haut:g})",
+        value=True, key="thrombose_ttr",
+        help="Temps dans la cible INR (interpolation linéaire de Rosendaal) à la place de l'INR du jour",
+    )
+    return ttr if utiliser else None
+
+def rappels_du_jour():
+    """Patients à rappeler aujourd'hui, dans la barre latérale (rien si la liste est vide)"""
+    rappels = planning_rappels().a_rappeler()
+    if not rappels:
+        return
+    with st.sidebar.expander(f"📅 RAPPELS DU JOUR ({len(rappels)})"):
+        st.dataframe(pd.DataFrame([{
+            "Patient": patient_id,
+            "Contrôle": LIBELLES_CONTROLE[controle],
+            "Échéance": echeance.strftime("%d/%m/%Y"),
+            "Dernier examen": date_examen.strftime("%d/%m/%Y"),
+        } for echeance, _, patient_id, date_examen, controle in rappels]), hide_index=True, use_container_width=True)
+
+# ============================================================================
+# RAPPORTS (echo_expert.rapports) : RENDU PAR LA FILE DE FOND
+# ============================================================================
+
+# Intervalle de suivi d'une demande en attente (s)
+SUIVI_RAPPORT = 1.0
+
+MIME_RAPPORTS = {".html": "text/html", ".zip": "application/zip"}
+
+@st.cache_resource
+def file_rapports():
+    """File de fond des rapports demandés, commune à toutes les sessions du processus"""
+    return FileRapports()
+
+def rapport_patient(patient_id, identite):
+    """(nom, contenu) du rapport du dernier examen enregistré du patient, jour même compris (file de fond)"""
+    historique = historique_examens()
+    historique.vider()
+    examen = historique.dernier_examen(patient_id, avant=date.today() + timedelta(days=1))
+    if examen is None:
+        raise LookupError(f"Aucun examen enregistré pour {patient_id}")
+    return nom_rapport(examen), rapport_examen(examen, identite).encode()
+
+def archive_du_jour():
+    """(nom, contenu) de l'archive zip des rapports des examens du jour, rendus par le pool de processus (file de fond)"""
+    historique = historique_examens()
+    historique.vider()
+    jour = date.today()
+    cles = cles_liste_de_travail(historique, jour)
+    if not cles:
+        raise LookupError("Aucun examen enregistré aujourd'hui")
+    with tempfile.TemporaryFile() as fichier:
+        generer_archive(fichier, cles, historique.chemin)
+        fichier.seek(0)
+        return f"rapports_echo_{jour.isoformat()}.zip", fichier.read()
+
+def rapports_automatiques(patient_id, identite):
+    """Demandes de rapports de la barre latérale : déposées dans la file de fond, le rerun n'attend pas le rendu"""
+    demandes = st.session_state.setdefault("rapports_demandes", {})
+    if st.sidebar.button("🖨️ Générer Rapport Complet", key="rapport_complet"):
+        demandes["patient"] = ("patient", patient_id, datetime.now().isoformat())
+        file_rapports().soumettre(demandes["patient"], rapport_patient, patient_id, identite)
+    if st.sidebar.button("🗂️ Rapports du jour (zip)", key="rapports_jour"):
+        demandes["jour"] = ("jour", datetime.now().isoformat())
+        file_rapports().soumettre(demandes["jour"], archive_du_jour)
+    with st.sidebar:
+        for nom, cle in demandes.items():
+            suivi_rapport(nom, cle)
+
+def suivi_rapport(nom, cle):
+    """Bouton de téléchargement d'une demande prête, erreur, ou attente suivie par un fragment périodique"""
+    etat, valeur = file_rapports().etat(cle) or ("erreur", "Demande expirée, relancer la génération")
+    if etat == "en_attente":
+        attente_rapport(cle)
+    elif etat == "erreur":
+        st.error(valeur)
+    else:
+        fichier, contenu = valeur
+        st.download_button(
+            f"📥 Télécharger {fichier}", contenu, file_name=fichier,
+            mime=MIME_RAPPORTS[Path(fichier).suffix], key=f"telecharger_{nom}",
+        )
+
+@st.fragment(run_every=SUIVI_RAPPORT)
+def attente_rapport(cle):
+    # seul ce fragment est réexécuté pendant l'attente ; l'application l'est une fois le rapport prêt
+    if (file_rapports().etat(cle) or ("erreur",))[0] != "en_attente":
+        st.rerun()
+    st.caption("⏳ Rapport en cours de génération...")
+
+# ============================================================================
+# REPÈRES PAR PARAMÈTRE : PRÉSENTATION DES NIVEAUX
+# ============================================================================
+
+# Niveaux des classements repere_* de regles.toml
+CLASSES_NIVEAU = {"normal": "good", "limite": "warning", "anormal": "danger"}
+COULEURS_NIVEAU = {"normal": "#28a745", "limite": "#ffc107", "anormal": "#dc3545"}
+INTERPRETATIONS_TR = {"normal": "NORMAL", "limite": "LIMITE", "anormal": "ÉLEVÉE"}
+CLASSES_TENDANCE = {"stable": "good", "surveillance": "warning", "aggravation": "danger"}
+
+# Repère -> niveau -> interprétation affichée dans les cartes « paramètre par paramètre »
+INTERPRETATIONS = {
+    "e_e_prime": {"normal": "NORMAL", "limite": "LIMITE", "anormal": "ÉLEVÉ"},
+    "e_e_prime_fa": {"normal": "NORMAL", "anormal": "ÉLEVÉ"},
+    "volume_og": {"normal": "NORMAL", "limite": "LIMITE", "anormal": "DILATÉ"},
+    "tr_vitesse": INTERPRETATIONS_TR,
+    "vci": {"normal": "NORMAL", "limite": "LIMITE", "anormal": "ANORMAL"},
+    "tapse": {"normal": "NORMAL", "limite": "LIMITE", "anormal": "ALTÉRÉ"},
+    "gradient_prothese": {"normal": "NORMAL", "limite": "ÉLEVÉ", "anormal": "ÉLEVÉ"},
+    "ratio_eoa": {"normal": "BON MATCH", "limite": "MATCH ACCEPTABLE", "anormal": "MISMATCH"},
+    "evolution_gradient": {"normal": "STABLE", "limite": "LENTE", "anormal": "RAPIDE"},
+}
+
+# Légendes des cartes de métriques
+LEGENDES_TR = {"normal": "Normale", "limite": "Limite", "anormal": "Élevée"}
+LEGENDES_TAPSE = {"normal": "Normal", "limite": "Altéré", "anormal": "Altéré"}
+LIBELLES_AGGRAVATION = {"anormal": "Aggravation rapide", "limite": "Évolution défavorable", "normal": "Stable"}
+
+# Couleur d'un score HTAP, indexée par le score (principal sur 7, secondaire sur 5)
+COULEURS_SCORE_HTAP = ("#28a745",) * 2 + ("#ffc107",) + ("#dc3545",) * 5
+COULEURS_SCORE_SECONDAIRE = ("#28a745",) * 2 + ("#ffc107",) * 2 + ("#dc3545",) * 2
+
+# Résultat -> (pictogramme, libellé, couleur, classe de la carte paramètre)
+PRESENTATION_PPM = {
+    "severe": ("🔴", "Sévère", "#dc3545", "danger"),
+    "modere": ("🟡", "Modéré", "#ffc107", "warning"),
+    "absent": ("🟢", "Absent", "#28a745", "good"),
+}
+PRESENTATION_THROMBOSE = {
+    "eleve": ("🔴", "Élevé", "#dc3545"),
+    "modere": ("🟡", "Modéré", "#ffc107"),
+    "faible": ("🟢", "Faible", "#28a745"),
+}
+
+# Gradient mesuré sous, dans ou au-dessus de la plage du modèle -> (classe, interprétation)
+PLAGES_GRADIENT = (("warning", "SOUS LA NORME"), ("good", "DANS LA NORME"), ("danger", "AU-DESSUS DE LA NORME"))
+
+# Verdict -> (classe, titre, score principal, recommandation) de l'alerte HTAP
+ALERTES_HTAP = {
+    "faible": ("success-alert", "🟢 PROBABILITÉ FAIBLE", "≤1 point - HTAP peu probable",
+               "Surveillance standard si clinique concordante"),
+    "intermediaire": ("warning-alert", "🟡 PROBABILITÉ INTERMÉDIAIRE", "2 points",
+                      "Investigations complémentaires nécessaires"),
+    "faible_surveillance": ("success-alert", "🟢 PROBABILITÉ FAIBLE", "2 points mais peu de signes secondaires",
+                            "Surveillance renforcée"),
+    "elevee": ("critical-alert", "🔴 PROBABILITÉ ÉLEVÉE", "≥3 points - HTAP probable",
+               "Cathétérisme cardiaque recommandé"),
+}
+
+# Diagnostic -> (classe, titre, recommandation) de l'alerte constriction / restriction
+ALERTES_PERICARDE = {
+    "constriction": ("critical-alert", "🎯 CONSTRICTION PÉRICARDIQUE PROBABLE", "IRM cardiaque et avis spécialisé"),
+    "restriction": ("critical-alert", "🎯 CARDIOMYOPATHIE RESTRICTIVE PROBABLE",
+                    "Bilan étiologique complet et avis spécialisé"),
+    "indetermine": ("warning-alert", "⚠️ DIAGNOSTIC INDÉTERMINÉ",
+                    "Investigations complémentaires nécessaires (IRM, scanner, cathétérisme)"),
+}
+
+# Zone grise de la PRVG -> (classe, titre, constat selon le nombre de critères secondaires, recommandation)
+ALERTES_PRVG_ZONE_GRISE = {
+    "probablement_elevee": ("warning-alert", "🟡 PRESSION DE REMPLISSAGE VG PROBABLEMENT ÉLEVÉE",
+                            "Zone grise avec {}/3 critères secondaires positifs", "Évaluation multimodale recommandée"),
+    "indeterminee": ("dynamic-result", "🟡 INDÉTERMINÉ - SURVEILLANCE RENFORCÉE",
+                     "Seulement {}/3 critères secondaires", "Évaluation clinique contextuelle"),
+}
+
+# ============================================================================
+# CARTES HTML (modèles de assets/cartes.html, rendus mémoïsés)
+# ============================================================================
+
+FICHIER_CARTES = Path(__file__).parent / "assets" / "cartes.html"
+
+# Cartes rendues conservées : une par combinaison (modèle, valeurs) affichée
+TAILLE_CACHE_CARTES = 4096
+
+@st.cache_resource
+def modeles_cartes():
+    """Modèles de cartes, lus et découpés une fois par processus : nom -> méthode ``format`` du modèle"""
+    blocs = re.split(r"<!-- carte: (\w+) -->\n", FICHIER_CARTES.read_text(encoding="utf-8"))
+    return {nom: modele.strip().format for nom, modele in zip(blocs[1::2], blocs[2::2])}
+
+@lru_cache(maxsize=TAILLE_CACHE_CARTES)
+def carte_html(nom, **valeurs):
+    """HTML de la carte ``nom`` remplie par ``valeurs``, mémoïsé : une carte déjà affichée n'est pas reformatée"""
+    return modeles_cartes()[nom](**valeurs)
+
+def carte(nom, **valeurs):
+    """Affiche la carte ``nom`` (voir assets/cartes.html)"""
+    st.markdown(carte_html(nom, **valeurs), unsafe_allow_html=True)
+
+# ============================================================================
+# TABLEAUX DE RÉSULTATS (mémoïsés, communs à toutes les sessions)
+# ============================================================================
+
+# Les tableaux sont conservés au format Arrow : st.dataframe n'a plus à
+# convertir un DataFrame pandas à chaque rerun.
+TAILLE_CACHE_TABLEAUX = 1024
+
+def _table_arrow(donnees):
+    return pa.Table.from_pandas(pd.DataFrame(donnees))
+
+@memoiser(TAILLE_CACHE_TABLEAUX)
+def table_recommandations(surface_corporelle, type_general):
+    """Aide au choix pré-opératoire pour une surface corporelle et une position"""
+    return _table_arrow(tableau_recommandations(surface_corporelle, type_general))
+
+@memoiser(TAILLE_CACHE_TABLEAUX)
+def table_identification(eoa_mesuree, gradient_moyen, type_general):
+    """Modèles les plus compatibles avec l'EOA et le gradient mesurés"""
+    return _table_arrow([{
+        "Catégorie": c["categorie"],
+        "Marque/Modèle": c["marque"],
+        "Taille (mm)": c["taille"],
+        "EOA théorique (cm²)": c["eoa_theorique"],
+        "Gradient normal (mmHg)": "{:g}-{:g}".format(*c["gradient_normal"]),
+        "Gradient dans la plage": "Oui" if c["gradient_dans_plage"] else "Non",
+        "Écart EOA (cm²)": c["ecart_eoa"],
+    } for c in identifier_prothese(eoa_mesuree, gradient_moyen, type_general)])
+
+@memoiser(TAILLE_CACHE_TABLEAUX)
+def table_parametres_diastoliques(e_a_ratio, e_e_prime_moyen, volume_og_index, tr_vitesse, dt, rapport_s_d, duree_ar_a, vp):
+    """Analyse paramétrique de la page Dysfonction diastolique"""
+    return _table_arrow({
+        "Paramètre": ["Rapport E/A", "E/e' moyen", "Volume OG indexé", "Vitesse TR", 
+                     "Temps décélération", "Rapport S/D", "Durée Ar-A", "Vitesse Vp"],
+        "Valeur": [f"{e_a_ratio}", f"{e_e_prime_moyen}", f"{volume_og_index} ml/m²", f"{tr_vitesse} m/s",
+                  f"{dt} ms", f"{rapport_s_d}", f"{duree_ar_a} ms", f"{vp} cm/s"],
+        "Interprétation": [
+            {"normal": "Normal", "anormal": "Anormal"}[evaluer_repere("e_a_ratio", e_a_ratio=e_a_ratio)],
+            {"normal": "Normal", "limite": "Limite", "anormal": "Élevé"}[evaluer_repere("e_e_prime", e_e_prime=e_e_prime_moyen)],
+            {"normal": "Normal", "limite": "Limite", "anormal": "Dilaté"}[evaluer_repere("volume_og", volume_og=volume_og_index)],
+            {"normal": "Normal", "limite": "Limite", "anormal": "Élevée"}[evaluer_repere("tr_vitesse", tr_vitesse=tr_vitesse)],
+            {"normal": "Normal", "court": "Court", "long": "Long"}[evaluer_repere("dt", dt=dt)],
+            {"normal": "Normal", "inverse": "Inversé"}[evaluer_repere("rapport_s_d", rapport_s_d=rapport_s_d)],
+            {"normal": "Normal", "prolonge": "Prolongé"}[evaluer_repere("duree_ar_a", duree_ar_a=duree_ar_a)],
+            {"normal": "Normal", "ralenti": "Ralenti"}[evaluer_repere("vp", vp=vp)],
+        ]
+    })
+
+@memoiser(TAILLE_CACHE_TABLEAUX)
+def probabilites_incertitude(regle, tirages, mesures):
+    """Probabilités des résultats de ``regle`` sous l'erreur de mesure ; ``mesures`` en paires (nom, valeur)"""
+    return probabilites(regle, dict(mesures), tirages)
+
+@memoiser(TAILLE_CACHE_TABLEAUX)
+def carte_sensibilite_memoisee(regle, axe_x, axe_y, fixes):
+    """Rectangles de la carte de sensibilité ; ``fixes`` en paires (nom, valeur) des mesures hors axes"""
+    return pd.DataFrame(carte_sensibilite(regle, axe_x, axe_y, dict(fixes)))
+
+TABLES_MEMOISEES = {
+    "cartes_html": carte_html,
+    "table_recommandations": table_recommandations,
+    "table_identification": table_identification,
+    "table_parametres_diastoliques": table_parametres_diastoliques,
+    "probabilites_incertitude": probabilites_incertitude,
+    "carte_sensibilite": carte_sensibilite_memoisee,
+}
+
+def statistiques_caches():
+    """Succès, échecs et taux de succès des tableaux mémoïsés"""
+    tableau = pd.DataFrame.from_dict(statistiques(TABLES_MEMOISEES), orient="index")
+    appels = tableau["hits"] + tableau["misses"]
+    tableau["taux_succes"] = (tableau["hits"] / appels.where(appels > 0)).round(3)
+    return tableau
+
+# ============================================================================
+# MODE INCERTITUDE
+# ============================================================================
+
+def carte_incertitude(regle, verdicts, **mesures):
+    """Probabilité de chaque catégorie de ``regle`` en mode incertitude (rien sinon).
+
+    ``verdicts`` associe chaque résultat à son (libellé, classe CSS) ; les
+    tirages normaux sont réutilisés d'un rerun à l'autre.
+    """
+    if not st.session_state.get("mode_incertitude", False):
+        return
+    tirages = st.session_state.get("tirages_incertitude", TIRAGES)
+    lignes = "\n".join(
+        carte_html(
+            "probabilite", libelle=verdicts[resultat][0],
+            probabilite=f"{probabilite:.1%}" if probabilite >= 0.001 else "< 0.1%",
+            largeur=f"{probabilite:.1%}", couleur=COULEURS_ALERTE[verdicts[resultat][1]],
+        )
+        for resultat, probabilite in probabilites_incertitude(regle, tirages, tuple(mesures.items())).items()
+        if probabilite > 0
+    )
+    carte("incertitude", lignes=lignes, tirages=f"{tirages:,}".replace(",", " "))
+
+# ============================================================================
+# RESSOURCES STATIQUES (construites une fois par processus)
+# ============================================================================
+
+@st.cache_resource
+def charger_style():
+    """Bloc <style> de l'application, lu une fois depuis assets/style.css"""
+    return f"<style>\n{FICHIER_STYLE.read_text(encoding='utf-8')}</style>"
+
+CARTES_ACCUEIL = [
+    ("🫀 PRVG", "Pression Remplissage VG", "Algorithmes situationnels"),
+    ("📊 Diastolique", "Fonction Diastolique", "Évaluation complète"),
+    ("🌊 HTAP", "Hypertension Pulmonaire", "ESC 2022"),
+    ("🔄 Péricarde", "Diagnostic Différentiel", "Constrictive vs Restrictive"),
+    ("⚙️ Prothèses", "Valvulaires", "Base de données complète"),
+]
+
+ETAPES_ACCUEIL = [
+    ("🎯 1. Sélectionnez l'évaluation", "Choisissez l'évaluation souhaitée dans le menu de navigation"),
+    ("📊 2. Entrez les paramètres", "Utilisez les sliders et menus déroulants pour saisir les valeurs"),
+    ("🔄 3. Obtenez les résultats", "Les résultats se mettent à jour automatiquement en temps réel"),
+]
+
+@st.cache_resource
+def blocs_accueil():
+    """HTML de la bannière, des cartes et des étapes de la page d'accueil"""
+    banniere = """
+    <div style='text-align: center; padding: 3rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                color: white; border-radius: 20px; margin: 2rem 0;'>
+        <h1>🫀 BIENVENUE</h1>
+        <p style='font-size: 1.3rem;'>Guide Échocardiographique Complet avec Feedback Dynamique</p>
+    </div>
+    """
+    cartes = [
+        f"""
+        <div class="metric-card">
+            <h3>{titre}</h3>
+            <p>{sous_titre}</p>
+            <p style='font-size: 0.9rem; color: #666;'>{detail}</p>
+        </div>
+        """
+        for titre, sous_titre, detail in CARTES_ACCUEIL
+    ]
+    etapes = [
+        f"""
+        <div class="patient-info">
+            <h4>{titre}</h4>
+            <p>{texte}</p>
+        </div>
+        """
+        for titre, texte in ETAPES_ACCUEIL
+    ]
+    return banniere, cartes, etapes
+
+@st.cache_resource
+def tableau_comparatif_pericarde():
+    """Tableau comparatif constriction / restriction (statique)"""
+    comparatif_data = {
+        "Critère": ["Variation respiratoire E mitral", "Mouvement septum", "Annulus mitral",
+                   "Épaisseur péricarde", "Fonction VG", "Strain longitudinal", "Flux hépatique"],
+        "Constriction": ["≥25%", "Bounce paradoxal", "e' latéral > e' septal", "Épaissi/calcifié",
+                       "Préservée", "Relativement préservé", "Inversion expiratoire"],
+        "Restrictive": ["<10%", "Normal ou réduit", "e' latéral ≈ e' septal", "Normal",
+                      "Altérée", "Altéré (≥ -15%)", "Normal"]
+    }
+    return pa.Table.from_pandas(pd.DataFrame(comparatif_data))
+
+# ============================================================================
+# PAGE ACCUEIL COMPLÈTE
+# ============================================================================
+
+def page_accueil():
+    banniere, cartes, etapes = blocs_accueil()
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        st.markdown(banniere, unsafe_allow_html=True)
+    
+    # Métriques rapides
+    st.markdown("### 📈 ÉVALUATIONS DISPONIBLES")
+    
+    for colonne, carte in zip(st.columns(len(cartes)), cartes):
+        with colonne:
+            st.markdown(carte, unsafe_allow_html=True)
+    
+    # Section d'information
+    st.markdown("---")
+    st.markdown("### 💡 COMMENT UTILISER CETTE APPLICATION")
+    
+    for colonne, etape in zip(st.columns(len(etapes)), etapes):
+        with colonne:
+            st.markdown(etape, unsafe_allow_html=True)
+
+# ============================================================================
+# ÉVALUATION PRVG - COMPLÈTE ET DYNAMIQUE
+# ============================================================================
+
+@st.fragment
+def page_prvg():
+    st.markdown('<div class="section-header">🫀 ÉVALUATION PRESSION DE REMPLISSAGE VG</div>', unsafe_allow_html=True)
+    
+    # Configuration en colonnes
+    col_config, col_feedback = st.columns([1, 2])
+    
+    with col_config:
+        st.subheader("🎯 CONFIGURATION")
+        
+        # Situation clinique
+        situation = st.selectbox("Situation Clinique", [
+            "FE VG ≥ 50% - Patient standard",
+            "FE VG < 50% - Dysfonction systolique",
+            "Fibrillation auriculaire",
+            "Sténose mitrale",
+            "Régurgitation mitrale sévère",
+            "Prothèse valvulaire mitrale",
+            "Calcification annulaire mitrale sévère"
+        ])
+        
+        with zone_saisie("prvg"):
+            st.markdown("---")
+            st.subheader("📊 PARAMÈTRES MESURÉS")
+        
+            # Paramètres communs
+            e_e_prime_moyen = mesure("E/e' moyen", "e_e_prime")
+            volume_og_index = mesure("Volume OG indexé (ml/m²)", "volume_og")
+            tr_vitesse = mesure("Vitesse TR max (m/s)", "tr_vitesse")
+        
+            if situation not in ["Fibrillation auriculaire", "Sténose mitrale", "Prothèse valvulaire mitrale"]:
+                e_a_ratio = mesure("Rapport E/A", "e_a_ratio")
+                dt = mesure("Temps décélération (ms)", "dt")
+                e_vitesse = mesure("Vitesse E (cm/s)", "e_vitesse")
+        
+            # Paramètres spécifiques selon la situation
+            if situation == "Sténose mitrale":
+                gradient_mitral = mesure("Gradient moyen mitral (mmHg)", "gradient_mitral")
+                surface_mitrale = mesure("Surface mitrale (cm²)", "surface_mitrale")
+        
+            elif situation == "Régurgitation mitrale sévère":
+                volume_regurgitant = mesure("Volume régurgitant (ml)", "volume_regurgitant")
+                pap_systolique = mesure("PAP systolique (mmHg)", "pap_systolique")
+        
+            elif situation == "Prothèse valvulaire mitrale":
+                gradient_prothese = mesure("Gradient moyen prothèse (mmHg)", "gradient_moyen", 2, 15, defaut=6)
+                eoa_prothese = mesure("EOA prothèse (cm²)", "eoa_mesuree")
+    
+    with col_feedback:
+        st.subheader("📈 RÉSULTATS EN TEMPS RÉEL")
+        
+        # Évaluation dynamique selon la situation
+        if "≥ 50%" in situation:
+            evaluation = evaluer_prvg_fevg_preservee(e_e_prime_moyen, volume_og_index, tr_vitesse)
+            verdict_prvg = classer_prvg(evaluation)
+            
+            if verdict_prvg == "normale":
+                st.markdown("""
+                <div class="success-alert">
+                    <h3>✅ PRESSION DE REMPLISSAGE VG NORMALE</h3>
+                    <p><strong>Critères remplis:</strong> E/e' moyen ≤ 8 ET Volume OG ≤ 34 ml/m²</p>
+                    <p><em>Recommandation:</em> Surveillance standard</p>
+                </div>
+                """, unsafe_allow_html=True)
+                
+            elif verdict_prvg == "elevee":
+                st.markdown("""
+                <div class="critical-alert">
+                    <h3>🔴 PRESSION DE REMPLISSAGE VG ÉLEVÉE</h3>
+                    <p><strong>Critère majeur:</strong> E/e' moyen > 14</p>
+                    <p><em>Recommandation:</em> Évaluation clinique approfondie urgente</p>
+                </div>
+                """, unsafe_allow_html=True)
+                
+            elif verdict_prvg in ALERTES_PRVG_ZONE_GRISE:
+                classe, titre, constat, recommandation = ALERTES_PRVG_ZONE_GRISE[verdict_prvg]
+                carte(
+                    "alerte_constat", classe=classe, titre=titre,
+                    constat=constat.format(evaluation["criteres_secondaires"]), recommandation=recommandation,
+                )
+            
+            carte_incertitude(
+                "categorie_prvg", VERDICTS_PRVG,
+                e_e_prime=e_e_prime_moyen, volume_og=volume_og_index, tr_vitesse=tr_vitesse,
+            )
+        
+        elif "< 50%" in situation:
+            pattern, libelle = evaluer_pattern_diastolique(e_a_ratio, dt, e_vitesse)
+            
+            if pattern == "relaxation_alteree":
+                st.markdown("""
+                <div class="success-alert">
+                    <h3>📊 PATTERN DE RELAXATION ALTÉRÉE</h3>
+                    <p><strong>PRVG probablement normale</strong></p>
+                    <p><em>Caractéristiques:</em> E/A ≤ 0.8 + E ≤ 50 cm/s</p>
+                </div>
+                """, unsafe_allow_html=True)
+            elif pattern == "restrictif":
+                st.markdown("""
+                <div class="critical-alert">
+                    <h3>📊 PATTERN RESTRICTIF</h3>
+                    <p><strong>PRVG ÉLEVÉE - PRONOSTIC DÉFAVORABLE</strong></p>
+                    <p><em>Caractéristiques:</em> E/A ≥ 2 + DT < 160 ms</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown("""
+                <div class="warning-alert">
+                    <h3>📊 PATTERN PSEUDONORMAL</h3>
+                    <p><strong>ÉVALUATION COMPLÉMENTAIRE NÉCESSAIRE</strong></p>
+                    <p><em>Recommandation:</em> Évaluer E/e' et volume OG pour confirmation</p>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        elif situation == "Fibrillation auriculaire":
+            st.markdown("""
+            <div class="dynamic-result">
+                <h3>💓 FIBRILLATION AURICULAIRE - ÉVALUATION SPÉCIFIQUE</h3>
+                <p><strong>Paramètres valides en FA:</strong> E/e' moyen, Volume OG, Vitesse TR</p>
+                <p><strong>Paramètres non valides:</strong> Rapport E/A, Temps de décélération</p>
+                <p><strong>Seuils spécifiques:</strong> E/e' > 11 → PRVG élevée (spécificité 85%)</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if evaluer_repere("e_e_prime_fa", e_e_prime=e_e_prime_moyen) == "anormal":
+                st.markdown("""
+                <div class="critical-alert">
+                    <h3>🔴 PRESSION DE REMPLISSAGE VG ÉLEVÉE EN FA</h3>
+                    <p><strong>E/e' moyen > 11 → PRVG élevée avec bonne spécificité</strong></p>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        elif situation == "Sténose mitrale":
+            st.markdown("""
+            <div class="critical-alert">
+                <h3>⚠️ ATTENTION - STÉNOSE MITRALE</h3>
+                <p><strong>Les paramètres conventionnels de PRVG ne sont PAS VALIDES</strong></p>
+                <p><em>Limitations:</em> Le gradient mitral modifie les vitesses Doppler</p>
+                <p><em>Recommandation:</em> Utiliser des paramètres indirects (PAP, dimensions OG, fonction VD)</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        elif situation == "Régurgitation mitrale sévère":
+            st.markdown("""
+            <div class="warning-alert">
+                <h3>🟡 RÉGURGITATION MITRALE SÉVÈRE - INTERPRÉTATION AVEC PRÉCAUTION</h3>
+                <p><strong>E/e' peut surestimer la PRVG réelle</strong></p>
+                <p><em>Paramètre le plus fiable:</em> Volume OG indexé</p>
+                <p><em>Seuil significatif:</em> Volume OG > 40 ml/m² → élévation chronique des pressions</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        elif situation == "Prothèse valvulaire mitrale":
+            st.markdown("""
+            <div class="critical-alert">
+                <h3>🔴 PROTHÈSE VALVULAIRE MITRALE - LIMITATIONS SÉVÈRES</h3>
+                <p><strong>Paramètres conventionnels de PRVG NON VALIDES</strong></p>
+                <p><em>Raisons:</em> Artefacts acoustiques, modifications hémodynamiques</p>
+                <p><em>Recommandation:</em> Utiliser des paramètres indirects (PAP, volume OG, fonction VD)</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        elif situation == "Calcification annulaire mitrale sévère":
+            st.markdown("""
+            <div class="critical-alert">
+                <h3>🔴 CALCIFICATION ANNULAIRE - CONTRE-INDICATION</h3>
+                <p><strong>E/e' EST CONTRE-INDIQUÉ - SURESTIMATION SYSTÉMATIQUE</strong></p>
+                <p><em>Alternative:</em> Volume OG, Vitesse TR, Flux veineux pulmonaire</p>
+                <p><em>Seuils alternatifs:</em> Volume OG > 34 ml/m², TR > 2.8 m/s</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Feedback paramétrique détaillé
+        st.subheader("🔍 ANALYSE PARAMÈTRE PAR PARAMÈTRE")
+        
+        # E/e' moyen (sauf contre-indications)
+        if situation not in ["Sténose mitrale", "Prothèse valvulaire mitrale", "Calcification annulaire mitrale sévère"]:
+            niveau_e_e_prime = evaluer_repere("e_e_prime", e_e_prime=e_e_prime_moyen)
+            interpretation_e_e = INTERPRETATIONS["e_e_prime"][niveau_e_e_prime]
+            
+            if situation == "Fibrillation auriculaire":
+                interpretation_e_e = INTERPRETATIONS["e_e_prime_fa"][evaluer_repere("e_e_prime_fa", e_e_prime=e_e_prime_moyen)]
+            
+            carte(
+                "retour_parametre", classe=CLASSES_NIVEAU[niveau_e_e_prime], libelle="E/e' moyen",
+                valeur=e_e_prime_moyen, interpretation=interpretation_e_e,
+            )
+        else:
+            carte("retour_contre_indique", libelle="E/e' moyen", valeur=e_e_prime_moyen)
+        
+        # Volume OG (toujours valide)
+        niveau_volume_og = evaluer_repere("volume_og", volume_og=volume_og_index)
+        carte(
+            "retour_parametre", classe=CLASSES_NIVEAU[niveau_volume_og], libelle="Volume OG indexé",
+            valeur=f"{volume_og_index} ml/m²", interpretation=INTERPRETATIONS["volume_og"][niveau_volume_og],
+        )
+        
+        # Vitesse TR (toujours valide)
+        niveau_tr = evaluer_repere("tr_vitesse", tr_vitesse=tr_vitesse)
+        carte(
+            "retour_parametre", classe=CLASSES_NIVEAU[niveau_tr], libelle="Vitesse TR",
+            valeur=f"{tr_vitesse} m/s", interpretation=INTERPRETATIONS["tr_vitesse"][niveau_tr],
+        )
+
+# ============================================================================
+# ÉVALUATION HTAP - COMPLÈTE ET DYNAMIQUE
+# ============================================================================
+
+@st.fragment
+def page_htap():
+    st.markdown('<div class="section-header">🌊 PROBABILITÉ D\'HYPERTENSION ARTÉRIELLE PULMONAIRE ESC 2022</div>', unsafe_allow_html=True)
+    
+    col_config, col_feedback = st.columns([1, 2])
+    
+    with col_config, zone_saisie("htap"):
+        st.subheader("🎯 PARAMÈTRES PRINCIPAUX")
+        
+        tr_vitesse = mesure("Vitesse TR maximale (m/s)", "tr_vitesse", defaut=3.2)
+        vc_diametre = mesure("Diamètre VCI (mm)", "vc_diametre")
+        vc_collapsus = mesure("Collapsus VCI (%)", "vc_collapsus")
+        rv_ra_ratio = mesure("Rapport VD/OG", "rv_ra_ratio")
+        septum_paradoxal = mesure("Mouvement septum paradoxal", "septum_paradoxal")
+        
+        st.markdown("---")
+        st.subheader("📊 PARAMÈTRES SECONDAIRES")
+        
+        tapse = mesure("TAPSE (mm)", "tapse")
+        s_tricuspide = mesure("S' tricuspide (cm/s)", "s_tricuspide")
+        fac_vd = mesure("FAC VD (%)", "fac_vd")
+        acceleration_time = mesure("Temps accélération VTID (ms)", "acceleration_time")
+        diam_ap = mesure("Diamètre artère pulmonaire (mm)", "diam_ap")
+        pvr_estimee = mesure("PVR estimée (UW)", "pvr_estimee")
+        
+        st.markdown("---")
+        st.subheader("🔍 PARAMÈTRES ADDITIONNELS")
+        
+        contexte_cardio_gauche = mesure("Cardiopathie gauche connue", "contexte_cardio_gauche")
+        diam_og = mesure("Diamètre OG (mm)", "diam_og")
+        strain_vd = mesure("Strain longitudinal VD (%)", "strain_vd")
+    
+    with col_feedback:
+        st.subheader("📈 PROBABILITÉ HTAP EN TEMPS RÉEL")
+        
+        # Calcul du score
+        score_htap = calculer_probabilite_htap(tr_vitesse, vc_diametre, vc_collapsus, rv_ra_ratio, septum_paradoxal)
+        
+        # Calcul score secondaire
+        score_secondaire = calculer_score_secondaire_htap(
+            tapse, s_tricuspide, fac_vd, acceleration_time, pvr_estimee
+        )
+        probabilite_htap = classer_probabilite_htap(score_htap, score_secondaire)
+        
+        # Affichage résultat principal
+        classe, titre, principal, recommandation = ALERTES_HTAP[probabilite_htap]
+        carte(
+            "alerte_htap", classe=classe, titre=titre, principal=principal,
+            score_secondaire=score_secondaire, recommandation=recommandation,
+        )
+        
+        carte_incertitude(
+            "probabilite_htap", VERDICTS_HTAP,
+            tr_vitesse=tr_vitesse, vc_diametre=vc_diametre, vc_collapsus=vc_collapsus,
+            rv_ra_ratio=rv_ra_ratio, septum_paradoxal=septum_paradoxal, tapse=tapse, s_tricuspide=s_tricuspide,
+            fac_vd=fac_vd, acceleration_time=acceleration_time, pvr_estimee=pvr_estimee,
+        )
+        
+        # Métriques détaillées
+        st.subheader("📊 SCORING DÉTAILLÉ")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            carte(
+                "metrique", titre="🎯 Score Principal", taille=2, style=f" color: {COULEURS_SCORE_HTAP[score_htap]}",
+                valeur=f"{score_htap}/7", legende="Probabilité HTAP",
+            )
+        
+        with col2:
+            carte(
+                "metrique", titre="📏 Score Secondaire", taille=2,
+                style=f" color: {COULEURS_SCORE_SECONDAIRE[score_secondaire]}",
+                valeur=f"{score_secondaire}/5", legende="Signes de confirmation",
+            )
+        
+        niveau_tr_htap = evaluer_repere("tr_vitesse", tr_vitesse=tr_vitesse)
+        niveau_tapse = evaluer_repere("tapse", tapse=tapse)
+        with col3:
+            carte(
+                "metrique", titre="📏 Vitesse TR", taille=1.8, style="",
+                valeur=f"{tr_vitesse} m/s", legende=LEGENDES_TR[niveau_tr_htap],
+            )
+        
+        with col4:
+            carte("metrique", titre="💓 TAPSE", taille=1.8, style="", valeur=f"{tapse} mm", legende=LEGENDES_TAPSE[niveau_tapse])
+        
+        # Feedback paramétrique détaillé
+        st.subheader("🔍 ANALYSE PARAMÈTRE PAR PARAMÈTRE")
+        
+        # Vitesse TR
+        carte(
+            "retour_parametre", classe=CLASSES_NIVEAU[niveau_tr_htap], libelle="Vitesse TR",
+            valeur=f"{tr_vitesse} m/s", interpretation=INTERPRETATIONS["tr_vitesse"][niveau_tr_htap],
+        )
+        
+        # VCI
+        niveau_vci = evaluer_repere("vci", vc_diametre=vc_diametre, vc_collapsus=vc_collapsus)
+        carte(
+            "retour_parametre", classe=CLASSES_NIVEAU[niveau_vci], libelle="VCI",
+            valeur=f"{vc_diametre} mm / {vc_collapsus}% collapsus", interpretation=INTERPRETATIONS["vci"][niveau_vci],
+        )
+        
+        # TAPSE
+        carte(
+            "retour_parametre", classe=CLASSES_NIVEAU[niveau_tapse], libelle="TAPSE",
+            valeur=f"{tapse} mm", interpretation=INTERPRETATIONS["tapse"][niveau_tapse],
+        )
+
+# ============================================================================
+# ÉVALUATION PROTHÈSES VALVULAIRES - COMPLÈTE ET DYNAMIQUE
+# ============================================================================
+
+@st.fragment
+def page_protheses(surface_corporelle):
+    st.markdown('<div class="section-header">⚙️ ÉVALUATION DES PROTHÈSES VALVULAIRES</div>', unsafe_allow_html=True)
+    
+    referentiel = charger_referentiel()
+    col_config, col_feedback = st.columns([1, 2])
+    
+    with col_config:
+        st.subheader("🔧 CONFIGURATION PROTHÈSE")
+        
+        type_general = st.selectbox("Type de prothèse", ["Prothèse aortique", "Prothèse mitrale"])
+        
+        if type_general == "Prothèse aortique":
+            categorie = st.selectbox("Catégorie", list(protheses_aortiques.keys()))
+            marque = st.selectbox("Marque/Modèle", list(protheses_aortiques[categorie].keys()))
+            tailles_disponibles = list(protheses_aortiques[categorie][marque].keys())
+            taille = st.selectbox("Taille (mm)", tailles_disponibles)
+        else:
+            categorie = st.selectbox("Catégorie", list(protheses_mitrales.keys()))
+            marque = st.selectbox("Marque/Modèle", list(protheses_mitrales[categorie].keys()))
+            tailles_disponibles = list(protheses_mitrales[categorie][marque].keys())
+            taille = st.selectbox("Taille (mm)", tailles_disponibles)
+        
+        donnees_theoriques = referentiel.chercher(type_general, marque, taille)
+        eoa_theorique = donnees_theoriques["eoa"]
+        
+        # Le choix du modèle reste interactif : il détermine les tailles proposées
+        with zone_saisie("protheses"):
+            st.markdown("---")
+            if type_general == "Prothèse aortique":
+                st.subheader("📊 MESURES AORTIQUES")
+                
+                gradient_moyen = mesure("Gradient moyen (mmHg)", "gradient_moyen", 5, 60)
+                eoa_mesuree = mesure("EOA mesurée (cm²)", "eoa_mesuree", defaut=eoa_theorique)
+                dvi = mesure("DVI", "dvi")
+                acceleration_time = mesure("Temps accélération (ms)", "acceleration_time_prothese")
+            else:
+                st.subheader("📊 MESURES MITRALES")
+                
+                gradient_moyen = mesure("Gradient moyen (mmHg)", "gradient_moyen", 2, 15, defaut=6)
+                eoa_mesuree = mesure("EOA mesurée (cm²)", "eoa_mesuree", defaut=eoa_theorique)
+                pht = mesure("PHT (ms)", "pht")
+                pression_og_estimee = mesure("Pression OG estimée (mmHg)", "pression_og")
+            
+            st.markdown("---")
+            st.subheader("👤 FACTEURS PATIENT")
+            
+            fa = mesure("Fibrillation auriculaire", "fa")
+            antecedent_te = mesure("Antécédent thrombo-embolique", "antecedent_te")
+            inr = mesure("INR", "inr")
+            ttr = saisie_ttr(type_general)
+            fevg_prothese = mesure("FE VG (%)", "fevg", defaut=55)
+            
+            st.markdown("---")
+            st.subheader("🔄 ÉVOLUTION")
+            
+            gradient_precedent = mesure("Gradient précédent (mmHg) - si connu", "gradient_precedent")
+            delta_temps = mesure("Délai depuis dernier examen (mois)", "delta_temps")
+    
+    with col_feedback:
+        st.subheader("📈 PERFORMANCE PROTHÈTIQUE EN TEMPS RÉEL")
+        
+        # Calculs dynamiques
+        ratio_eoa = (eoa_mesuree / eoa_theorique) * 100
+        severite_ppm, eoai = calculer_ppm(eoa_mesuree, surface_corporelle)
+        risque_thrombose, score_thrombose = evaluer_risque_thrombose(
+            categorie, fevg_prothese, fa, antecedent_te, inr, ttr
+        )
+        
+        # Calcul évolution
+        delta_gradient, evolution_annuelle = evaluer_evolution_gradient(
+            gradient_moyen, gradient_precedent, delta_temps
+        )
+        
+        # Détermination performance
+        performance, couleur_perf = evaluer_performance_prothese(
+            type_general, gradient_moyen, eoa_mesuree, dvi if type_general == "Prothèse aortique" else None
+        )
+        bouton_enregistrement("protheses", {
+            "performance_prothese": performance, "risque_thrombose": risque_thrombose,
+            "score_thrombose": score_thrombose, "ppm": severite_ppm, "eoai": eoai,
+            "delta_gradient": delta_gradient, "evolution_annuelle": evolution_annuelle, "ttr": ttr,
+        }, (type_general, categorie, marque, taille))
+        
+        carte_incertitude(
+            "performance_prothese", {libelle: (libelle, classe) for libelle, classe in VERDICTS_PERFORMANCE.items()},
+            type_general=type_general, gradient_moyen=gradient_moyen, eoa_mesuree=eoa_mesuree,
+            dvi=dvi if type_general == "Prothèse aortique" else None,
+        )
+        
+        # Affichage métriques principales
+        col1, col2, col3, col4 = st.columns(4)
+        
+        pictogramme_ppm, libelle_ppm, couleur_ppm, classe_ppm = PRESENTATION_PPM[severite_ppm]
+        with col1:
+            carte(
+                "metrique", titre=f"{couleur_perf} Performance", taille=1.5,
+                style=f" color: {COULEURS_ALERTE[VERDICTS_PERFORMANCE[performance]]}",
+                valeur=performance, legende=f"Gradient: {gradient_moyen} mmHg",
+            )
+        
+        with col2:
+            carte(
+                "metrique", titre=f"{pictogramme_ppm} PPM", taille=1.5, style=f" color: {couleur_ppm}",
+                valeur=libelle_ppm, legende=f"EOAi: {eoai:.2f} cm²/m²",
+            )
+        
+        with col3:
+            pictogramme_thrombose, libelle_thrombose, couleur_thrombose = PRESENTATION_THROMBOSE[risque_thrombose]
+            carte(
+                "metrique", titre=f"{pictogramme_thrombose} Risque Thrombose", taille=1.5,
+                style=f" color: {couleur_thrombose}", valeur=libelle_thrombose,
+                legende=f"Score: {score_thrombose}/8" + (f" - TTR {ttr:.0f}%" if ttr is not None else ""),
+            )
+        
+        with col4:
+            if gradient_precedent:
+                aggravation = evaluer_repere("aggravation_gradient", delta_gradient=delta_gradient)
+                carte(
+                    "metrique", titre="📈 Évolution", taille=1.5, style=f" color: {COULEURS_NIVEAU[aggravation]}",
+                    valeur=LIBELLES_AGGRAVATION[aggravation], legende=f"Δ: {delta_gradient:+g} mmHg",
+                )
+            else:
+                carte(
+                    "metrique", titre="📈 Évolution", taille=1.5, style=" color: #6c757d",
+                    valeur="Données manquantes", legende="Examen de référence nécessaire",
+                )
+        
+        # Feedback détaillé
+        st.subheader("🔍 ANALYSE DÉTAILLÉE")
+        
+        # Gradient
+        niveau_gradient = evaluer_repere("gradient_prothese", type_general=type_general, gradient_moyen=gradient_moyen)
+        carte(
+            "retour_parametre", classe=CLASSES_NIVEAU[niveau_gradient], libelle="Gradient moyen",
+            valeur=f"{gradient_moyen} mmHg", interpretation=INTERPRETATIONS["gradient_prothese"][niveau_gradient],
+        )
+        
+        # Gradient attendu pour le modèle et la taille
+        gradient_min = donnees_theoriques["gradient_min"]
+        gradient_max = donnees_theoriques["gradient_max"]
+        classe_plage, interpretation_plage = PLAGES_GRADIENT[(gradient_moyen >= gradient_min) + (gradient_moyen > gradient_max)]
+        carte(
+            "retour_parametre", classe=classe_plage, libelle=f"Gradient attendu ({marque} {taille} mm)",
+            valeur=f"{gradient_min:g}-{gradient_max:g} mmHg", interpretation=interpretation_plage,
+        )
+        
+        # EOA
+        niveau_eoa = evaluer_repere("ratio_eoa", ratio_eoa=ratio_eoa)
+        carte(
+            "retour_parametre", classe=CLASSES_NIVEAU[niveau_eoa], libelle="EOA mesurée/théorique",
+            valeur=f"{eoa_mesuree} cm² / {ratio_eoa:.1f}%", interpretation=INTERPRETATIONS["ratio_eoa"][niveau_eoa],
+        )
+        
+        # PPM
+        carte(
+            "retour_parametre", classe=classe_ppm, libelle="Patient-Prothèse Mismatch",
+            valeur=libelle_ppm, interpretation=f"EOAi = {eoai:.2f} cm²/m²",
+        )
+        
+        # Évolution
+        if gradient_precedent:
+            niveau_evolution = evaluer_repere("evolution_gradient", delta_gradient=delta_gradient)
+            carte(
+                "retour_parametre", classe=CLASSES_NIVEAU[niveau_evolution], libelle="Évolution du gradient",
+                valeur=f"{delta_gradient:+g} mmHg en {delta_temps:g} mois",
+                interpretation=INTERPRETATIONS["evolution_gradient"][niveau_evolution],
+            )
+        
+        # Tendance sur tout l'historique du patient
+        suivi = st.session_state.get("suivi_patient")
+        if suivi is not None and suivi.examens + 1 >= MIN_EXAMENS_PENTE:
+            suivi = suivi.copie()
+            suivi.ajouter(date.today(), {"gradient_moyen": gradient_moyen, "eoa_mesuree": eoa_mesuree})
+            variables = suivi.variables()
+            tendance = suivi.tendance()
+            ruptures = [libelle for libelle, cle in (("gradient", "rupture_gradient"), ("EOA", "rupture_eoa")) if variables[cle]]
+            carte(
+                "retour_parametre", classe=CLASSES_TENDANCE[tendance], libelle=f"Tendance sur {suivi.examens} examens",
+                valeur=f"gradient {variables['pente_gradient']:+.1f} mmHg/an, EOA {variables['pente_eoa']:+.2f} cm²/an"
+                + (f" - rupture ({', '.join(ruptures)})" if ruptures else ""),
+                interpretation=tendance.upper(),
+            )
+        
+        # Recommandations finales
+        st.subheader("💡 RECOMMANDATIONS FINALES")
+        
+        if performance == "Dysfonction sévère":
+            st.error("""
+            **🔴 ACTION REQUISE - CONSULTATION CHIRURGICALE URGENTE**
+            - Évaluation pour reintervention
+            - Surveillance très rapprochée
+            - Optimisation traitement médical en attendant
+            - Considérer anticoagulation si mécanique
+            """)
+        elif performance == "Dysfonction modérée":
+            st.warning("""
+            **🟡 SURVEILLANCE RENFORCÉE - CONTRÔLE 6 MOIS**
+            - Optimisation traitement médical
+            - Surveillance des symptômes
+            - Vérifier observance anticoagulation si mécanique
+            - Préparer éventuelle intervention
+            """)
+        else:
+            st.success("""
+            **🟢 SURVEILLANCE STANDARD - CONTRÔLE ANNUEL**
+            - Maintenir traitement actuel
+            - Surveillance clinique régulière
+            - Éducation du patient sur les signes d'alerte
+            - Maintenir INR thérapeutique si mécanique
+            """)
+        
+        rappel = rappel_patient()
+        if rappel is not None:
+            echeance, _, patient_id, _, controle = rappel
+            st.markdown(
+                f"📅 **Prochain contrôle de {patient_id} :** {echeance.strftime('%d/%m/%Y')} ({LIBELLES_CONTROLE[controle]})"
+            )
+        
+        if severite_ppm == "severe":
+            st.error("""
+            **🔴 PPM SÉVÈRE DÉTECTÉ - IMPACT PRONOSTIQUE DÉFAVORABLE**
+            - Optimisation maximale traitement médical
+            - Surveillance rapprochée des symptômes
+            - Considérer reintervention si symptomatique
+            - Évaluation nutritionnelle et réadaptation
+            """)
+    
+    # Aide au choix pré-opératoire
+    with st.expander(f"🎯 AIDE AU CHOIX PRÉ-OPÉRATOIRE - Surface corporelle {surface_corporelle} m²"):
+        st.markdown("Prothèses classées par EOAi prédite (EOA théorique / surface corporelle) avec le PPM attendu.")
+        st.dataframe(table_recommandations(surface_corporelle, type_general), use_container_width=True)
+    
+    # Identification d'une prothèse de modèle inconnu
+    with st.expander(f"🔎 IDENTIFIER UNE PROTHÈSE INCONNUE - EOA {eoa_mesuree} cm² / Gradient {gradient_moyen} mmHg"):
+        st.markdown("Modèles les plus compatibles avec l'EOA et le gradient mesurés (gradient dans la plage normale d'abord, puis écart d'EOA).")
+        st.dataframe(table_identification(eoa_mesuree, gradient_moyen, type_general), use_container_width=True)
+
+# ============================================================================
+# DYSFONCTION DIASTOLIQUE COMPLÈTE
+# ============================================================================
+
+@st.fragment
+def page_diastolique():
+    st.markdown('<div class="section-header">📊 ÉVALUATION COMPLÈTE FONCTION DIASTOLIQUE</div>', unsafe_allow_html=True)
+    
+    col_config, col_feedback = st.columns([1, 2])
+    
+    with col_config, zone_saisie("diastolique"):
+        st.subheader("🎯 PARAMÈTRES D'ENTRÉE")
+        
+        fevg = classe_fevg(mesure("FE VG (%)", "fevg"))
+        
+        st.markdown("**📏 Doppler pulsé mitral:**")
+        e_vitesse = mesure("Vitesse E (cm/s)", "e_vitesse")
+        a_vitesse = mesure("Vitesse A (cm/s)", "a_vitesse")
+        e_a_ratio = mesure("Rapport E/A", "e_a_ratio")
+        dt = mesure("Temps décélération (ms)", "dt")
+        
+        st.markdown("**🎯 Doppler tissulaire:**")
+        e_prime_septal = mesure("e' septal (cm/s)", "e_prime_septal")
+        e_prime_lateral = mesure("e' latéral (cm/s)", "e_prime_lateral")
+        e_e_prime_moyen = mesure("E/e' moyen", "e_e_prime", defaut=10.0)
+        
+        st.markdown("**📊 Paramètres structurels:**")
+        volume_og_index = mesure("Volume OG indexé (ml/m²)", "volume_og")
+        tr_vitesse = mesure("Vitesse TR max (m/s)", "tr_vitesse", defaut=2.5)
+        
+        st.markdown("**🌀 Paramètres avancés:**")
+        rapport_s_d = mesure("Rapport S/D flux pulmonaire", "rapport_s_d")
+        duree_ar_a = mesure("Durée Ar-A (ms)", "duree_ar_a")
+        vp = mesure("Vitesse propagation Vp (cm/s)", "vp")
+    
+    with col_feedback:
+        st.subheader("📈 RÉSULTATS DÉTAILLÉS")
+        
+        # Évaluation complète
+        evaluation = evaluer_dysfonction_diastolique_complete(
+            e_a_ratio, e_e_prime_moyen, volume_og_index, tr_vitesse, dt, e_vitesse, fevg
+        )
+        grade_diastolique, _ = evaluer_grade_diastolique(
+            e_a_ratio, e_e_prime_moyen, volume_og_index, tr_vitesse, dt, e_vitesse, fevg
+        )
+        
+        if fevg == "≥50%":
+            if grade_diastolique == 0:
+                st.markdown("""
+                <div class="success-alert">
+                    <h3>✅ FONCTION DIASTOLIQUE NORMALE</h3>
+                    <p><strong>Classification:</strong> Grade 0</p>
+                    <p><strong>PRVG:</strong> Normale</p>
+                </div>
+                """, unsafe_allow_html=True)
+            elif grade_diastolique == 3:
+                st.markdown("""
+                <div class="critical-alert">
+                    <h3>🔴 DYSFONCTION DIASTOLIQUE SÉVÈRE</h3>
+                    <p><strong>Classification:</strong> Grade 3</p>
+                    <p><strong>PRVG:</strong> Élevée</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown("""
+                <div class="warning-alert">
+                    <h3>🟡 DYSFONCTION DIASTOLIQUE MODÉRÉE</h3>
+                    <p><strong>Classification:</strong> Grade 2</p>
+                    <p><strong>PRVG:</strong> Indéterminée - Zone grise</p>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            pattern = evaluation.get("pattern", "")
+            if pattern == "relaxation_alteree":
+                st.markdown("""
+                <div class="success-alert">
+                    <h3>📊 DYSFONCTION DIASTOLIQUE LÉGÈRE</h3>
+                    <p><strong>Classification:</strong> Grade 1</p>
+                    <p><strong>Pattern:</strong> Relaxation altérée</p>
+                    <p><strong>PRVG:</strong> Probablement normale</p>
+                </div>
+                """, unsafe_allow_html=True)
+            elif pattern == "restrictif":
+                st.markdown("""
+                <div class="critical-alert">
+                    <h3>📊 DYSFONCTION DIASTOLIQUE SÉVÈRE</h3>
+                    <p><strong>Classification:</strong> Grade 3</p>
+                    <p><strong>Pattern:</strong> Restrictif</p>
+                    <p><strong>PRVG:</strong> Élevée</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown("""
+                <div class="warning-alert">
+                    <h3>📊 DYSFONCTION DIASTOLIQUE MODÉRÉE</h3>
+                    <p><strong>Classification:</strong> Grade 2</p>
+                    <p><strong>Pattern:</strong> Pseudonormal</p>
+                    <p><strong>PRVG:</strong> Élevée</p>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        carte_incertitude(
+            "grade_diastolique", {grade: (f"Grade {grade}", classe) for grade, classe in VERDICTS_GRADE.items()},
+            e_a_ratio=e_a_ratio, e_e_prime=e_e_prime_moyen, volume_og=volume_og_index, tr_vitesse=tr_vitesse,
+            dt=dt, e_vitesse=e_vitesse, fevg=fevg,
+        )
+        
+        # Feedback paramétrique détaillé
+        st.subheader("🔍 ANALYSE PARAMÉTRIQUE COMPLÈTE")
+        
+        # Création d'un tableau des paramètres
+        st.dataframe(table_parametres_diastoliques(
+            e_a_ratio, e_e_prime_moyen, volume_og_index, tr_vitesse, dt, rapport_s_d, duree_ar_a, vp
+        ), use_container_width=True)
+
+# ============================================================================
+# CONSTRICTIVE vs RESTRICTIVE
+# ============================================================================
+
+@st.fragment
+def page_pericarde():
+    st.markdown('<div class="section-header">🔄 DIAGNOSTIC DIFFÉRENTIEL PÉRICARDITE CONSTRICTIVE vs RESTRICTIVE</div>', unsafe_allow_html=True)
+    
+    col_config, col_feedback = st.columns([1, 2])
+    
+    with col_config, zone_saisie("pericarde"):
+        st.subheader("🎯 CRITÈRES DIFFÉRENTIELS")
+        
+        st.markdown("**🔄 Paramètres respiratoires:**")
+        variation_respiratoire = mesure("Variation respiratoire flux mitral E", "variation_respiratoire")
+        variation_tricuspide = mesure("Variation respiratoire flux tricuspide", "variation_tricuspide")
+        augmentation_inspiratoire_tr = mesure("Augmentation inspiratoire onde TR", "augmentation_inspiratoire_tr")
+        
+        st.markdown("**📐 Paramètres structuraux:**")
+        septal_bounce = mesure("Mouvement septal paradoxal", "septal_bounce")
+        annulus_reverse = mesure("Annulus paradoxal (e' latéral > e' septal)", "annulus_reverse")
+        epaisseur_pericarde = mesure("Épaisseur péricarde", "epaisseur_pericarde")
+        
+        st.markdown("**📊 Paramètres fonctionnels:**")
+        fonction_vg = mesure("Fonction VG systolique", "fonction_vg")
+        fonction_vd = mesure("Fonction VD", "fonction_vd")
+        strain_longitudinal = mesure("Strain longitudinal global (%)", "strain_longitudinal")
+        
+        st.markdown("**🔍 Paramètres avancés:**")
+        flux_hepatique = mesure("Flux hépatique diastolique", "flux_hepatique")
+    
+    with col_feedback:
+        st.subheader("🎯 DIAGNOSTIC DIFFÉRENTIEL")
+        
+        # Calcul des scores
+        score_constriction, score_restrictif = evaluer_constrictive_restrictive(
+            variation_respiratoire, septal_bounce, annulus_reverse, fonction_vg, strain_longitudinal
+        )
+        
+        # Diagnostic
+        diagnostic = classer_constrictive_restrictive(score_constriction, score_restrictif)
+        classe, titre, recommandation = ALERTES_PERICARDE[diagnostic]
+        carte(
+            "alerte_pericarde", classe=classe, titre=titre, score_constriction=score_constriction,
+            score_restrictif=score_restrictif, recommandation=recommandation,
+        )
+        
+        carte_incertitude(
+            "diagnostic_pericardique", VERDICTS_PERICARDE,
+            variation_respiratoire=variation_respiratoire, septal_bounce=septal_bounce, annulus_reverse=annulus_reverse,
+            fonction_vg=fonction_vg, strain_longitudinal=strain_longitudinal,
+        )
+        
+        # Tableau comparatif
+        st.subheader("📊 TABLEAU COMPARATIF")
+        
+        st.dataframe(tableau_comparatif_pericarde(), use_container_width=True)
+
+# ============================================================================
+# PAGE EXAMEN COMPLET
+# ============================================================================
+
+def carte_verdict(titre, libelle, classe, detail):
+    carte("verdict", titre=titre, libelle=libelle, classe=classe, detail=detail)
+
+@st.fragment
+def page_examen(surface_corporelle):
+    st.markdown('<div class="section-header">🧾 EXAMEN COMPLET - LES CINQ ÉVALUATIONS EN UNE PASSE</div>', unsafe_allow_html=True)
+    st.info("Les mesures sont communes à toutes les pages : une valeur saisie ici est reprise par les pages d'évaluation, et inversement.")
+    
+    # Prothèse : le type et la catégorie déterminent les champs proposés
+    col_prothese, col_type, col_categorie = st.columns([1, 1, 2])
+    with col_prothese:
+        porteur_prothese = st.checkbox("Porteur d'une prothèse valvulaire", key="examen_porteur_prothese")
+    prothese = ttr = None
+    if porteur_prothese:
+        with col_type:
+            type_general = st.selectbox("Type de prothèse", ["Prothèse aortique", "Prothèse mitrale"], key="examen_type_prothese")
+        with col_categorie:
+            tables = protheses_aortiques if type_general == "Prothèse aortique" else protheses_mitrales
+            categorie = st.selectbox("Catégorie", list(tables.keys()), key="examen_categorie_prothese")
+        prothese = (type_general, categorie)
+    
+    with zone_saisie("examen"):
+        onglets = st.tabs(["🫀 VG et remplissage", "🌊 Cavités droites", "🔄 Péricarde", "⚙️ Prothèse"])
+        
+        with onglets[0]:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                mesure("FE VG (%)", "fevg")
+                mesure("Vitesse E (cm/s)", "e_vitesse")
+                mesure("Rapport E/A", "e_a_ratio")
+            with col2:
+                mesure("Temps décélération (ms)", "dt")
+                mesure("E/e' moyen", "e_e_prime")
+            with col3:
+                mesure("Volume OG indexé (ml/m²)", "volume_og")
+                mesure("Vitesse TR max (m/s)", "tr_vitesse")
+        
+        with onglets[1]:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                mesure("Diamètre VCI (mm)", "vc_diametre")
+                mesure("Collapsus VCI (%)", "vc_collapsus")
+                mesure("Rapport VD/OG", "rv_ra_ratio")
+            with col2:
+                mesure("Mouvement septum paradoxal", "septum_paradoxal")
+                mesure("TAPSE (mm)", "tapse")
+                mesure("S' tricuspide (cm/s)", "s_tricuspide")
+            with col3:
+                mesure("FAC VD (%)", "fac_vd")
+                mesure("Temps accélération VTID (ms)", "acceleration_time")
+                mesure("PVR estimée (UW)", "pvr_estimee")
+        
+        with onglets[2]:
+            col1, col2 = st.columns(2)
+            with col1:
+                mesure("Variation respiratoire flux mitral E", "variation_respiratoire")
+                mesure("Mouvement septal paradoxal", "septal_bounce")
+                mesure("Annulus paradoxal (e' latéral > e' septal)", "annulus_reverse")
+            with col2:
+                mesure("Fonction VG systolique", "fonction_vg")
+                mesure("Strain longitudinal global (%)", "strain_longitudinal")
+        
+        with onglets[3]:
+            if prothese is None:
+                st.caption("Cocher « Porteur d'une prothèse valvulaire » pour évaluer une prothèse.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    if type_general == "Prothèse aortique":
+                        mesure("Gradient moyen (mmHg)", "gradient_moyen", 5, 60)
+                    else:
+                        mesure("Gradient moyen (mmHg)", "gradient_moyen", 2, 15, defaut=6)
+                    mesure("EOA mesurée (cm²)", "eoa_mesuree")
+                    if type_general == "Prothèse aortique":
+                        mesure("DVI", "dvi")
+                with col2:
+                    mesure("Fibrillation auriculaire", "fa")
+                    mesure("Antécédent thrombo-embolique", "antecedent_te")
+                    mesure("INR", "inr")
+                    ttr = saisie_ttr(type_general)
+                with col3:
+                    mesure("Gradient précédent (mmHg) - si connu", "gradient_precedent")
+                    mesure("Délai depuis dernier examen (mois)", "delta_temps")
+    
+    # Les cinq évaluations en une passe sur la fiche
+    resultats = evaluer_examen(fiche_session(), surface_corporelle, prothese, ttr)
+    resultats["ttr"] = ttr
+    
+    st.markdown("---")
+    st.subheader("📋 SYNTHÈSE DE L'EXAMEN")
+    
+    verdicts = verdicts_examen(resultats, prothese and type_general)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        carte_verdict(*verdicts["prvg"])
+    with col2:
+        carte_verdict(*verdicts["diastolique"])
+    with col3:
+        carte_verdict(*verdicts["htap"])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        carte_verdict(*verdicts["pericarde"])
+    with col2:
+        if prothese is None:
+            carte_verdict("⚙️ Prothèse valvulaire", "Sans objet", "dynamic-result", "Pas de prothèse déclarée")
+        else:
+            carte_verdict(*verdicts["prothese"])
+    
+    bouton_enregistrement("examen", resultats, prothese and (*prothese, None, None))
+
+# ============================================================================
+# SENSIBILITÉ AUX SEUILS
+# ============================================================================
+
+# Libellés des mesures proposées, dans l'ordre d'affichage
+LIBELLES_MESURES = {
+    "type_general": "Type de prothèse",
+    "fevg": "FE VG (%)",
+    "e_e_prime": "E/e' moyen",
+    "volume_og": "Volume OG indexé (ml/m²)",
+    "tr_vitesse": "Vitesse TR max (m/s)",
+    "e_a_ratio": "Rapport E/A",
+    "dt": "Temps décélération (ms)",
+    "e_vitesse": "Vitesse E (cm/s)",
+    "vc_diametre": "Diamètre VCI (mm)",
+    "vc_collapsus": "Collapsus VCI (%)",
+    "rv_ra_ratio": "Rapport VD/OG",
+    "septum_paradoxal": "Mouvement septum paradoxal",
+    "tapse": "TAPSE (mm)",
+    "s_tricuspide": "S' tricuspide (cm/s)",
+    "fac_vd": "FAC VD (%)",
+    "acceleration_time": "Temps accélération VTID (ms)",
+    "pvr_estimee": "PVR estimée (UW)",
+    "gradient_moyen": "Gradient moyen (mmHg)",
+    "eoa_mesuree": "EOA mesurée (cm²)",
+    "dvi": "DVI",
+}
+
+# Règle -> (titre, axes par défaut, résultat -> (libellé, classe CSS))
+SENSIBILITES = {
+    "categorie_prvg": ("🫀 Pression de remplissage VG (FE VG ≥ 50%)", ("e_e_prime", "volume_og"), VERDICTS_PRVG),
+    "pattern_diastolique": ("📊 Pattern diastolique (FE VG < 50%)", ("dt", "e_vitesse"), VERDICTS_PATTERN),
+    "grade_diastolique": (
+        "📊 Grade de dysfonction diastolique", ("e_e_prime", "volume_og"),
+        {grade: (f"Grade {grade}", classe) for grade, classe in VERDICTS_GRADE.items()},
+    ),
+    "probabilite_htap": ("🌊 Probabilité HTAP", ("tr_vitesse", "vc_diametre"), VERDICTS_HTAP),
+    "performance_prothese": (
+        "⚙️ Performance de prothèse", ("gradient_moyen", "eoa_mesuree"),
+        {libelle: (libelle, classe) for libelle, classe in VERDICTS_PERFORMANCE.items()},
+    ),
+}
+
+# Couleurs des catégories qui partagent la classe CSS d'une autre
+COULEURS_SUPPLEMENTAIRES = ("#6f42c1", "#adb5bd", "#fd7e14", "#20c997")
+
+def saisie_sensibilite(nom):
+    """Valeur de l'examen en cours pour une mesure lue par la règle"""
+    if nom == "type_general":
+        return st.selectbox(LIBELLES_MESURES[nom], ["Prothèse aortique", "Prothèse mitrale"], key="sensibilite_type_general")
+    valeur = mesure(LIBELLES_MESURES[nom], nom)
+    return classe_fevg(valeur) if nom == "fevg" else valeur
+
+def graphique_sensibilite(carte, verdicts, axe_x, axe_y, examen):
+    """Carte des catégories (rectangles) et point de l'examen en cours"""
+    domaine, couleurs = [], []
+    for libelle, classe in verdicts.values():
+        couleur = COULEURS_ALERTE[classe]
+        domaine.append(libelle)
+        couleurs.append(couleur if couleur not in couleurs else COULEURS_SUPPLEMENTAIRES[len(couleurs) % len(COULEURS_SUPPLEMENTAIRES)])
+    donnees = carte.assign(categorie=[verdicts[resultat][0] for resultat in carte["resultat"]])
+    titre_x, titre_y = LIBELLES_MESURES[axe_x], LIBELLES_MESURES[axe_y]
+    fond = alt.Chart(donnees).mark_rect().encode(
+        x=alt.X("x0:Q", title=titre_x, scale=alt.Scale(zero=False, nice=False)),
+        x2="x1:Q",
+        y=alt.Y("y0:Q", title=titre_y, scale=alt.Scale(zero=False, nice=False)),
+        y2="y1:Q",
+        color=alt.Color("categorie:N", title="Catégorie", scale=alt.Scale(domain=domaine, range=couleurs)),
+        tooltip=[alt.Tooltip("categorie:N", title="Catégorie")],
+    )
+    point = alt.Chart(pd.DataFrame([examen])).mark_point(shape="diamond", size=250, filled=True, color="black").encode(
+        x=f"{axe_x}:Q", y=f"{axe_y}:Q",
+        tooltip=[alt.Tooltip(f"{axe_x}:Q", title=titre_x), alt.Tooltip(f"{axe_y}:Q", title=titre_y)],
+    )
+    return (fond + point).properties(height=520)
+
+@st.fragment
+def page_sensibilite():
+    st.markdown('<div class="section-header">🗺️ SENSIBILITÉ AUX SEUILS - CARTE DES CATÉGORIES</div>', unsafe_allow_html=True)
+    
+    col_config, col_carte = st.columns([1, 2])
+    
+    with col_config:
+        st.subheader("🎯 CARTE")
+        
+        regle = st.selectbox(
+            "Évaluation", list(SENSIBILITES), format_func=lambda r: SENSIBILITES[r][0], key="sensibilite_regle"
+        )
+        titre, (defaut_x, defaut_y), verdicts = SENSIBILITES[regle]
+        balayables = mesures_balayables(regle)
+        axe_x = st.selectbox(
+            "Axe horizontal", balayables, index=balayables.index(defaut_x),
+            format_func=LIBELLES_MESURES.get, key=f"sensibilite_x_{regle}",
+        )
+        choix_y = [nom for nom in balayables if nom != axe_x]
+        axe_y = st.selectbox(
+            "Axe vertical", choix_y, index=choix_y.index(defaut_y) if defaut_y in choix_y else 0,
+            format_func=LIBELLES_MESURES.get, key=f"sensibilite_y_{regle}",
+        )
+        
+        with zone_saisie("sensibilite"):
+            st.markdown("---")
+            st.subheader("📊 EXAMEN EN COURS")
+            
+            ordre = list(LIBELLES_MESURES)
+            entrees = sorted(
+                mesures_lues(regle), key=lambda nom: (nom not in (axe_x, axe_y), ordre.index(nom))
+            )
+            examen = {nom: saisie_sensibilite(nom) for nom in entrees}
+    
+    with col_carte:
+        st.subheader(titre)
+        
+        # La carte ne dépend que des mesures hors axes : déplacer l'examen
+        # sur les axes ne fait que redessiner son point
+        fixes = tuple((nom, valeur) for nom, valeur in examen.items() if nom not in (axe_x, axe_y))
+        carte = carte_sensibilite_memoisee(regle, axe_x, axe_y, fixes)
+        st.altair_chart(graphique_sensibilite(carte, verdicts, axe_x, axe_y, examen), use_container_width=True)
+        
+        libelle, classe = verdicts[evaluer(regle, **examen)]
+        carte_verdict("◆ Examen en cours", libelle, classe, f"{LIBELLES_MESURES[axe_x]} {examen[axe_x]} - {LIBELLES_MESURES[axe_y]} {examen[axe_y]}")
+        st.caption("Chaque axe parcourt la plage de son slider au pas de saisie ; les autres mesures sont celles de l'examen en cours.")